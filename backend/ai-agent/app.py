@@ -8,26 +8,111 @@ from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+from contextlib import asynccontextmanager
 import os
 import json
+import asyncio
+import hashlib
+import re
+import time
 from dotenv import load_dotenv
 
 # LangChain imports
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import OpenAIEmbeddings
 
+# Load environment variables (before local modules read their config)
+load_dotenv()
+
 # Session manager
-from session_manager import session_manager
+from session_manager import session_manager, determine_max_questions
+from session_record import SessionSnapshot
+from session_rehydrate import session_rehydrator
+
+# Async LLM execution with a shared concurrency limit
+from llm_runtime import run_llm, hedged_stream, llm_limiter
+
+# Named model clients sharing one connection pool
+from llm_registry import llm_registry, OPENAI_BASE_URL, OPENAI_FALLBACK_MODEL
+
+# Content-addressed cache of parsed resume profiles
+from resume_cache import resume_parse_cache, resume_cache_key, profile_from_stored
+from tips_cache import resume_tips_cache, tips_single_flight, tips_fingerprint, bucket_score
+
+# Per-session semantic chunk retrieval
+from chunk_index import ChunkRetriever
+
+# Bounded conversation memory (recent turns + running summary)
+from conversation_memory import conversation_memory
+
+# Cache-friendly prompts (static prefix -> session context -> turn context)
+from prompts import interviewer_prompt, turn_scoring_prompt, synthesis_prompt, verify_static_prefix
+
+# Versioned speculative pregeneration
+from speculation import speculation_engine
+from context_budget import context_packer, estimate_tokens, Section
+from turn_scoring import (
+    aggregate_turn_scores, format_turns, ASSESSMENT_RUBRIC_VERSION,
+    ASSESSMENT_SYNTHESIS_ENABLED, ASSESSMENT_SYNTHESIS_TIMEOUT_SECONDS
+)
+
+# Managed per-session background work
+from task_scheduler import task_scheduler
+
+# Latency histograms and LLM usage accounting (global + per session)
+from metrics import hedging_metrics, latency_metrics, usage_metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifecycle: check the prompts' static prefixes, restore the last session snapshot and
+    start the session sweeper / snapshots on startup; snapshot sessions, cancel background work and
+    release the shared LLM connection pool, session store and MongoDB client on shutdown.
+    """
+    print(f"[PROMPTS] Static prefix fingerprints: {verify_static_prefix()}")
+    await session_manager.restore_snapshot()
+    session_manager.start_sweeper(after_sweep=release_orphaned_sessions)
+    session_manager.start_snapshots()
+    yield
+    await session_manager.stop_sweeper()
+    await session_manager.stop_snapshots()
+    await task_scheduler.shutdown()
+    await llm_registry.aclose()
+    await session_manager.store.aclose()
+    await session_rehydrator.aclose()
+
+
+async def release_orphaned_sessions() -> None:
+    """
+    Drop this worker's per-session state (chunk index, background tasks, counters) for sessions
+    that are gone from the store - expired, evicted, or finished on another worker.
+    """
+    local = (
+        chunk_retriever.session_ids()
+        | task_scheduler.session_ids()
+        | speculation_engine.session_ids()
+        | usage_metrics.session_ids()
+        | latency_metrics.session_ids()
+    )
+    if not local:
+        return
+    orphaned = local - await session_manager.store.existing(local)
+    for session_id in orphaned:
+        task_scheduler.cancel_session(session_id)
+        chunk_retriever.drop(session_id)
+        speculation_engine.forget(session_id)
+        usage_metrics.forget(session_id)
+        latency_metrics.forget(session_id)
+    if orphaned:
+        print(f"[SESSIONS] Released local state of {len(orphaned)} ended session(s)")
 
-# Load environment variables
-load_dotenv()
 
 app = FastAPI(
     title="AI Interview Agent",
     version="1.0.0",
-    description="AI-powered resume parsing and interview question generation"
+    description="AI-powered resume parsing and interview question generation",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -66,6 +151,7 @@ class InitInterviewRequest(BaseModel):
     sessionId: str
     resumeText: str
     chunks: List[str]
+    resumeProfile: Optional[Dict[str, Any]] = None  # Optional - profile already parsed at upload
 
 
 class InitInterviewResponse(BaseModel):
@@ -84,14 +170,32 @@ class NextQuestionResponse(BaseModel):
     nextQuestion: Optional[str]
 
 
-class InterviewAssessment(BaseModel):
-    """Assessment generated after interview completion."""
-    candidate_score_percent: int = Field(description="Score from 0-100 based on answer quality")
-    hiring_recommendation: str = Field(description="'Strongly Recommend', 'Recommend', 'Consider with Reservations', or 'Do Not Recommend'")
-    strengths: List[str] = Field(description="3-5 specific strengths demonstrated in answers")
-    improvement_areas: List[str] = Field(description="2-4 specific areas needing improvement")
+class TurnScore(BaseModel):
+    """Compact rubric result for one answer, scored as soon as the answer is saved."""
+    score: int = Field(description="Score from 0-100 for this answer based on the rubric and seniority")
+    topic: str = Field(description="What the question assessed, 2-5 words")
+    strengths: List[str] = Field(description="0-2 short strengths shown in this answer")
+    gaps: List[str] = Field(description="0-2 short gaps or missing points in this answer")
+    evidence: str = Field(description="Short quote or fact from the answer supporting the score (max 20 words)")
+
+
+class AssessmentSynthesis(BaseModel):
+    """Narrative written from the per-turn scores at interview completion."""
+    answer_quality_analysis: str = Field(description="2-3 sentence analysis of answer depth and relevance")
     next_steps: str = Field(description="Recommended next steps for hiring process")
-    answer_quality_analysis: str = Field(description="Brief analysis of answer depth and relevance")
+
+
+class ScoreAnswerRequest(BaseModel):
+    sessionId: str
+    questionNumber: int
+    question: str
+    answer: str
+    seniorityLevel: str = "Mid-Senior"
+
+
+class ScoreAnswerResponse(BaseModel):
+    turnScore: Dict[str, Any]
+    rubricVersion: str
 
 
 class GenerateAssessmentRequest(BaseModel):
@@ -100,27 +204,86 @@ class GenerateAssessmentRequest(BaseModel):
     chunks: List[str]
     transcript: List[Dict[str, str]]  # List of {question, answer} pairs
     seniorityLevel: str
+    turnScores: Optional[List[Optional[Dict[str, Any]]]] = None  # Stored per-answer scores, aligned with transcript
 
 
 class GenerateAssessmentResponse(BaseModel):
     assessment: Dict[str, Any]
+    usage: Optional[Dict[str, Any]] = None  # Per-session LLM tokens, latency and pregeneration waste
+    rubricVersion: str
+
+
+class ReassessRequest(BaseModel):
+    sessionId: Optional[str] = None  # For logging only - no live session is needed
+    resumeText: str = ""
+    chunks: List[str] = []
+    transcript: List[Dict[str, str]]
+    seniorityLevel: str
+    turnConcurrency: Optional[int] = None  # Max turns scored at once (batch callers bound their LLM calls)
+
+
+class ReassessResponse(BaseModel):
+    assessment: Dict[str, Any]
+    rubricVersion: str
 
 
 # ==================== Global LLM Setup ====================
 
-# Initialize OpenAI models
-llm = ChatOpenAI(
-    model="gpt-4o-mini",  # OpenAI GPT-4o model
+# Initialize OpenAI models once at startup; all share the registry's HTTP pool
+llm = llm_registry.register("chat", llm_registry.chat_model(temperature=0.7))
+
+# Hedge target for live questions that miss their latency budget (LLM_LATENCY_BUDGETS)
+llm_registry.register("chat_fallback", llm_registry.chat_model(model=OPENAI_FALLBACK_MODEL, temperature=0.7))
+
+# JSON mode client for resume extraction
+llm_registry.register("json", llm_registry.chat_model(
     temperature=0.7,
-    api_key=os.getenv("OPENAI_API_KEY")
-)
+    model_kwargs={"response_format": {"type": "json_object"}}
+))
+
+# Structured output clients for per-answer scoring and the completion synthesis
+llm_registry.register("turn_scoring", llm_registry.chat_model(temperature=0).with_structured_output(TurnScore))
+llm_registry.register("synthesis", llm_registry.chat_model(temperature=0.3, max_tokens=300).with_structured_output(AssessmentSynthesis))
+
+# Short-answer client for resume tips
+llm_registry.register("tips", llm_registry.chat_model(temperature=0.7, max_tokens=200))
+
+# Deterministic client for folding old turns into the conversation summary
+llm_registry.register("summary", llm_registry.chat_model(temperature=0, max_tokens=250))
 
-# Note: Embeddings not needed for current implementation, but keeping for future use
-embeddings = OpenAIEmbeddings() if os.getenv("OPENAI_API_KEY") else None
+# Embeddings for per-session chunk retrieval (computed once per chunk at upload)
+embeddings = OpenAIEmbeddings(
+    base_url=OPENAI_BASE_URL,
+    http_async_client=llm_registry.http_client,
+    # tiktoken length checks download encodings; skip them for OpenAI-compatible servers
+    check_embedding_ctx_length=OPENAI_BASE_URL is None
+) if os.getenv("OPENAI_API_KEY") else None
+
+chunk_retriever = ChunkRetriever(embeddings)
 
 
 # ==================== Helper Functions ====================
 
+# Bump whenever RESUME_PARSE_PROMPT or the profile mapping changes (invalidates the parse cache)
+RESUME_PARSE_PROMPT_VERSION = "1"
+
+RESUME_PARSE_PROMPT = """Extract the candidate's information from the following resume and return it as JSON.
+
+Resume:
+{resume_text}
+
+Return a JSON object with these exact fields:
+- candidate_first_name: string
+- candidate_last_name: string
+- candidate_email: string
+- candidate_linkedin: string
+- experience: string (summary of work experience)
+- skills: array of strings
+- seniority_level: string (one of: Fresher, Junior, Mid-Senior, Senior, Lead)
+
+Return ONLY the JSON object, no other text."""
+
+
 def clean_dictionary(data):
     """Remove newlines and extra whitespace from dictionary values."""
     clean_data = {}
@@ -134,78 +297,94 @@ def clean_dictionary(data):
     return clean_data
 
 
-def parse_resume_from_chunks(resume_text: str, chunks: List[str]) -> Dict[str, Any]:
+def build_retrieval_query(resume_profile: Dict[str, Any], conversation: List[Dict[str, Any]]) -> str:
     """
-    Parse resume from text chunks and extract candidate information using LLM.
-    
-    Args:
-        resume_text: Full extracted resume text
-        chunks: List of text chunks from the resume
-        
-    Returns:
-        Dictionary with candidate information
+    Build the semantic search query for the next question:
+    the latest answer plus resume skills no question has touched yet.
     """
-    # Use the full resume text for extraction (chunks are for context later)
-    # Create prompt for JSON extraction
-    prompt = f"""Extract the candidate's information from the following resume and return it as JSON.
-
-Resume:
-{resume_text}
+    latest_answer = next(
+        (qa["answer"] for qa in reversed(conversation) if qa.get("answer")),
+        ""
+    )
+    asked = " ".join(qa.get("question") or "" for qa in conversation).lower()
+    uncovered = [
+        skill for skill in (resume_profile or {}).get("skills", [])
+        if skill.lower() not in asked
+    ]
+    return f"{latest_answer}\n{', '.join(uncovered)}".strip()
 
-Return a JSON object with these exact fields:
-- candidate_first_name: string
-- candidate_last_name: string
-- candidate_email: string
-- candidate_linkedin: string
-- experience: string (summary of work experience)
-- skills: array of strings
-- seniority_level: string (one of: Fresher, Junior, Mid-Senior, Senior, Lead)
 
-Return ONLY the JSON object, no other text."""
+async def load_session(session_id: str) -> Optional[SessionSnapshot]:
+    """
+    The session's snapshot, rebuilt from MongoDB when the store no longer has it (e.g. a restart
+    without a snapshot). Call under session_manager.lock(session_id).
+    """
+    snapshot = await session_manager.snapshot(session_id)
+    if snapshot or not session_rehydrator.enabled:
+        return snapshot
     
-    # Create prompt for JSON extraction
-    prompt = f"""Extract the candidate's information from the following resume and return it as JSON.
+    stored = await session_rehydrator.load(session_id)
+    if not stored:
+        return None
+    
+    # Parsed at upload; otherwise the parse cache usually has it
+    resume_profile = profile_from_stored(stored["resume_profile"]) or await get_or_parse_resume(
+        stored["resume_text"], stored["chunks"], session_id
+    )
+    snapshot = await session_manager.restore_session(session_id, resume_profile, stored["chunks"], stored["turns"])
+    task_scheduler.reopen_session(session_id)
+    print(f"[SESSIONS] Rehydrated session {session_id} from MongoDB ({snapshot.turn} turns)")
+    return snapshot
 
-Resume:
-{resume_text}
 
-Return a JSON object with these exact fields:
-- candidate_first_name: string
-- candidate_last_name: string
-- candidate_email: string
-- candidate_linkedin: string
-- experience: string (summary of work experience)
-- skills: array of strings
-- seniority_level: string (one of: Fresher, Junior, Mid-Senior, Senior, Lead)
+def build_chat_history(snapshot: SessionSnapshot, conversation: List[Dict[str, Any]]) -> str:
+    """Render bounded chat history: running summary + last turns, within the memory token budget."""
+    return conversation_memory.render(
+        conversation, snapshot.memory_summary, snapshot.memory_summarized_upto, snapshot.session_id
+    )
 
-Return ONLY the JSON object, no other text."""
-    
-    # Create prompt for JSON extraction
-    prompt = f"""Extract the candidate's information from the following resume and return it as JSON.
 
-Resume:
-{resume_text}
+async def update_memory_background(session_id: str):
+    """
+    Background task to fold turns that left the verbatim window into the running summary.
+    Scheduled through task_scheduler, which logs and counts failures.
+    """
+    snapshot = await session_manager.snapshot(session_id)
+    if not snapshot:
+        return
+    summary, summarized_upto = snapshot.memory_summary, snapshot.memory_summarized_upto
+    
+    turns, fold_until = conversation_memory.pending_fold(snapshot.conversation, summarized_upto)
+    if fold_until <= summarized_upto:
+        return
+    
+    if turns:
+        summary = await conversation_memory.summarize(llm_registry.get("summary"), summary, turns, session_id)
+    await session_manager.set_memory(session_id, summary, fold_until)
+    print(f"[MEMORY] Summary for session {session_id} now covers {fold_until} turns")
 
-Return a JSON object with these exact fields:
-- candidate_first_name: string
-- candidate_last_name: string
-- candidate_email: string
-- candidate_linkedin: string
-- experience: string (summary of work experience)
-- skills: array of strings
-- seniority_level: string (one of: Fresher, Junior, Mid-Senior, Senior, Lead)
 
-Return ONLY the JSON object, no other text."""
+async def parse_resume_from_chunks(
+    resume_text: str,
+    chunks: List[str],
+    session_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Parse resume from text chunks and extract candidate information using LLM.
     
-    # Use JSON mode with OpenAI
-    llm_json = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7,
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model_kwargs={"response_format": {"type": "json_object"}}
-    )
+    Args:
+        resume_text: Full extracted resume text
+        chunks: List of text chunks from the resume
+        session_id: Interview session the parse is accounted to (None at upload)
+        
+    Returns:
+        Dictionary with candidate information
+    """
+    # Use the full resume text for extraction (chunks are for context later)
+    prompt = RESUME_PARSE_PROMPT.format(resume_text=resume_text)
     
-    response = llm_json.invoke(prompt)
+    # Use the prebuilt JSON mode client
+    response = await run_llm(llm_registry.get("json"), prompt, endpoint="parse_resume", session_id=session_id)
     result_json = json.loads(response.content)
     
     # Convert to expected format
@@ -221,152 +400,34 @@ Return ONLY the JSON object, no other text."""
     return clean_dictionary(profile)
 
 
-# ==================== Interview Prompt ====================
-
-interviewer_prompt = ChatPromptTemplate.from_messages([
-    ("system", """
-    You are a friendly, experienced technical interviewer conducting a {max_questions}-question interview.
-    
-    CANDIDATE PROFILE:
-    - Seniority Level: {seniority_level}
-    - Resume Context: {resume_chunks}
-    
-    YOUR PERSONALITY:
-    - Warm and encouraging, never intimidating
-    - Professional but conversational
-    - Patient and supportive
-    - Sound like a real person having a conversation
-    - Use natural, spoken language (you're, we'll, let's, I'd)
-    
-    SPEAKING STYLE (optimized for voice):
-    - Try to keep questions under 25 words for clarity
-    - Use simple, clear sentences
-    - Speak naturally - use contractions
-    - Avoid complex jargon unless necessary
-    - Sound more like a realhuman, not like a robot
-    - Use brief acknowledgments like "Great", "Interesting", "I see", "I understand", "Let's move ahead"
-
-    QUESTION DIFFICULTY (must match seniority):
-    - Fresher: Basic concepts, simple scenarios, fundamentals
-    - Junior: Practical application, common problems, hands-on tasks
-    - Mid-level: System design, trade-offs, best practices, deeper reasoning
-    - Senior: Architecture, leadership, complex decisions, end-to-end ownership
-    
-    QUESTION VARIETY (balanced mix):
-    - 40% Technical skills based on resume
-    - 30% Past experience and projects
-    - 20% Problem-solving scenarios
-    - 10% Behavioral and soft skills
-    
-    CONVERSATION FLOW:
-    - Acknowledge answers briefly when appropriate
-    - If answer is too vague,short,etc, ask for more details
-    - If answer is excellent, give brief positive feedback
-    - Keep the conversation flow natural, adhering to the speaking style and personality style provided to you.
-    - Be encouraging throughout the interview conversation.
-    
-    CRITICAL RULES:
-    - First question (when total_questions_asked == 0) MUST be an introductory question:
-        * "Tell me about yourself and your background."
-        * "Walk me through your experience."
-        * "Give me a brief introduction about yourself."
-    - Never repeat questions
-    - Reference specific items from their resume when possible
-    - Ask open-ended questions that encourage detailed answers
-    - Keep questions conversational and natural for voice
-    """),
-
-    ("human", """
-    INTERVIEW STATUS:
-    Questions Asked: {total_questions_asked} / {max_questions}
-
-    CONVERSATION HISTORY:
-    {chat_history}
-
-    INSTRUCTION:
-    Generate ONLY the next question.
-    Make it conversational and natural for voice.
-    Avoid repeating previous topics.
-    Reference the candidate's resume when relevant.
-    Keep it under 25 words.
-    """)
-])
-
-
-# ==================== Assessment Prompt ====================
-
-assessment_prompt = ChatPromptTemplate.from_messages([
-    ("system", """
-    You are an expert Technical Hiring Manager with 15+ years of experience.
-    Your task is to provide an ACCURATE and DIFFERENTIATED assessment based on actual answer quality.
-    
-    SCORING RUBRIC (be strict and accurate):
-    
-    90-100%: EXCEPTIONAL
-    - Demonstrates deep expertise with specific examples
-    - Answers go beyond the question with valuable insights
-    - Shows leadership thinking and strategic perspective
-    - Perfect communication and structure
-    
-    75-89%: STRONG
-    - Solid technical knowledge with good examples
-    - Clear, well-structured answers
-    - Shows practical experience
-    - Minor gaps in depth or breadth
-    
-    60-74%: COMPETENT
-    - Adequate knowledge but lacks depth
-    - Answers are correct but somewhat generic
-    - Limited specific examples
-    - Communication is clear but not compelling
-    
-    40-59%: DEVELOPING
-    - Basic understanding with notable gaps
-    - Answers are vague or lack specificity
-    - Limited practical experience evident
-    - Needs significant development
-    
-    0-39%: INSUFFICIENT
-    - Major knowledge gaps
-    - Incorrect or irrelevant answers
-    - Poor communication
-    - Not ready for this level
-    
-    SENIORITY EXPECTATIONS:
-    - Fresher: Basic concepts, learning attitude, potential
-    - Junior: Practical skills, can execute tasks independently
-    - Mid-Senior: Deep expertise, can design solutions, mentors others
-    - Senior: Strategic thinking, architecture decisions, leadership
-    - Lead: Vision, cross-team impact, business alignment
-    
-    IMPORTANT: Score based on ACTUAL answer quality, not potential. Be specific in your analysis.
-    """),
-    ("human", """
-    CANDIDATE PROFILE:
-    {profile_doc}
-    
-    EXPECTED SENIORITY LEVEL: {difficulty_level}
-    
-    =====================
-    INTERVIEW TRANSCRIPT
-    =====================
-    {chat_history}
-    
-    =====================
-    ASSESSMENT INSTRUCTIONS
-    =====================
-    1. Evaluate EACH answer against the seniority expectations
-    2. Note specific quotes that support your scoring
-    3. Be ACCURATE - don't default to middle scores
-    4. If answers are excellent, score 80+. If poor, score below 40.
-    5. Provide actionable, specific feedback
-    
-    Generate a comprehensive assessment following the InterviewAssessment schema.
-    """)
-])
-
-
-def generate_first_question(session_id: str, chunks: List[str], seniority_level: str, max_questions: int) -> str:
+async def get_or_parse_resume(
+    resume_text: str,
+    chunks: List[str],
+    session_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Return the parsed profile for a resume, calling the LLM only on a cache miss.
+    The cache is keyed by the normalized resume text and the prompt version.
+    """
+    cache_key = resume_cache_key(resume_text, RESUME_PARSE_PROMPT_VERSION)
+    
+    cached_profile = await resume_parse_cache.aget(cache_key)
+    if cached_profile:
+        print(f"[CACHE] Resume parse cache hit ({cache_key[:12]})")
+        return cached_profile
+    
+    resume_profile = await parse_resume_from_chunks(resume_text, chunks, session_id)
+    await resume_parse_cache.aset(cache_key, resume_profile)
+    return resume_profile
+
+
+async def generate_first_question(
+    session_id: str,
+    chunks: List[str],
+    seniority_level: str,
+    max_questions: int,
+    usage: Optional[Dict[str, int]] = None
+) -> str:
     """
     Generate the first interview question based on candidate profile and resume chunks.
     
@@ -375,15 +436,18 @@ def generate_first_question(session_id: str, chunks: List[str], seniority_level:
         chunks: Resume text chunks for context
         seniority_level: Candidate's seniority level
         max_questions: Maximum number of questions for this interview
+        usage: Optional dict the call's token usage is added to
         
     Returns:
         First interview question as string
     """
     # Create interview chain
-    interview_chain = interviewer_prompt | llm | StrOutputParser()
+    interview_chain = interviewer_prompt | llm_registry.get("chat") | StrOutputParser()
     
-    # Prepare resume chunks as context (first 3-5 chunks for initial question)
-    resume_context = "\n\n".join(chunks[:5])
+    # Resume chunks in resume order, packed into the first-question budget
+    packed = context_packer.pack("first_question", [
+        Section("resume_chunks", chunks, priority=1),
+    ])
     
     # Generate first question
     context = {
@@ -391,20 +455,50 @@ def generate_first_question(session_id: str, chunks: List[str], seniority_level:
         "max_questions": max_questions,
         "total_questions_asked": 0,
         "chat_history": "",
-        "resume_chunks": resume_context
+        "resume_chunks": packed["resume_chunks"]
     }
     
-    question = interview_chain.invoke(context)
+    question = await run_llm(
+        interview_chain, context, endpoint="first_question", session_id=session_id, usage=usage,
+        fallback=interviewer_prompt | llm_registry.get("chat_fallback") | StrOutputParser()
+    )
     return question.strip()
 
 
-def generate_next_question(
-    session_id: str,
+def question_context(
     chunks: List[str],
     seniority_level: str,
     max_questions: int,
     questions_asked: int,
     chat_history: str
+) -> Dict[str, Any]:
+    """
+    Interviewer prompt variables for a follow-up question, packed into the next-question budget.
+    Recent conversation outranks resume context (which keeps a 300-token floor); chunks are
+    chunk_retriever's top-k in resume order, trailing chunks are dropped first.
+    """
+    packed = context_packer.pack("next_question", [
+        Section("chat_history", chat_history, priority=1, keep="tail"),
+        Section("resume_chunks", chunks, priority=2, min_tokens=300),
+    ])
+    return {
+        "seniority_level": seniority_level,
+        "max_questions": max_questions,
+        "total_questions_asked": questions_asked,
+        "chat_history": packed["chat_history"],
+        "resume_chunks": packed["resume_chunks"]
+    }
+
+
+async def generate_next_question(
+    session_id: str,
+    chunks: List[str],
+    seniority_level: str,
+    max_questions: int,
+    questions_asked: int,
+    chat_history: str,
+    endpoint: str = "next_question",
+    usage: Optional[Dict[str, int]] = None
 ) -> Optional[str]:
     """
     Generate the next interview question based on previous Q&A and resume chunks.
@@ -416,6 +510,8 @@ def generate_next_question(
         max_questions: Maximum questions for this interview
         questions_asked: Number of questions already asked
         chat_history: Full transcript of previous Q&A
+        endpoint: Accounting label ("next_question" or "pregeneration")
+        usage: Optional dict the call's token usage is added to
         
     Returns:
         Next question or None if interview should end
@@ -425,26 +521,20 @@ def generate_next_question(
         return None
     
     # Create interview chain
-    interview_chain = interviewer_prompt | llm | StrOutputParser()
-    
-    # Select relevant chunks based on conversation (simple approach: use all chunks)
-    # In a more advanced version, you could use semantic search here
-    resume_context = "\n\n".join(chunks)
+    interview_chain = interviewer_prompt | llm_registry.get("chat") | StrOutputParser()
     
     # Generate next question
-    context = {
-        "seniority_level": seniority_level,
-        "max_questions": max_questions,
-        "total_questions_asked": questions_asked,
-        "chat_history": chat_history,
-        "resume_chunks": resume_context
-    }
+    context = question_context(chunks, seniority_level, max_questions, questions_asked, chat_history)
     
-    question = interview_chain.invoke(context)
+    # Live next-question calls are hedged past their budget; pregeneration has none
+    fallback_chain = interviewer_prompt | llm_registry.get("chat_fallback") | StrOutputParser()
+    question = await run_llm(
+        interview_chain, context, endpoint=endpoint, session_id=session_id, usage=usage, fallback=fallback_chain
+    )
     return question.strip()
 
 
-def stream_next_question(
+async def stream_next_question(
     session_id: str,
     chunks: List[str],
     seniority_level: str,
@@ -454,29 +544,22 @@ def stream_next_question(
 ):
     """
     Stream the next interview question word-by-word for faster perceived response.
-    Returns a generator that yields text chunks.
+    Returns an async generator that yields text chunks.
     """
-    from langchain_core.output_parsers import StrOutputParser
-    
     # Check if interview should end
     if questions_asked >= max_questions:
-        return None
+        return
     
     # Create interview chain
-    interview_chain = interviewer_prompt | llm | StrOutputParser()
+    interview_chain = interviewer_prompt | llm_registry.get("chat") | StrOutputParser()
     
-    resume_context = "\n\n".join(chunks)
+    context = question_context(chunks, seniority_level, max_questions, questions_asked, chat_history)
     
-    context = {
-        "seniority_level": seniority_level,
-        "max_questions": max_questions,
-        "total_questions_asked": questions_asked,
-        "chat_history": chat_history,
-        "resume_chunks": resume_context
-    }
-    
-    # Stream the response
-    for chunk in interview_chain.stream(context):
+    # Stream the response (hedged to the fallback model if no token arrives within the budget)
+    fallback_chain = interviewer_prompt | llm_registry.get("chat_fallback") | StrOutputParser()
+    async for chunk in hedged_stream(
+        interview_chain, fallback_chain, context, endpoint="next_question_stream", session_id=session_id
+    ):
         yield chunk
 
 
@@ -492,6 +575,14 @@ async def root():
     }
 
 
+async def embed_chunks_safely(chunks: List[str]) -> None:
+    """Warm the chunk embedding cache; retrieval falls back to all chunks if this fails."""
+    try:
+        await chunk_retriever.embed_chunks(chunks)
+    except Exception as e:
+        print(f"[RETRIEVAL] Failed to embed chunks: {str(e)}")
+
+
 @app.post("/parse-resume", response_model=ParseResumeResponse)
 async def parse_resume(request: ParseResumeRequest):
     """
@@ -508,8 +599,12 @@ async def parse_resume(request: ParseResumeRequest):
         print(f"[DEBUG] Resume text length: {len(request.resumeText)} characters")
         print(f"[DEBUG] Number of chunks: {len(request.chunks)}")
         
-        # Parse resume from chunks
-        resume_profile = parse_resume_from_chunks(request.resumeText, request.chunks)
+        # Parse resume (served from the parse cache when seen before) and embed
+        # chunks once at upload so interviews start with a warm retrieval index
+        resume_profile, _ = await asyncio.gather(
+            get_or_parse_resume(request.resumeText, request.chunks),
+            embed_chunks_safely(request.chunks)
+        )
         
         print(f"[DEBUG] Resume parsed successfully")
         print(f"[DEBUG] Extracted profile: {resume_profile}")
@@ -530,7 +625,7 @@ async def init_interview(request: InitInterviewRequest):
     
     Flow:
     1. Immediately return intro question (no LLM call - instant!)
-    2. Parse resume and generate first real question in background
+    2. Reuse the profile parsed at upload (or parse resume) and generate first real question in background
     3. First question is ready when user finishes answering intro
     """
     import asyncio
@@ -545,31 +640,40 @@ async def init_interview(request: InitInterviewRequest):
             "Could you please introduce yourself and tell me what excites you most about your career?"
         )
         
-        # Create a minimal session first (will be updated in background)
-        session_manager.create_session(
-            session_id=request.sessionId,
-            resume_profile={"seniority_level": "Junior", "name": "", "skills": []},  # Placeholder
-            chunks=request.chunks
-        )
+        # Reuse the profile parsed at upload time when the backend sends it
+        resume_profile = profile_from_stored(request.resumeProfile)
         
-        # Store intro question in session
-        session_manager.update_conversation(
-            session_id=request.sessionId,
-            question=intro_question,
-            answer=None
-        )
+        async with session_manager.lock(request.sessionId):
+            # Create the session (placeholder profile is updated in background if parsing is needed)
+            await session_manager.create_session(
+                session_id=request.sessionId,
+                resume_profile=resume_profile or {"seniority_level": "Junior", "name": "", "skills": []},
+                chunks=request.chunks
+            )
+            
+            # Store intro question in session
+            await session_manager.update_conversation(
+                session_id=request.sessionId,
+                question=intro_question,
+                answer=None
+            )
         
         print(f"[INSTANT] Returning intro question immediately!")
         print(f"[BACKGROUND] Starting resume parsing and Q1 generation in background...")
         
         # ===== BACKGROUND: Parse resume + Generate Q1 =====
         # This runs while user answers the intro question
-        asyncio.create_task(
-            generate_first_question_background(
+        task_scheduler.reopen_session(request.sessionId)
+        task_scheduler.schedule(
+            request.sessionId,
+            "pregen:1",
+            lambda: generate_first_question_background(
                 session_id=request.sessionId,
                 resume_text=request.resumeText,
-                chunks=request.chunks
-            )
+                chunks=request.chunks,
+                resume_profile=resume_profile
+            ),
+            supersedes="pregen:"
         )
         
         return InitInterviewResponse(question=intro_question)
@@ -581,58 +685,78 @@ async def init_interview(request: InitInterviewRequest):
         raise HTTPException(status_code=500, detail=f"Error initializing interview: {str(e)}")
 
 
-async def generate_first_question_background(session_id: str, resume_text: str, chunks: List[str]):
+async def generate_first_question_background(
+    session_id: str,
+    resume_text: str,
+    chunks: List[str],
+    resume_profile: Optional[Dict[str, Any]] = None
+):
     """
-    Background task to parse resume and generate first real question.
-    Runs while user answers the introductory question.
+    Background task to parse resume (unless already parsed) and generate first real question.
+    Runs while user answers the introductory question (scheduled through task_scheduler).
     """
-    try:
-        import time
-        start_time = time.time()
+    import time
+    start_time = time.time()
+    
+    # Conversation state the first question is speculated from (intro pending)
+    snapshot = await session_manager.snapshot(session_id)
+    if not snapshot:
+        return
+    base_history = snapshot.conversation
+    
+    if resume_profile is None:
         print(f"[BACKGROUND] Starting resume parsing for session {session_id}")
         
-        # Parse resume (takes ~1-2 seconds)
-        resume_profile = parse_resume_from_chunks(resume_text, chunks)
+        # Parse resume (cache hit when the same resume was parsed at upload)
+        resume_profile = await get_or_parse_resume(resume_text, chunks, session_id)
         
         elapsed = time.time() - start_time
         print(f"[BACKGROUND] Resume parsed in {elapsed:.2f}s")
-        
-        # Determine max questions based on seniority
-        seniority = resume_profile.get('seniority_level', 'Junior').lower()
-        if seniority == "fresher":
-            max_questions = 5
-        elif seniority == "junior":
-            max_questions = 7
-        else:
-            max_questions = 10
-        
-        # Update session with actual profile
-        session = session_manager.get_session(session_id)
-        if session:
-            session["resume_profile"] = resume_profile
-            session["max_questions"] = max_questions
-            print(f"[BACKGROUND] Session updated with profile: {resume_profile.get('seniority_level')}")
-        
-        # Generate first real question (takes ~1-2 seconds)
-        print(f"[BACKGROUND] Generating first real question...")
-        first_question = generate_first_question(
-            session_id=session_id,
-            chunks=chunks,
-            seniority_level=resume_profile['seniority_level'],
-            max_questions=max_questions
-        )
-        
-        # Store as pre-generated question (will be used when user finishes intro)
-        session_manager.set_pregenerated_question(session_id, first_question)
-        
-        total_elapsed = time.time() - start_time
-        print(f"[BACKGROUND] First question pre-generated in {total_elapsed:.2f}s total")
-        print(f"[BACKGROUND] Q1: {first_question[:100]}...")
-        
+    else:
+        print(f"[BACKGROUND] Reusing stored resume profile for session {session_id}")
+    
+    # Determine max questions based on seniority
+    max_questions = determine_max_questions(resume_profile)
+    
+    # Update session with actual profile
+    await session_manager.set_resume_profile(session_id, resume_profile)
+    print(f"[BACKGROUND] Session updated with profile: {resume_profile.get('seniority_level')}")
+    
+    # Build the session's chunk index (embeddings are cached from upload)
+    try:
+        await chunk_retriever.build_index(session_id, chunks)
     except Exception as e:
-        print(f"[BACKGROUND ERROR] Failed to generate first question: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        print(f"[RETRIEVAL] Index build failed for session {session_id}: {str(e)}")
+    relevant_chunks = await chunk_retriever.select(
+        session_id, chunks, build_retrieval_query(resume_profile, [])
+    )
+    
+    # Generate first real question (takes ~1-2 seconds)
+    print(f"[BACKGROUND] Generating first real question...")
+    usage: Dict[str, int] = {}
+    first_question = await generate_first_question(
+        session_id=session_id,
+        chunks=relevant_chunks,
+        seniority_level=resume_profile['seniority_level'],
+        max_questions=max_questions,
+        usage=usage
+    )
+    
+    # Store as pre-generated question (served when user finishes intro, if still valid)
+    speculation = speculation_engine.build(
+        first_question,
+        base_history,
+        estimate_tokens("".join(relevant_chunks)),
+        spent_tokens=sum(usage.values())
+    )
+    speculation_engine.record_generated(session_id)
+    if not await session_manager.set_pregenerated_question(session_id, speculation):
+        # The intro was answered first and Q1 was generated normally
+        speculation_engine.discard(session_id, speculation)
+    
+    total_elapsed = time.time() - start_time
+    print(f"[BACKGROUND] First question pre-generated in {total_elapsed:.2f}s total")
+    print(f"[BACKGROUND] Q1: {first_question[:100]}...")
 
 
 @app.post("/next-question", response_model=NextQuestionResponse)
@@ -648,71 +772,72 @@ async def next_question(request: NextQuestionRequest):
         start_time = time.time()
         print(f"[DEBUG] Generating next question for session: {request.sessionId}")
         
-        # Get session data
-        session = session_manager.get_session(request.sessionId)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Update conversation with the answer to current question
-        conversation = session_manager.get_conversation_history(request.sessionId)
-        if conversation and len(conversation) > 0:
-            last_qa = conversation[-1]
-            if last_qa.get("answer") is None:
-                session_manager.update_conversation(
+        # One request at a time per session: answer -> next question -> pregeneration
+        async with session_manager.lock(request.sessionId):
+            snapshot = await load_session(request.sessionId)
+            if not snapshot:
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            # Update conversation with the answer to current question
+            if snapshot.history and snapshot.history[-1].answer is None:
+                snapshot = await session_manager.update_conversation(
                     session_id=request.sessionId,
-                    question=last_qa["question"],
+                    question=snapshot.history[-1].question,
                     answer=request.currentAnswer
-                )
-        
-        # Check for pre-generated question (instant response!)
-        pregenerated = session_manager.get_pregenerated_question(request.sessionId)
-        
-        if pregenerated:
-            # Use pre-generated question - nearly instant!
-            next_q = pregenerated
-            elapsed = time.time() - start_time
-            print(f"[PREGEN] Used pre-generated question in {elapsed:.3f}s (instant!)")
-        else:
-            # No pre-generated question, generate normally
-            questions_asked = session_manager.get_questions_asked(request.sessionId)
-            max_questions = session_manager.get_max_questions(request.sessionId)
-            resume_profile = session_manager.get_resume_profile(request.sessionId)
-            chunks = session_manager.get_chunks(request.sessionId)
-            
-            if questions_asked >= max_questions:
-                return NextQuestionResponse(nextQuestion=None)
+                ) or snapshot
+                # Fold older turns into the running summary in the background
+                schedule_memory_update(request.sessionId, snapshot.turn)
+            conversation = snapshot.conversation
             
-            conversation = session_manager.get_conversation_history(request.sessionId)
-            chat_history = "\n\n".join([
-                f"{qa['question']}\nA: {qa.get('answer', 'No answer yet')}"
-                for qa in conversation
-            ])
+            # Check for a pre-generated question that is still valid for this answer (instant response!)
+            speculation = await session_manager.get_pregenerated_question(request.sessionId)
+            outcome, next_q = speculation_engine.evaluate(speculation, conversation)
+            speculation_engine.record(request.sessionId, outcome, speculation)
             
-            next_q = generate_next_question(
-                session_id=request.sessionId,
-                chunks=chunks,
-                seniority_level=resume_profile['seniority_level'],
-                max_questions=max_questions,
-                questions_asked=questions_asked,
-                chat_history=chat_history
-            )
-            elapsed = time.time() - start_time
-            print(f"[DEBUG] Generated question normally in {elapsed:.2f}s")
-        
-        if next_q:
-            # Store next question in session
-            session_manager.update_conversation(
-                session_id=request.sessionId,
-                question=next_q,
-                answer=None
-            )
+            if next_q:
+                # Use pre-generated question - nearly instant!
+                elapsed = time.time() - start_time
+                print(f"[PREGEN] Served pre-generated question ({outcome}) in {elapsed:.3f}s (instant!)")
+            else:
+                # No valid pre-generated question, generate normally
+                print(f"[PREGEN] Pre-generated question not used: {outcome}")
+                if snapshot.questions_asked >= snapshot.max_questions:
+                    return NextQuestionResponse(nextQuestion=None)
+                
+                chat_history = build_chat_history(snapshot, conversation)
+                
+                # Only the chunks relevant to the latest answer / uncovered topics
+                relevant_chunks = await chunk_retriever.select(
+                    request.sessionId, snapshot.chunks,
+                    build_retrieval_query(snapshot.resume_profile, conversation)
+                )
+                
+                next_q = await generate_next_question(
+                    session_id=request.sessionId,
+                    chunks=relevant_chunks,
+                    seniority_level=snapshot.resume_profile['seniority_level'],
+                    max_questions=snapshot.max_questions,
+                    questions_asked=snapshot.questions_asked,
+                    chat_history=chat_history
+                )
+                elapsed = time.time() - start_time
+                print(f"[DEBUG] Generated question normally in {elapsed:.2f}s")
             
-            # Trigger background pre-generation for NEXT-NEXT question
-            asyncio.create_task(
-                pregenerate_next_question_background(request.sessionId)
-            )
-        else:
-            print(f"[DEBUG] Interview completed - max questions reached")
+            if next_q:
+                # Store next question in session
+                await session_manager.update_conversation(
+                    session_id=request.sessionId,
+                    question=next_q,
+                    answer=None
+                )
+                
+                # Trigger background pre-generation for NEXT-NEXT question
+                schedule_pregeneration(request.sessionId, snapshot.turn + 1)
+            else:
+                print(f"[DEBUG] Interview completed - max questions reached")
+                speculation_engine.discard(
+                    request.sessionId, await session_manager.get_pregenerated_question(request.sessionId)
+                )
         
         return NextQuestionResponse(nextQuestion=next_q)
         
@@ -725,51 +850,78 @@ async def next_question(request: NextQuestionRequest):
         raise HTTPException(status_code=500, detail=f"Error generating next question: {str(e)}")
 
 
+def schedule_pregeneration(session_id: str, turn: int) -> None:
+    """Pregenerate for the session's current turn, cancelling any older turn's pregeneration."""
+    task_scheduler.schedule(
+        session_id,
+        f"pregen:{turn}",
+        lambda: pregenerate_next_question_background(session_id),
+        supersedes="pregen:"
+    )
+
+
+def schedule_memory_update(session_id: str, turn: int) -> None:
+    """Fold older turns into the summary once per turn."""
+    task_scheduler.schedule(
+        session_id,
+        f"memory:{turn}",
+        lambda: update_memory_background(session_id)
+    )
+
+
 async def pregenerate_next_question_background(session_id: str):
-    """Background task to pre-generate the next question while user is answering."""
-    try:
-        import asyncio
-        # Small delay to let current response complete
-        await asyncio.sleep(0.5)
-        
-        session = session_manager.get_session(session_id)
-        if not session:
-            return
-        
-        questions_asked = session_manager.get_questions_asked(session_id)
-        max_questions = session_manager.get_max_questions(session_id)
-        
-        # Don't pre-generate if interview is about to end
-        if questions_asked >= max_questions - 1:
-            print(f"[PREGEN] Skipping pre-generation - interview near end")
-            return
-        
-        resume_profile = session_manager.get_resume_profile(session_id)
-        chunks = session_manager.get_chunks(session_id)
-        conversation = session_manager.get_conversation_history(session_id)
-        
-        chat_history = "\n\n".join([
-            f"{qa['question']}\nA: {qa.get('answer', 'No answer yet')}"
-            for qa in conversation
-        ])
-        
-        print(f"[PREGEN] Starting background pre-generation for session {session_id}")
-        
-        pregenerated_question = generate_next_question(
-            session_id=session_id,
-            chunks=chunks,
-            seniority_level=resume_profile['seniority_level'],
-            max_questions=max_questions,
-            questions_asked=questions_asked + 1,  # For the NEXT question
-            chat_history=chat_history
+    """
+    Background task to pre-generate the next question while user is answering.
+    Scheduled through task_scheduler: one per session and turn, superseding older turns.
+    """
+    import asyncio
+    # Small delay to let current response complete
+    await asyncio.sleep(0.5)
+    
+    # One consistent view of the turn this speculation is built from (latest answer still pending)
+    snapshot = await session_manager.snapshot(session_id)
+    if not snapshot:
+        return
+    
+    # Don't pre-generate if interview is about to end
+    if snapshot.questions_asked >= snapshot.max_questions - 1:
+        print(f"[PREGEN] Skipping pre-generation - interview near end")
+        return
+    
+    conversation = snapshot.conversation
+    chat_history = build_chat_history(snapshot, conversation)
+    
+    print(f"[PREGEN] Starting background pre-generation for session {session_id}")
+    
+    relevant_chunks = await chunk_retriever.select(
+        session_id, snapshot.chunks, build_retrieval_query(snapshot.resume_profile, conversation)
+    )
+    
+    usage: Dict[str, int] = {}
+    pregenerated_question = await generate_next_question(
+        session_id=session_id,
+        chunks=relevant_chunks,
+        seniority_level=snapshot.resume_profile['seniority_level'],
+        max_questions=snapshot.max_questions,
+        questions_asked=snapshot.questions_asked + 1,  # For the NEXT question
+        chat_history=chat_history,
+        endpoint="pregeneration",
+        usage=usage
+    )
+    
+    if pregenerated_question:
+        speculation = speculation_engine.build(
+            pregenerated_question,
+            conversation,
+            estimate_tokens(chat_history) + estimate_tokens("".join(relevant_chunks)),
+            spent_tokens=sum(usage.values())
         )
-        
-        if pregenerated_question:
-            session_manager.set_pregenerated_question(session_id, pregenerated_question)
+        speculation_engine.record_generated(session_id)
+        if await session_manager.set_pregenerated_question(session_id, speculation):
             print(f"[PREGEN] Background pre-generation complete for session {session_id}")
-    
-    except Exception as e:
-        print(f"[PREGEN ERROR] Background pre-generation failed: {str(e)}")
+        else:
+            # The session moved on while this was generating; never served
+            speculation_engine.discard(session_id, speculation)
 
 
 # ==================== Streaming Endpoint ====================
@@ -777,65 +929,112 @@ async def pregenerate_next_question_background(session_id: str):
 @app.post("/next-question-stream")
 async def next_question_stream(request: NextQuestionRequest):
     """
-    Stream the next interview question word-by-word for faster perceived response.
-    Uses Server-Sent Events (SSE) format.
+    Stream the next interview question token-by-token for faster perceived response.
+    Uses Server-Sent Events (SSE) format:
+    - data: {"chunk": "..."}                      (one or more)
+    - data: {"done": true, "fullQuestion": "..."} (fullQuestion is null when the interview is over)
+    
+    A still-valid pre-generated question is sent instantly as a single chunk.
     """
     import time
     
-    session = session_manager.get_session(request.sessionId)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    start_time = time.perf_counter()
     
-    # Update conversation with answer
-    conversation = session_manager.get_conversation_history(request.sessionId)
-    if conversation and len(conversation) > 0:
-        last_qa = conversation[-1]
-        if last_qa.get("answer") is None:
-            session_manager.update_conversation(
+    async with session_manager.lock(request.sessionId):
+        snapshot = await load_session(request.sessionId)
+        if not snapshot:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        # Update conversation with answer
+        if snapshot.history and snapshot.history[-1].answer is None:
+            snapshot = await session_manager.update_conversation(
                 session_id=request.sessionId,
-                question=last_qa["question"],
+                question=snapshot.history[-1].question,
                 answer=request.currentAnswer
-            )
+            ) or snapshot
+            schedule_memory_update(request.sessionId, snapshot.turn)
+        
+        # Check for a pre-generated question that is still valid for this answer
+        speculation = await session_manager.get_pregenerated_question(request.sessionId)
     
-    questions_asked = session_manager.get_questions_asked(request.sessionId)
-    max_questions = session_manager.get_max_questions(request.sessionId)
-    resume_profile = session_manager.get_resume_profile(request.sessionId)
-    chunks = session_manager.get_chunks(request.sessionId)
+    conversation = snapshot.conversation
+    questions_asked = snapshot.questions_asked
+    max_questions = snapshot.max_questions
+    resume_profile = snapshot.resume_profile
+    if questions_asked >= max_questions:
+        speculation_engine.discard(request.sessionId, speculation)
+        outcome, pregenerated = "miss", None
+    else:
+        outcome, pregenerated = speculation_engine.evaluate(speculation, conversation)
+        speculation_engine.record(request.sessionId, outcome, speculation)
     
-    conversation = session_manager.get_conversation_history(request.sessionId)
-    chat_history = "\n\n".join([
-        f"{qa['question']}\nA: {qa.get('answer', 'No answer yet')}"
-        for qa in conversation
-    ])
+    def sse(payload: Dict[str, Any]) -> str:
+        # SSE format: data: <json>\n\n
+        return f"data: {json.dumps(payload)}\n\n"
     
-    def generate():
-        """Generator that streams the question."""
+    async def store_question(question: str) -> None:
+        """Store the completed question and start pre-generating the one after it."""
+        await session_manager.update_conversation(
+            session_id=request.sessionId,
+            question=question,
+            answer=None
+        )
+        schedule_pregeneration(request.sessionId, snapshot.turn + 1)
+    
+    async def serve_pregenerated():
+        """Send the pre-generated question in one event."""
+        await store_question(pregenerated)
+        elapsed = time.perf_counter() - start_time
+        latency_metrics.observe(request.sessionId, "stream_ttft", elapsed)
+        latency_metrics.observe(request.sessionId, "stream_total", elapsed)
+        print(f"[STREAM] Served pre-generated question ({outcome}) for session {request.sessionId}")
+        
+        yield sse({"chunk": pregenerated})
+        yield sse({"done": True, "fullQuestion": pregenerated, "source": "pregenerated"})
+    
+    async def generate():
+        """Async generator that streams a freshly generated question."""
+        if questions_asked >= max_questions:
+            print(f"[STREAM] Interview completed - max questions reached")
+            yield sse({"done": True, "fullQuestion": None})
+            return
+        
+        chat_history = build_chat_history(snapshot, conversation)
+        relevant_chunks = await chunk_retriever.select(
+            request.sessionId, snapshot.chunks, build_retrieval_query(resume_profile, conversation)
+        )
+        
         full_question = ""
+        first_token = True
         
-        for chunk in stream_next_question(
+        async for chunk in stream_next_question(
             session_id=request.sessionId,
-            chunks=chunks,
+            chunks=relevant_chunks,
             seniority_level=resume_profile['seniority_level'],
             max_questions=max_questions,
             questions_asked=questions_asked,
             chat_history=chat_history
         ):
+            if not chunk:
+                continue
+            if first_token:
+                latency_metrics.observe(request.sessionId, "stream_ttft", time.perf_counter() - start_time)
+                first_token = False
             full_question += chunk
-            # SSE format: data: <chunk>\n\n
-            yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+            yield sse({"chunk": chunk})
         
-        # Send completion signal with full question
-        yield f"data: {json.dumps({'done': True, 'fullQuestion': full_question.strip()})}\n\n"
+        # Store before signalling completion so the client's next answer finds this turn.
+        # A client disconnect cancels this generator earlier, so partial questions are never stored.
+        question = full_question.strip()
+        if question:
+            await store_question(question)
+        latency_metrics.observe(request.sessionId, "stream_total", time.perf_counter() - start_time)
         
-        # Store in session
-        session_manager.update_conversation(
-            session_id=request.sessionId,
-            question=full_question.strip(),
-            answer=None
-        )
+        # Send completion signal with full question
+        yield sse({"done": True, "fullQuestion": question or None, "source": "generated"})
     
     return StreamingResponse(
-        generate(),
+        serve_pregenerated() if pregenerated else generate(),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -848,66 +1047,196 @@ async def next_question_stream(request: NextQuestionRequest):
 
 
 
-@app.post("/generate-assessment", response_model=GenerateAssessmentResponse)
-async def generate_assessment_endpoint(request: GenerateAssessmentRequest):
+async def score_turn(
+    question: str,
+    answer: str,
+    seniority_level: str,
+    session_id: Optional[str] = None,
+    endpoint: str = "turn_scoring"
+) -> Dict[str, Any]:
     """
-    Generate interview assessment after all questions answered.
-    Returns structured assessment with ratings and recommendations.
+    Score one answer with the assessment rubric (compact TurnScore result).
+    
+    Args:
+        question: Question that was asked
+        answer: Candidate's answer
+        seniority_level: Expected seniority level
+        session_id: Session the LLM call is accounted to
+        endpoint: Accounting label
+        
+    Returns:
+        TurnScore dict tagged with the rubric version
     """
-    try:
-        print(f"[DEBUG] Generating assessment for session: {request.sessionId}")
+    # A very long answer is cut (its opening kept); the question always fits
+    packed = context_packer.pack("turn_scoring", [
+        Section("question", question or "N/A", priority=1, max_tokens=200),
+        Section("answer", answer or "N/A", priority=2),
+    ])
+    chain = turn_scoring_prompt | llm_registry.get("turn_scoring")
+    result = await run_llm(chain, {
+        "difficulty_level": seniority_level,
+        "question": packed["question"],
+        "answer": packed["answer"],
+    }, endpoint=endpoint, session_id=session_id)
+    
+    turn = result.model_dump()
+    turn["score"] = max(0, min(100, int(turn["score"])))
+    turn["rubricVersion"] = ASSESSMENT_RUBRIC_VERSION
+    return turn
+
+
+async def assess_transcript(
+    resume_text: str,
+    chunks: List[str],
+    transcript: List[Dict[str, str]],
+    seniority_level: str,
+    session_id: Optional[str] = None,
+    endpoint: str = "assessment",
+    turn_scores: Optional[List[Optional[Dict[str, Any]]]] = None,
+    turn_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Assess an interview transcript by aggregating per-answer scores.
+    Scores computed while the interview ran are reused; missing or outdated ones are scored
+    now, concurrently. One short synthesis call (bounded by ASSESSMENT_SYNTHESIS_TIMEOUT_SECONDS)
+    writes the narrative; without it the deterministic summary is kept.
+    Stateless: used for live sessions and for batch re-assessment of stored results.
+    
+    Args:
+        resume_text: Candidate's resume text
+        chunks: Resume text chunks
+        transcript: List of {question, answer} pairs
+        seniority_level: Expected seniority level
+        session_id: Session the LLM calls are accounted to
+        endpoint: Accounting label ("assessment" or "reassessment"); backfilled turns use "<endpoint>_turn"
+        turn_scores: Stored TurnScore dicts aligned with transcript (None where missing)
+        turn_concurrency: Max missing turns scored at once (all at once when None)
         
-        # Create structured LLM for assessment
-        structured_assessor = llm.with_structured_output(InterviewAssessment)
+    Returns:
+        Assessment dict in the shape the frontend expects
+    """
+    started = time.perf_counter()
+    turns = list(turn_scores or [])[:len(transcript)]
+    turns += [None] * (len(transcript) - len(turns))
+    
+    missing = [
+        i for i, turn in enumerate(turns)
+        if not turn or turn.get("rubricVersion") != ASSESSMENT_RUBRIC_VERSION
+    ]
+    if missing:
+        semaphore = asyncio.Semaphore(max(1, turn_concurrency or len(missing)))
         
-        # Prepare detailed profile document with more context
-        profile_doc = {
-            "resume_summary": request.resumeText[:2000],  # Include more resume context
-            "seniority_level": request.seniorityLevel,
-            "key_skills_from_resume": request.chunks[:3] if request.chunks else []  # First 3 resume chunks
-        }
+        async def score_missing(i: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await score_turn(
+                    transcript[i].get("question", ""), transcript[i].get("answer", ""),
+                    seniority_level, session_id, endpoint=f"{endpoint}_turn"
+                )
         
-        # Format chat history with clear structure
-        chat_history = "\n\n".join([
-            f"QUESTION {i+1}:\n{qa.get('question', 'N/A')}\n\nCANDIDATE ANSWER {i+1}:\n{qa.get('answer', 'N/A')}" 
-            for i, qa in enumerate(request.transcript)
+        backfilled = await asyncio.gather(*(score_missing(i) for i in missing))
+        for i, turn in zip(missing, backfilled):
+            turns[i] = turn
+    
+    print(f"[ASSESSMENT] {len(transcript) - len(missing)}/{len(transcript)} turn scores reused, {len(missing)} scored now")
+    assessment_dict = aggregate_turn_scores(turns)
+    
+    if ASSESSMENT_SYNTHESIS_ENABLED and turns:
+        # Per-question results first (oldest dropped if needed), then resume context
+        packed = context_packer.pack("synthesis", [
+            Section("turn_results", format_turns(transcript, turns), priority=1, keep="tail", separator="\n"),
+            Section("resume_summary", chunks or [resume_text], priority=2, max_tokens=400),
         ])
-        
-        print(f"[DEBUG] Transcript length: {len(chat_history)} characters")
-        print(f"[DEBUG] Number of Q&A pairs: {len(request.transcript)}")
-        
-        # Prepare inputs for assessment
-        inputs = {
-            "difficulty_level": request.seniorityLevel,
-            "profile_doc": json.dumps(profile_doc, indent=2),
-            "chat_history": chat_history
+        profile_doc = {
+            "resume_summary": packed["resume_summary"],
+            "seniority_level": seniority_level,
         }
+        chain = synthesis_prompt | llm_registry.get("synthesis")
+        try:
+            synthesis = await asyncio.wait_for(run_llm(chain, {
+                "difficulty_level": seniority_level,
+                "profile_doc": json.dumps(profile_doc),
+                "turn_results": packed["turn_results"],
+                "overall_score": assessment_dict["candidate_score_percent"],
+                "recommendation": assessment_dict["hiring_recommendation"],
+            }, endpoint=endpoint, session_id=session_id), timeout=ASSESSMENT_SYNTHESIS_TIMEOUT_SECONDS)
+            assessment_dict["answer_quality_analysis"] = synthesis.answer_quality_analysis
+            assessment_dict["summary"] = (
+                f"{synthesis.answer_quality_analysis} Overall recommendation: {assessment_dict['hiring_recommendation']}."
+            )
+            assessment_dict["recommendations"] = [synthesis.next_steps]
+        except Exception as e:
+            # The aggregate already carries a deterministic summary
+            print(f"[ASSESSMENT] Synthesis skipped: {type(e).__name__}: {str(e)}")
+    
+    print(
+        f"[ASSESSMENT] Score {assessment_dict['candidate_score_percent']}/100 "
+        f"({assessment_dict['hiring_recommendation']}) in {time.perf_counter() - started:.2f}s"
+    )
+    return assessment_dict
+
+
+@app.post("/score-answer", response_model=ScoreAnswerResponse)
+async def score_answer_endpoint(request: ScoreAnswerRequest):
+    """
+    Score one answer as soon as it is saved (called in the background by the backend).
+    Stateless - the result is stored with the answer and reused by /generate-assessment.
+    """
+    try:
+        turn = await score_turn(
+            request.question, request.answer, request.seniorityLevel, session_id=request.sessionId
+        )
+        return ScoreAnswerResponse(turnScore=turn, rubricVersion=ASSESSMENT_RUBRIC_VERSION)
+    except Exception as e:
+        print(f"[ERROR] Scoring Q{request.questionNumber} for session {request.sessionId} failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error scoring answer: {str(e)}")
+
+
+@app.post("/generate-assessment", response_model=GenerateAssessmentResponse)
+async def generate_assessment_endpoint(request: GenerateAssessmentRequest):
+    """
+    Generate interview assessment after all questions answered.
+    Aggregates the per-answer scores sent in turnScores (scoring any that are missing)
+    and returns structured assessment with ratings and recommendations.
+    """
+    try:
+        print(f"[DEBUG] Generating assessment for session: {request.sessionId}")
         
-        # Generate assessment
-        print("[DEBUG] Invoking assessment LLM...")
-        chain = assessment_prompt | structured_assessor
-        assessment = chain.invoke(inputs)
-        
-        # Convert Pydantic model to dict and map field names to match frontend
-        assessment_dict = {
-            "candidate_score_percent": assessment.candidate_score_percent,
-            "hiring_recommendation": assessment.hiring_recommendation,
-            "summary": f"{assessment.answer_quality_analysis} Overall recommendation: {assessment.hiring_recommendation}.",
-            "strengths": assessment.strengths,
-            "weaknesses": assessment.improvement_areas,
-            "recommendations": [assessment.next_steps] if isinstance(assessment.next_steps, str) else assessment.next_steps,
-            "answer_quality_analysis": assessment.answer_quality_analysis
-        }
+        # Interview is over - stop any pregeneration / memory work for this session
+        task_scheduler.cancel_session(request.sessionId)
         
-        print(f"[DEBUG] Assessment generated successfully")
-        print(f"[DEBUG] Score: {assessment_dict['candidate_score_percent']}/100")
-        print(f"[DEBUG] Recommendation: {assessment_dict['hiring_recommendation']}")
+        assessment_dict = await assess_transcript(
+            resume_text=request.resumeText,
+            chunks=request.chunks,
+            transcript=request.transcript,
+            seniority_level=request.seniorityLevel,
+            session_id=request.sessionId,
+            turn_scores=request.turnScores
+        )
         
         # Cleanup session cache after assessment is complete
-        session_manager.delete_session(request.sessionId)
+        async with session_manager.lock(request.sessionId):
+            speculation_engine.discard(
+                request.sessionId, await session_manager.get_pregenerated_question(request.sessionId)
+            )
+            await session_manager.delete_session(request.sessionId)
+        chunk_retriever.drop(request.sessionId)
+        speculation_stats = speculation_engine.forget(request.sessionId)
+        print(f"[PREGEN] Session {request.sessionId} speculation stats: {speculation_stats}")
         print(f"[CACHE] Session {request.sessionId} cleaned up from cache")
         
-        return GenerateAssessmentResponse(assessment=assessment_dict)
+        # Final per-session accounting, stored by the backend with the result
+        usage_summary = {
+            "llm": usage_metrics.forget(request.sessionId),
+            "latency": latency_metrics.forget(request.sessionId),
+            "pregeneration": speculation_stats,
+        }
+        print(f"[METRICS] Session {request.sessionId} used {usage_summary['llm']['totals']['total_tokens']} tokens")
+        
+        return GenerateAssessmentResponse(
+            assessment=assessment_dict,
+            usage=usage_summary,
+            rubricVersion=ASSESSMENT_RUBRIC_VERSION
+        )
     
     except Exception as e:
         print(f"[ERROR] Exception occurred while generating assessment:")
@@ -917,6 +1246,28 @@ async def generate_assessment_endpoint(request: GenerateAssessmentRequest):
         raise HTTPException(status_code=500, detail=f"Error generating assessment: {str(e)}")
 
 
+@app.post("/reassess", response_model=ReassessResponse)
+async def reassess_endpoint(request: ReassessRequest):
+    """
+    Re-score a stored transcript with the current rubric (batch re-assessment).
+    Never touches live session state.
+    """
+    try:
+        assessment_dict = await assess_transcript(
+            resume_text=request.resumeText,
+            chunks=request.chunks,
+            transcript=request.transcript,
+            seniority_level=request.seniorityLevel,
+            endpoint="reassessment",
+            turn_concurrency=request.turnConcurrency
+        )
+        return ReassessResponse(assessment=assessment_dict, rubricVersion=ASSESSMENT_RUBRIC_VERSION)
+    
+    except Exception as e:
+        print(f"[ERROR] Re-assessment failed for session {request.sessionId}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error re-assessing transcript: {str(e)}")
+
+
 # ==================== Resume Tips Endpoint (Minimal Tokens) ====================
 
 class ResumeTipsRequest(BaseModel):
@@ -927,47 +1278,84 @@ class ResumeTipsRequest(BaseModel):
     resume_excerpt: str
 
 
+# Rendered with the bucketed score, so a cached result is exact for every request with the same key
+RESUME_TIPS_PROMPT = """Resume Analysis:
+- ATS Score: {score}%
+- Level: {seniority}
+- Skills: {skills}
+- Weak Areas: {weak_areas}
+
+Give exactly 3 specific, actionable tips to improve this resume.
+Each tip must be 1 short sentence.
+Focus on the weak areas.
+Format: numbered list only, no intro."""
+
+RESUME_TIPS_PROMPT_VERSION = hashlib.sha256(RESUME_TIPS_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+async def generate_tips(request: ResumeTipsRequest, cache_key: str) -> List[str]:
+    """One LLM call for a tips cache key; the result is stored for every worker."""
+    # Another worker may have filled the entry while this request waited
+    cached = await resume_tips_cache.aget(cache_key)
+    if cached is not None:
+        return cached["tips"]
+
+    # Build a minimal, token-efficient prompt
+    prompt = RESUME_TIPS_PROMPT.format(
+        score=bucket_score(request.score),
+        seniority=request.seniority,
+        skills=", ".join(request.skills[:5]) if request.skills else "not specified",
+        weak_areas=", ".join(request.weak_areas) if request.weak_areas else "none identified"
+    )
+
+    # Use the prebuilt tips client (capped max_tokens for efficiency)
+    response = await run_llm(llm_registry.get("tips"), prompt, endpoint="resume_tips")
+
+    # Parse the response into tips
+    tips_text = response.content.strip()
+    tips = [line.strip() for line in tips_text.split('\n') if line.strip()]
+
+    # Clean up numbering if present (remove leading "1.", "1)", etc.)
+    cleaned_tips = []
+    for tip in tips[:3]:
+        cleaned = re.sub(r'^[\d]+[\.\)\-\s]+', '', tip).strip()
+        if cleaned:
+            cleaned_tips.append(cleaned)
+
+    if cleaned_tips:
+        await resume_tips_cache.aset(cache_key, {"tips": cleaned_tips[:3]})
+    return cleaned_tips[:3]
+
+
 @app.post("/generate-resume-tips")
 async def generate_resume_tips(request: ResumeTipsRequest):
     """
     Generate 3 personalized resume improvement tips.
-    Uses minimal tokens (~250 total) for cost efficiency.
+    Uses minimal tokens (~250 total) on a cache miss and none on a hit: results are cached by a
+    fingerprint of score bucket, seniority, top-5 skills and weak areas, and concurrent
+    identical requests share one LLM call.
     """
+    cache_key = tips_fingerprint(
+        request.score, request.seniority, request.skills, request.weak_areas, RESUME_TIPS_PROMPT_VERSION
+    )
     try:
-        # Build a minimal, token-efficient prompt
-        weak_areas_str = ", ".join(request.weak_areas) if request.weak_areas else "none identified"
-        skills_str = ", ".join(request.skills[:5]) if request.skills else "not specified"
-        
-        prompt = f"""Resume Analysis:
-- ATS Score: {request.score}%
-- Level: {request.seniority}
-- Skills: {skills_str}
-- Weak Areas: {weak_areas_str}
-
-Give exactly 3 specific, actionable tips to improve this resume.
-Each tip must be 1 short sentence.
-Focus on the weak areas.
-Format: numbered list only, no intro."""
+        cached = await resume_tips_cache.aget(cache_key)
+        if cached is not None:
+            print(f"[TIPS] Cache hit {cache_key[:12]}")
+            return {
+                "ai_tips": cached["tips"],
+                "source": "ai",
+                "cached": True,
+                "tokens_used": "0",
+                "message": "Personalized tips based on your resume analysis"
+            }
+
+        tips = await tips_single_flight.run(cache_key, lambda: generate_tips(request, cache_key))
 
-        # Use a lighter model or lower max_tokens for efficiency
-        response = llm.invoke(prompt)
-        
-        # Parse the response into tips
-        tips_text = response.content.strip()
-        tips = [line.strip() for line in tips_text.split('\n') if line.strip()]
-        
-        # Clean up numbering if present
-        cleaned_tips = []
-        for tip in tips[:3]:
-            # Remove leading numbers like "1.", "1)", etc.
-            import re
-            cleaned = re.sub(r'^[\d]+[\.\)\-\s]+', '', tip).strip()
-            if cleaned:
-                cleaned_tips.append(cleaned)
-        
         return {
-            "ai_tips": cleaned_tips[:3],
+            "ai_tips": tips,
             "source": "ai",
+            "cached": False,
             "tokens_used": "~250",
             "message": "Personalized tips based on your resume analysis"
         }
@@ -977,6 +1365,98 @@ Format: numbered list only, no intro."""
         raise HTTPException(status_code=500, detail=f"Failed to generate tips: {str(e)}")
 
 
+@app.get("/tips/cache/stats")
+async def tips_cache_stats():
+    """Tips cache hit/miss/eviction counters and single-flight coalescing."""
+    cache_stats = await asyncio.to_thread(resume_tips_cache.stats)
+    return {**cache_stats, "single_flight": tips_single_flight.stats()}
+
+
+# ==================== Session Stats ====================
+
+@app.get("/sessions/stats")
+async def session_stats():
+    """Live sessions, approximate bytes, caps, idle / LRU eviction, snapshot, rehydration and memory counters."""
+    return {
+        **await session_manager.gauges(),
+        "rehydrate": session_rehydrator.stats(),
+        "memory": conversation_memory.stats(),
+    }
+
+
+# ==================== Speculation Stats ====================
+
+@app.get("/speculation/stats")
+async def speculation_stats():
+    """Global pregeneration hit/miss/waste counters."""
+    return speculation_engine.stats()
+
+
+@app.get("/speculation/stats/{session_id}")
+async def session_speculation_stats(session_id: str):
+    """Pregeneration counters for one live session."""
+    return speculation_engine.stats(session_id)
+
+
+# ==================== Latency Stats ====================
+
+@app.get("/latency/stats")
+async def latency_stats():
+    """Global latency histograms (streaming time-to-first-token and total generation)."""
+    return latency_metrics.stats()
+
+
+@app.get("/latency/stats/{session_id}")
+async def session_latency_stats(session_id: str):
+    """Latency histograms for one live session."""
+    return latency_metrics.stats(session_id)
+
+
+# ==================== Metrics ====================
+
+@app.get("/metrics")
+async def metrics():
+    """
+    LLM accounting per endpoint: calls, input/output tokens, retries, errors and latency,
+    plus pregeneration waste, streaming latency, how often hedging fired and session gauges.
+    """
+    speculation = speculation_engine.stats()
+    return {
+        "llm": usage_metrics.stats(),
+        "pregeneration": {
+            "generated": speculation["generated"],
+            "wasted_tokens": speculation["wasted_tokens"],
+            "waste_rate": speculation["waste_rate"],
+            "hit_rate": speculation["hit_rate"],
+        },
+        "latency": latency_metrics.stats(),
+        "hedging": hedging_metrics.stats(),
+        "limiter": llm_limiter.stats(),
+        "sessions": await session_manager.gauges(),
+    }
+
+
+@app.get("/metrics/{session_id}")
+async def session_metrics(session_id: str):
+    """The same accounting for one live session."""
+    return {
+        "llm": usage_metrics.stats(session_id),
+        "pregeneration": speculation_engine.stats(session_id),
+        "latency": latency_metrics.stats(session_id),
+    }
+
+
+# ==================== Scheduler Stats ====================
+
+@app.get("/scheduler/stats")
+async def scheduler_stats():
+    """Background task queue depth, outcomes and latency, plus LLM limiter state."""
+    return {
+        "tasks": task_scheduler.stats(),
+        "llm": llm_limiter.stats(),
+    }
+
+
 # ==================== Health Check ====================
 
 @app.get("/health")
@@ -985,6 +1465,9 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
+        "llm": llm_limiter.stats(),
+        "sessionStore": session_manager.store.name,
+        "rubricVersion": ASSESSMENT_RUBRIC_VERSION,
     }
 
 
@@ -0,0 +1,156 @@
+"""
+Concurrency Benchmark
+Runs N simulated interview sessions against the agent with a local fake LLM
+and reports how throughput scales with the number of concurrent sessions.
+
+Usage (from backend/ai-agent):
+    python benchmarks/concurrency_benchmark.py --sessions 1 2 4 8 16 32 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import app as agent_app
+
+
+FAKE_PROFILE = {
+    "candidate_first_name": "Bench",
+    "candidate_last_name": "Candidate",
+    "candidate_email": "bench@example.com",
+    "candidate_linkedin": "",
+    "experience": "5 years building backend services",
+    "skills": ["Python", "FastAPI", "MongoDB"],
+    "seniority_level": "Mid-Senior",
+}
+
+FAKE_RESUME = (
+    "Bench Candidate - Backend Engineer. 5 years building Python and FastAPI services, "
+    "MongoDB data models, async pipelines and CI/CD on AWS. "
+) * 10
+
+
+class FakeInterviewLLM(BaseChatModel):
+    """Chat model that sleeps for a fixed latency and returns canned content."""
+
+    latency: float = 0.2
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-interview-llm"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if "Return ONLY the JSON object" in prompt:
+            return json.dumps(FAKE_PROFILE)
+        return "Great. Could you walk me through a recent project you're proud of?"
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        content = self._reply(messages)
+        # Rough usage (~4 characters per token) so token accounting has numbers to report
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = len(content) // 4
+        message = AIMessage(content=content, usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+
+def install_fake_llm(latency: float) -> None:
+    """Point every LLM used by the agent at the fake model."""
+    fake = FakeInterviewLLM(latency=latency)
+    # chat_fallback too: with --latency above a hedge budget the question stream hedges to it
+    for name in ("chat", "chat_fallback", "json", "tips", "summary"):
+        agent_app.llm_registry.register(name, fake)
+    # No embeddings service offline - retrieval falls back to all chunks
+    agent_app.chunk_retriever.embeddings = None
+
+
+async def run_session(client: httpx.AsyncClient, index: int, turns: int) -> int:
+    """Drive one interview: init + a fixed number of answers. Returns completed turns."""
+    session_id = f"bench-{index}-{time.monotonic_ns()}"
+    chunks = [FAKE_RESUME[i:i + 800] for i in range(0, len(FAKE_RESUME), 700)]
+
+    response = await client.post("/init-interview", json={
+        "sessionId": session_id,
+        "resumeText": FAKE_RESUME,
+        "chunks": chunks,
+    })
+    response.raise_for_status()
+
+    completed = 1
+    for turn in range(1, turns + 1):
+        response = await client.post("/next-question", json={
+            "sessionId": session_id,
+            "currentQuestionNumber": turn,
+            "currentAnswer": f"Simulated answer {turn} with some detail about my work.",
+        })
+        response.raise_for_status()
+        completed += 1
+        if response.json().get("nextQuestion") is None:
+            break
+    return completed
+
+
+async def run_level(sessions: int, turns: int) -> dict:
+    """Run `sessions` concurrent interviews and measure request throughput."""
+    transport = httpx.ASGITransport(app=agent_app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://agent", timeout=300.0) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_session(client, i, turns) for i in range(sessions)))
+        elapsed = time.perf_counter() - start
+
+    requests = sum(results)
+    return {
+        "sessions": sessions,
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Agent concurrency benchmark with a fake LLM")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--turns", type=int, default=3, help="Answers submitted per session")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake LLM latency in seconds")
+    args = parser.parse_args()
+
+    install_fake_llm(args.latency)
+
+    print(f"Fake LLM latency: {args.latency}s | LLM concurrency limit: {agent_app.llm_limiter.limit}")
+    print(f"{'sessions':>8} {'requests':>9} {'elapsed_s':>10} {'req/s':>8}")
+    baseline = None
+    for level in args.sessions:
+        row = await run_level(level, args.turns)
+        baseline = baseline or row["throughput_rps"]
+        print(f"{row['sessions']:>8} {row['requests']:>9} {row['elapsed_s']:>10} "
+              f"{row['throughput_rps']:>8}  (x{row['throughput_rps'] / baseline:.1f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
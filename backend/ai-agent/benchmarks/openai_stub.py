@@ -0,0 +1,441 @@
+"""
+OpenAI-Compatible Stub Server
+Local stand-in for the OpenAI API for offline load and performance testing: chat completions
+(plain, JSON mode, structured output via json_schema or tools, streaming), embeddings and audio
+transcriptions, with configurable latency distributions and record/replay of real responses.
+
+Usage (from backend/ai-agent):
+    python benchmarks/openai_stub.py --port 8900 --ttft lognormal:0.4,0.5 --token-latency fixed:0.01
+    python benchmarks/openai_stub.py --mode record --recordings benchmarks/recordings
+    python benchmarks/openai_stub.py --mode replay --recordings benchmarks/recordings
+
+Point the agent at it with OPENAI_BASE_URL=http://localhost:8900/v1 (backend: same variable in .env).
+
+Modes:
+    stub    synthetic responses only (default)
+    record  forward each request to the real API (--upstream, OPENAI_API_KEY), store the response
+            under the hash of the prompt, and serve it (streaming is replayed from the stored response)
+    replay  serve stored responses by prompt hash; misses fail with 404 unless --on-miss synthetic
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+
+DEFAULT_RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+# JSON-mode reply when the request carries no schema (the agent's resume parse prompt)
+STUB_RESUME_PROFILE = {
+    "candidate_first_name": "Stub",
+    "candidate_last_name": "Candidate",
+    "candidate_email": "stub@example.com",
+    "candidate_linkedin": "",
+    "experience": "5 years building backend services with Python and FastAPI",
+    "skills": ["Python", "FastAPI", "MongoDB", "Docker"],
+    "seniority_level": "Mid-Senior",
+}
+
+STUB_QUESTIONS = [
+    "Great. Could you walk me through a recent project you're proud of?",
+    "Interesting. How did you decide between the options you considered there?",
+    "I see. What was the hardest bug you had to track down in that system?",
+    "Got it. How would you scale that service if traffic grew tenfold?",
+    "Thanks. How do you approach testing code that talks to external APIs?",
+    "Nice. Tell me about a time you disagreed with a teammate on a design.",
+]
+
+STUB_TRANSCRIPT = "I have been working on backend services for about five years, mostly in Python."
+
+EMBEDDING_DIMENSIONS = 1536
+
+
+# ==================== Latency ====================
+
+class LatencyDistribution:
+    """
+    Samples delays in seconds from a spec string:
+    fixed:S | uniform:MIN,MAX | normal:MEAN,STDDEV | lognormal:MEDIAN,SIGMA
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind.strip().lower()
+        self.params = [float(p) for p in params.split(",") if p.strip()] if params else [0.0]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = random.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = random.gauss(p[0], p[1])
+        else:
+            value = random.lognormvariate(math.log(max(p[0], 1e-6)), p[1])
+        return max(0.0, value)
+
+
+# ==================== Synthetic Responses ====================
+
+def estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + 3) // 4)
+
+
+def prompt_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(str(content or ""))
+    return "\n".join(parts)
+
+
+def example_from_schema(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None, name: str = "") -> Any:
+    """Smallest plausible value that satisfies a JSON schema (handles $ref, anyOf, enum)."""
+    defs = defs if defs is not None else schema.get("$defs", schema.get("definitions", {}))
+    if "$ref" in schema:
+        return example_from_schema(defs.get(schema["$ref"].split("/")[-1], {}), defs, name)
+    if "enum" in schema:
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return example_from_schema(options[0], defs, name)
+
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+    if kind == "object":
+        return {
+            prop: example_from_schema(sub, defs, prop)
+            for prop, sub in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        count = max(1, schema.get("minItems", 2))
+        return [example_from_schema(schema.get("items", {}), defs, name) for _ in range(count)]
+    if kind == "integer":
+        return 70 if "score" in name or "percent" in name else 1
+    if kind == "number":
+        return 0.7
+    if kind == "boolean":
+        return True
+    return f"Stub {name.replace('_', ' ')}".strip()
+
+
+def synthetic_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a chat completion for the request without calling any model."""
+    messages = body.get("messages", [])
+    text = prompt_text(messages)
+    seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+    response_format = body.get("response_format") or {}
+
+    message: Dict[str, Any] = {"role": "assistant", "content": None}
+    finish_reason = "stop"
+
+    tools = body.get("tools") or []
+    if tools:
+        # Structured output via function calling: call the first (or forced) tool
+        forced = body.get("tool_choice")
+        function = tools[0]["function"]
+        if isinstance(forced, dict) and forced.get("function"):
+            function = next((t["function"] for t in tools if t["function"]["name"] == forced["function"]["name"]), function)
+        arguments = example_from_schema(function.get("parameters", {}))
+        message["tool_calls"] = [{
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+        }]
+        finish_reason = "tool_calls"
+        output = json.dumps(arguments)
+    elif response_format.get("type") == "json_schema":
+        output = json.dumps(example_from_schema(response_format["json_schema"].get("schema", {})))
+        message["content"] = output
+    elif response_format.get("type") == "json_object":
+        output = json.dumps(STUB_RESUME_PROFILE)
+        message["content"] = output
+    else:
+        output = STUB_QUESTIONS[seed % len(STUB_QUESTIONS)]
+        message["content"] = output
+
+    prompt_tokens = estimate_tokens(text)
+    completion_tokens = estimate_tokens(output)
+    return {
+        "id": f"chatcmpl-stub-{uuid.uuid4().hex[:20]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
+
+
+def synthetic_embeddings(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Deterministic unit vectors seeded by the input text (same text -> same vector)."""
+    inputs = body.get("input", [])
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    dimensions = body.get("dimensions") or EMBEDDING_DIMENSIONS
+    data = []
+    for index, item in enumerate(inputs):
+        text = item if isinstance(item, str) else json.dumps(item)
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        data.append({"object": "embedding", "index": index, "embedding": [v / norm for v in vector]})
+    tokens = sum(estimate_tokens(str(item)) for item in inputs)
+    return {
+        "object": "list",
+        "data": data,
+        "model": body.get("model", "stub-embedding"),
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+# ==================== Record / Replay ====================
+
+def prompt_hash(kind: str, body: Dict[str, Any]) -> str:
+    """Key a request by everything that determines the model's answer (not by streaming options)."""
+    relevant = {
+        key: body.get(key)
+        for key in ("model", "messages", "response_format", "tools", "tool_choice", "temperature",
+                    "max_tokens", "max_completion_tokens", "input", "dimensions")
+        if body.get(key) is not None
+    }
+    canonical = json.dumps({"kind": kind, **relevant}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RecordingStore:
+    """One JSON file per prompt hash: {"kind", "request", "response"}."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, kind: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"kind": kind, "request": request, "response": response}, f, indent=1)
+        os.replace(tmp, self._path(key))
+
+
+# ==================== Server ====================
+
+class StubConfig:
+    def __init__(
+        self,
+        mode: str = "stub",
+        ttft: str = "fixed:0.3",
+        token_latency: str = "fixed:0.01",
+        embedding_latency: str = "fixed:0.05",
+        recordings: str = DEFAULT_RECORDINGS_DIR,
+        upstream: str = "https://api.openai.com/v1",
+        on_miss: str = "error",
+        error_rate: float = 0.0
+    ):
+        if mode not in ("stub", "record", "replay"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.mode = mode
+        self.ttft = LatencyDistribution(ttft)
+        self.token_latency = LatencyDistribution(token_latency)
+        self.embedding_latency = LatencyDistribution(embedding_latency)
+        self.store = RecordingStore(recordings) if mode != "stub" else None
+        self.upstream = upstream.rstrip("/")
+        self.on_miss = on_miss
+        self.error_rate = error_rate
+
+
+def create_app(config: StubConfig) -> FastAPI:
+    """Build the stub app for a configuration (also usable in-process via httpx.ASGITransport)."""
+    app = FastAPI(title="OpenAI Stub")
+    counters = {"requests": 0, "streams": 0, "recorded": 0, "replayed": 0, "misses": 0, "injected_errors": 0}
+    upstream_client: Dict[str, httpx.AsyncClient] = {}
+
+    async def forward(path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise HTTPException(status_code=500, detail="Record mode needs OPENAI_API_KEY for the upstream API")
+        if "client" not in upstream_client:
+            upstream_client["client"] = httpx.AsyncClient(timeout=120.0)
+        try:
+            response = await upstream_client["client"].post(
+                f"{config.upstream}{path}",
+                json=body,
+                headers={"Authorization": f"Bearer {api_key}"},
+            )
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=502, detail=f"Upstream request failed: {str(e)}")
+        if response.status_code >= 400:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        return response.json()
+
+    async def resolve(kind: str, path: str, body: Dict[str, Any], synthesize) -> Dict[str, Any]:
+        """Response for a request according to the mode (synthetic, recorded or replayed)."""
+        if config.mode == "stub":
+            return synthesize(body)
+
+        key = prompt_hash(kind, body)
+        stored = config.store.get(key)
+        if stored is not None:
+            counters["replayed"] += 1
+            return stored
+
+        if config.mode == "record":
+            upstream_body = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+            response = await forward(path, upstream_body)
+            config.store.put(key, kind, upstream_body, response)
+            counters["recorded"] += 1
+            return response
+
+        counters["misses"] += 1
+        if config.on_miss == "synthetic":
+            return synthesize(body)
+        raise HTTPException(status_code=404, detail=f"No recording for prompt hash {key}")
+
+    def maybe_fail() -> None:
+        if config.error_rate and random.random() < config.error_rate:
+            counters["injected_errors"] += 1
+            raise HTTPException(status_code=503, detail="Injected stub failure")
+
+    async def stream_completion(completion: Dict[str, Any], include_usage: bool) -> AsyncIterator[str]:
+        """Replay a completion as SSE chunks, pacing tokens by the latency distributions."""
+        choice = completion["choices"][0]
+        message = choice["message"]
+        base = {"id": completion["id"], "object": "chat.completion.chunk",
+                "created": completion["created"], "model": completion["model"]}
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            payload = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            return f"data: {json.dumps(payload)}\n\n"
+
+        await asyncio.sleep(config.ttft.sample())
+        yield chunk({"role": "assistant", "content": ""})
+
+        if message.get("tool_calls"):
+            calls = [{**call, "index": i} for i, call in enumerate(message["tool_calls"])]
+            yield chunk({"tool_calls": calls})
+        else:
+            content = message.get("content") or ""
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                await asyncio.sleep(config.token_latency.sample())
+                yield chunk({"content": word if i == 0 else " " + word})
+
+        yield chunk({}, choice.get("finish_reason", "stop"))
+        if include_usage and completion.get("usage"):
+            yield f"data: {json.dumps({**base, 'choices': [], 'usage': completion['usage']})}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["requests"] += 1
+        maybe_fail()
+        completion = await resolve("chat", "/chat/completions", body, synthetic_completion)
+
+        if body.get("stream"):
+            counters["streams"] += 1
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(stream_completion(completion, include_usage), media_type="text/event-stream")
+
+        output_tokens = (completion.get("usage") or {}).get("completion_tokens", 0)
+        await asyncio.sleep(config.ttft.sample() + sum(config.token_latency.sample() for _ in range(output_tokens)))
+        return JSONResponse(completion)
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        counters["requests"] += 1
+        maybe_fail()
+        response = await resolve("embeddings", "/embeddings", body, synthetic_embeddings)
+        await asyncio.sleep(config.embedding_latency.sample())
+        return JSONResponse(response)
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        """Always synthetic (audio uploads are not recorded)."""
+        form = await request.form()
+        counters["requests"] += 1
+        maybe_fail()
+        await asyncio.sleep(config.ttft.sample())
+        if form.get("response_format") == "text":
+            return PlainTextResponse(STUB_TRANSCRIPT)
+        return JSONResponse({"text": STUB_TRANSCRIPT})
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "stub"}]}
+
+    @app.get("/stub/stats")
+    async def stats():
+        return {"mode": config.mode, **counters}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("OPENAI_STUB_PORT", "8900")))
+    parser.add_argument("--mode", choices=["stub", "record", "replay"], default=os.getenv("OPENAI_STUB_MODE", "stub"))
+    parser.add_argument("--ttft", default=os.getenv("OPENAI_STUB_TTFT", "fixed:0.3"),
+                        help="Time to first token: fixed:S | uniform:A,B | normal:MEAN,SD | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--token-latency", default=os.getenv("OPENAI_STUB_TOKEN_LATENCY", "fixed:0.01"),
+                        help="Delay per output token (same syntax as --ttft)")
+    parser.add_argument("--embedding-latency", default="fixed:0.05")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS_DIR)
+    parser.add_argument("--upstream", default="https://api.openai.com/v1")
+    parser.add_argument("--on-miss", choices=["error", "synthetic"], default="error",
+                        help="Replay mode: what to do for prompts with no recording")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed with 503")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        mode=args.mode,
+        ttft=args.ttft,
+        token_latency=args.token_latency,
+        embedding_latency=args.embedding_latency,
+        recordings=args.recordings,
+        upstream=args.upstream,
+        on_miss=args.on_miss,
+        error_rate=args.error_rate
+    )
+
+    import uvicorn
+    print(f"[STUB] OpenAI stub ({config.mode}) on http://{args.host}:{args.port}/v1")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
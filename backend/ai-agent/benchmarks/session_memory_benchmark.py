@@ -0,0 +1,133 @@
+"""
+Session Memory Benchmark
+Measures bytes per live interview session (tracemalloc) for the previous dict layout
+(own chunk copy, dict turns with ISO timestamps) and the slot-based SessionRecord layout
+(chunks interned once per resume content hash).
+
+Usage (from backend/ai-agent):
+    python benchmarks/session_memory_benchmark.py --sessions 1000 10000 --sessions-per-resume 3
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_manager import SessionManager
+from session_store import MemorySessionStore
+
+
+def make_resume(resume_id: int, chunk_count: int, chunk_chars: int) -> List[str]:
+    base = f"Candidate {resume_id} - backend engineer building Python, FastAPI and MongoDB services. "
+    text = (base * (chunk_chars // len(base) + 1))[:chunk_chars]
+    return [f"[{i}] {text}" for i in range(chunk_count)]
+
+
+def make_profile(resume_id: int) -> Dict[str, Any]:
+    return {
+        "name": f"Candidate {resume_id}",
+        "email": f"candidate{resume_id}@example.com",
+        "experience": "5 years building backend services",
+        "skills": ["Python", "FastAPI", "MongoDB", "Kafka", "Kubernetes"],
+        "seniority_level": "Mid-Senior",
+    }
+
+
+def as_request(value: Any) -> Any:
+    """Fresh objects, as decoded from each request's JSON body."""
+    return json.loads(json.dumps(value))
+
+
+QUESTION = "Could you walk me through how you designed the retry and backoff logic in that pipeline?"
+ANSWER = "I used exponential backoff with jitter and an idempotency key per message so retries were safe. " * 3
+
+
+def build_legacy(args: argparse.Namespace, sessions: int, resumes: List[List[str]]) -> Dict[str, Dict[str, Any]]:
+    """The previous SessionManager layout: one plain dict per session."""
+    store: Dict[str, Dict[str, Any]] = {}
+    for i in range(sessions):
+        resume_id = i // args.sessions_per_resume
+        history = []
+        for _ in range(args.turns):
+            history.append({
+                "question": as_request(QUESTION),
+                "answer": as_request(ANSWER),
+                "timestamp": datetime.utcnow().isoformat(),
+            })
+        store[f"session-{i}"] = {
+            "resume_profile": as_request(make_profile(resume_id)),
+            "chunks": as_request(resumes[resume_id]),
+            "conversation_history": history,
+            "questions_asked": args.turns,
+            "max_questions": 10,
+            "memory_summary": "",
+            "memory_summarized_upto": 0,
+            "created_at": datetime.utcnow(),
+            "last_accessed": datetime.utcnow(),
+        }
+    return store
+
+
+def build_records(args: argparse.Namespace, sessions: int, resumes: List[List[str]]) -> SessionManager:
+    """The current layout, built through the SessionManager API."""
+    manager = SessionManager(MemorySessionStore())
+
+    async def fill() -> None:
+        for i in range(sessions):
+            session_id = f"session-{i}"
+            resume_id = i // args.sessions_per_resume
+            await manager.create_session(session_id, as_request(make_profile(resume_id)), as_request(resumes[resume_id]))
+            for _ in range(args.turns):
+                await manager.update_conversation(session_id, as_request(QUESTION))
+                await manager.update_conversation(session_id, QUESTION, as_request(ANSWER))
+
+    asyncio.run(fill())
+    return manager
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by build()'s result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bytes per live session for each session layout")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--turns", type=int, default=8, help="answered turns per session")
+    parser.add_argument("--chunks", type=int, default=12, help="resume chunks per session")
+    parser.add_argument("--chunk-chars", type=int, default=700)
+    parser.add_argument("--sessions-per-resume", type=int, default=3,
+                        help="sessions sharing one resume (retakes, practice runs)")
+    args = parser.parse_args()
+
+    print(f"turns={args.turns} chunks={args.chunks}x{args.chunk_chars} chars sessions/resume={args.sessions_per_resume}")
+    print(f"{'sessions':>9} {'layout':>8} {'total MB':>9} {'bytes/session':>14}")
+    for sessions in args.sessions:
+        resumes = [
+            make_resume(resume_id, args.chunks, args.chunk_chars)
+            for resume_id in range(sessions // args.sessions_per_resume + 1)
+        ]
+        legacy = measure(lambda: build_legacy(args, sessions, resumes))
+        records = measure(lambda: build_records(args, sessions, resumes))
+        for layout, total in (("dict", legacy), ("record", records)):
+            print(f"{sessions:>9} {layout:>8} {total / 1e6:>9.1f} {total / sessions:>14.0f}")
+        print(f"{'':>9} {'saved':>8} {(legacy - records) / 1e6:>9.1f} {(1 - records / legacy) * 100:>13.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Session Store Check
+Hammers one shared session from several worker processes (like uvicorn --workers N) and
+verifies that no update was lost, then reports throughput per store backend.
+
+Usage (from backend/ai-agent):
+    python benchmarks/session_store_check.py --store sqlite --workers 4 --ops 200
+    python benchmarks/session_store_check.py --store redis --url redis://localhost:6379/0
+    python benchmarks/session_store_check.py --store redis --embedded   # local Redis-protocol stand-in (needs fakeredis)
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_record import SessionRecord, Turn, chunk_pool
+from session_store import MemorySessionStore, RedisSessionStore, SQLiteSessionStore, SessionStore
+
+
+SESSION_ID = "store-check"
+
+
+def build_store(args: argparse.Namespace) -> SessionStore:
+    if args.store == "memory":
+        return MemorySessionStore()
+    if args.store == "sqlite":
+        return SQLiteSessionStore(args.path)
+    return RedisSessionStore(args.url, prefix="agent:store-check:")
+
+
+def append_turn(worker: int, op: int):
+    def apply(session: SessionRecord) -> None:
+        session.conversation_history += (Turn.now(f"w{worker}-q{op}"),)
+        session.questions_asked += 1
+    return apply
+
+
+async def hammer(args: argparse.Namespace, worker: int, store: SessionStore = None) -> float:
+    """Run args.ops updates, args.concurrency at a time; returns elapsed seconds."""
+    own_store = store is None
+    store = store or build_store(args)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(op: int) -> None:
+        async with semaphore:
+            await store.update(SESSION_ID, append_turn(worker, op))
+            await store.get(SESSION_ID)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(op) for op in range(args.ops)))
+    elapsed = time.perf_counter() - started
+    if own_store:
+        await store.aclose()
+    return elapsed
+
+
+def worker_main(args: argparse.Namespace, worker: int, results: Any) -> None:
+    results.put(asyncio.run(hammer(args, worker)))
+
+
+async def reset(store: SessionStore) -> None:
+    await store.put(SESSION_ID, SessionRecord(
+        resume_profile={},
+        chunk_set=chunk_pool.intern(["store check chunk"]),
+        max_questions=10
+    ))
+
+
+def start_embedded_redis() -> str:
+    """Serve the Redis protocol from this process (fakeredis) and return its URL."""
+    try:
+        from fakeredis import TcpFakeServer
+    except ImportError:
+        raise SystemExit("--embedded needs fakeredis (pip install fakeredis)")
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}/0"
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    store = build_store(args)
+    await reset(store)
+
+    if args.store == "memory":
+        # Process-local: concurrent coroutines in one worker only
+        elapsed = [await hammer(args, 0, store)]
+    else:
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker_main, args=(args, worker, results))
+            for worker in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        elapsed = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    session = await store.get(SESSION_ID)
+    workers = 1 if args.store == "memory" else args.workers
+    expected = workers * args.ops
+    history = session.conversation_history
+    unique = len({turn.question for turn in history})
+    ok = session.questions_asked == expected and len(history) == expected and unique == expected
+
+    total_ops = expected * 2  # one update + one read per op
+    print(f"store={store.name} workers={workers} ops/worker={args.ops} concurrency={args.concurrency}")
+    print(f"  questions_asked={session.questions_asked} history={len(history)} unique={unique} expected={expected}")
+    print(f"  throughput: {total_ops / max(elapsed):.0f} ops/s (slowest worker {max(elapsed):.2f}s)")
+    print("  OK - no lost updates" if ok else "  FAIL - updates were lost")
+
+    await store.delete(SESSION_ID)
+    await store.aclose()
+    return 0 if ok else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check session store atomicity across worker processes")
+    parser.add_argument("--store", choices=["memory", "sqlite", "redis"], default="sqlite")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200, help="updates per worker")
+    parser.add_argument("--concurrency", type=int, default=16, help="in-flight updates per worker")
+    parser.add_argument("--path", default=os.path.join(tempfile.gettempdir(), "session_store_check.sqlite3"))
+    parser.add_argument("--url", default="redis://localhost:6379/0")
+    parser.add_argument("--embedded", action="store_true", help="start a local Redis-protocol server (fakeredis)")
+    args = parser.parse_args()
+
+    if args.embedded:
+        args.url = start_embedded_redis()
+        print(f"Embedded Redis-protocol server at {args.url}")
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Chunk Index
+Per-session in-memory NumPy index over resume chunk embeddings for top-k retrieval.
+Chunk embeddings are computed once (at upload) and kept in the persistent cache, read and
+written in one batch per resume.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+import base64
+import hashlib
+import os
+
+import numpy as np
+
+from persistent_cache import PersistentCache
+
+
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+
+def _encode_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vector(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+class ChunkIndex:
+    """Row-normalized embedding matrix for one resume's chunks."""
+
+    def __init__(self, chunks: List[str], vectors: np.ndarray):
+        self.chunks = chunks
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = (vectors / norms).astype(np.float32)
+
+    def top_k(self, query_vector: np.ndarray, k: int) -> List[str]:
+        """Return the k most similar chunks, kept in resume order."""
+        if k >= len(self.chunks):
+            return list(self.chunks)
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return list(self.chunks[:k])
+
+        scores = self.matrix @ (query / norm)
+        best = np.argpartition(-scores, k)[:k]
+        return [self.chunks[i] for i in sorted(best)]
+
+
+class ChunkRetriever:
+    """Builds per-session chunk indexes and selects the chunks relevant to each turn."""
+
+    def __init__(self, embeddings: Any, top_k: int = RETRIEVAL_TOP_K):
+        self.embeddings = embeddings
+        self.top_k = top_k
+        self._indexes: Dict[str, ChunkIndex] = {}
+        self._cache = PersistentCache(
+            namespace="chunk_embeddings",
+            ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS,
+            max_entries=EMBEDDING_CACHE_MAX_ENTRIES
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.embeddings is not None and self.top_k > 0
+
+    def _chunk_key(self, chunk: str) -> str:
+        model = getattr(self.embeddings, "model", "")
+        return hashlib.sha256(f"{model}\x00{chunk}".encode("utf-8")).hexdigest()
+
+    async def embed_chunks(self, chunks: List[str]) -> Optional[np.ndarray]:
+        """
+        Embedding matrix for the chunks, computing only those not already cached.
+        Called at upload time so interview sessions start with warm embeddings.
+        """
+        if not self.enabled or not chunks:
+            return None
+
+        keys = [self._chunk_key(chunk) for chunk in chunks]
+        cached = await self._cache.aget_many(keys)
+        vectors: List[Optional[np.ndarray]] = [
+            _decode_vector(cached[key]) if key in cached else None for key in keys
+        ]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = await self.embeddings.aembed_documents([chunks[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+            await self._cache.aset_many({keys[i]: _encode_vector(vectors[i]) for i in missing})
+            print(f"[RETRIEVAL] Embedded {len(missing)}/{len(chunks)} chunks")
+
+        return np.vstack(vectors)
+
+    async def build_index(self, session_id: str, chunks: List[str]) -> None:
+        """Build (or rebuild) the in-memory index for a session."""
+        if not self.enabled or len(chunks) <= self.top_k:
+            return
+        vectors = await self.embed_chunks(chunks)
+        if vectors is not None:
+            self._indexes[session_id] = ChunkIndex(chunks, vectors)
+
+    async def select(self, session_id: str, chunks: List[str], query: str) -> List[str]:
+        """
+        Top-k chunks most relevant to the query for this session.
+        Falls back to all chunks when retrieval is unavailable.
+        """
+        if not self.enabled or len(chunks) <= self.top_k or not query.strip():
+            return list(chunks)
+
+        index = self._indexes.get(session_id)
+        if index is None:
+            try:
+                await self.build_index(session_id, chunks)
+            except Exception as e:
+                print(f"[RETRIEVAL] Index build failed for session {session_id}: {str(e)}")
+            index = self._indexes.get(session_id)
+            if index is None:
+                return list(chunks)
+
+        try:
+            query_vector = await self.embeddings.aembed_query(query)
+        except Exception as e:
+            print(f"[RETRIEVAL] Query embedding failed, using all chunks: {str(e)}")
+            return list(chunks)
+
+        return index.top_k(np.asarray(query_vector, dtype=np.float32), self.top_k)
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session's index."""
+        self._indexes.pop(session_id, None)
+
+    def session_count(self) -> int:
+        return len(self._indexes)
+
+    def session_ids(self) -> Set[str]:
+        """Sessions with an index in this worker."""
+        return set(self._indexes)
@@ -0,0 +1,190 @@
+"""
+Context Budget
+Fast local token estimation and priority-based packing of prompt context (resume chunks,
+profile, conversation history, transcript) into a per-prompt token budget.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import os
+import re
+
+
+# Variable-context token budget per prompt (the static prompt blocks are not counted)
+PROMPT_TOKEN_BUDGETS: Dict[str, int] = {
+    "first_question": int(os.getenv("CONTEXT_BUDGET_FIRST_QUESTION", "1200")),
+    "next_question": int(os.getenv("CONTEXT_BUDGET_NEXT_QUESTION", "2500")),
+    "turn_scoring": int(os.getenv("CONTEXT_BUDGET_TURN_SCORING", "1200")),
+    "synthesis": int(os.getenv("CONTEXT_BUDGET_SYNTHESIS", "1800")),
+}
+
+# Words and single punctuation marks; long words cost roughly one token per 4 characters
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+OMITTED_MARKER = " ..."
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local token estimate (no tokenizer download): one token per punctuation mark and
+    per short word, plus one per extra 4 characters of long words. Errs slightly high on
+    English text, which keeps packed prompts under budget.
+    """
+    if not text:
+        return 0
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        length = match.end() - match.start()
+        tokens += 1 if length <= 4 else (length + 3) // 4
+    return tokens
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    """Cut text at a word boundary so it fits max_tokens, keeping the head or the tail."""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Start from the ~4 chars/token guess and shrink until it fits
+    chars = max_tokens * 4
+    while chars > 0:
+        if keep == "tail":
+            piece = text[-chars:]
+            piece = piece.split(" ", 1)[-1] if " " in piece else piece
+            candidate = "..." + piece
+        else:
+            piece = text[:chars]
+            piece = piece.rsplit(" ", 1)[0] if " " in piece else piece
+            candidate = piece + OMITTED_MARKER
+        if estimate_tokens(candidate) <= max_tokens:
+            return candidate
+        chars = int(chars * 0.85)
+    return ""
+
+
+class Section:
+    """
+    One named piece of prompt context.
+
+    Args:
+        name: Prompt variable the packed text is returned under
+        content: Text, or a list of items (chunks, turns) joined with `separator`
+        priority: Lower is packed first and trimmed last
+        min_tokens: Reserved before lower-priority sections get anything
+        max_tokens: Never packed beyond this, even if budget is left
+        keep: "head" keeps the first items/text (ranked chunks), "tail" the last (recent turns)
+        separator: Joins list items
+    """
+
+    def __init__(
+        self,
+        name: str,
+        content: Union[str, Sequence[str]],
+        priority: int,
+        min_tokens: int = 0,
+        max_tokens: Optional[int] = None,
+        keep: str = "head",
+        separator: str = "\n\n"
+    ):
+        self.name = name
+        self.items = [content] if isinstance(content, str) else [item for item in content if item]
+        self.priority = priority
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.keep = keep
+        self.separator = separator
+        self.separator_tokens = estimate_tokens(separator)
+        self.item_tokens = [estimate_tokens(item) for item in self.items]
+
+    @property
+    def tokens(self) -> int:
+        if not self.items:
+            return 0
+        return sum(self.item_tokens) + self.separator_tokens * (len(self.items) - 1)
+
+    def fit(self, allowance: int) -> Tuple[str, int, int]:
+        """
+        Render within allowance tokens: whole items first, then the boundary item truncated.
+
+        Returns:
+            (text, tokens used, items dropped)
+        """
+        order = list(range(len(self.items)))
+        if self.keep == "tail":
+            order.reverse()
+
+        kept: List[int] = []
+        used = 0
+        partial = ""
+        for i in order:
+            cost = self.item_tokens[i] + (self.separator_tokens if kept else 0)
+            if used + cost <= allowance:
+                kept.append(i)
+                used += cost
+                continue
+            room = allowance - used - (self.separator_tokens if kept else 0)
+            if room >= 16:
+                partial = truncate_to_tokens(self.items[i], room, keep="tail" if self.keep == "tail" else "head")
+            break
+
+        texts = [self.items[i] for i in sorted(kept)]
+        if partial:
+            texts = [partial] + texts if self.keep == "tail" else texts + [partial]
+        text = self.separator.join(texts)
+        dropped = len(self.items) - len(kept)
+        return text, estimate_tokens(text), dropped
+
+
+class ContextPacker:
+    """Allocates a token budget across sections by priority and trims each to its share."""
+
+    def pack(self, prompt: str, sections: List[Section], budget: Optional[int] = None) -> Dict[str, str]:
+        """
+        Pack sections into the prompt's budget and log the packed size.
+
+        Allocation: every section first gets min(its size, min_tokens) in priority order, then
+        the remaining budget goes to sections in priority order up to their size / max_tokens.
+
+        Args:
+            prompt: Budget name in PROMPT_TOKEN_BUDGETS (also the log label)
+            sections: Context sections for this call
+            budget: Override for the prompt's configured budget
+
+        Returns:
+            {section name: packed text}
+        """
+        budget = PROMPT_TOKEN_BUDGETS.get(prompt, 2000) if budget is None else budget
+        ordered = sorted(sections, key=lambda section: section.priority)
+
+        def wanted(section: Section) -> int:
+            size = section.tokens
+            return size if section.max_tokens is None else min(size, section.max_tokens)
+
+        allowance: Dict[str, int] = {}
+        remaining = budget
+        for section in ordered:
+            reserve = min(wanted(section), section.min_tokens, max(0, remaining))
+            allowance[section.name] = reserve
+            remaining -= reserve
+        for section in ordered:
+            extra = min(wanted(section) - allowance[section.name], max(0, remaining))
+            allowance[section.name] += extra
+            remaining -= extra
+
+        packed: Dict[str, str] = {}
+        report = []
+        total_in = total_out = 0
+        for section in ordered:
+            text, used, dropped = section.fit(allowance[section.name])
+            packed[section.name] = text
+            total_in += section.tokens
+            total_out += used
+            trimmed = f" -{dropped} item(s)" if dropped and len(section.items) > 1 else (" trimmed" if used < section.tokens else "")
+            report.append(f"{section.name} {used}{trimmed}")
+
+        print(f"[CONTEXT] {prompt}: packed {total_out}/{budget} tokens (from {total_in}) - {', '.join(report)}")
+        return packed
+
+
+# Global packer instance
+context_packer = ContextPacker()
@@ -0,0 +1,157 @@
+"""
+Conversation Memory
+Bounded interview history: the last K turns verbatim plus a running summary of older turns,
+rendered under a hard token budget.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import os
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+from context_budget import estimate_tokens, truncate_to_tokens
+from llm_runtime import run_llm
+
+
+MEMORY_RECENT_TURNS = int(os.getenv("MEMORY_RECENT_TURNS", "4"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1500"))
+MEMORY_SUMMARY_SHARE = float(os.getenv("MEMORY_SUMMARY_SHARE", "0.25"))
+
+SUMMARY_HEADER = "SUMMARY OF EARLIER CONVERSATION:"
+
+
+def format_turn(turn: Dict[str, Any]) -> str:
+    """Render one Q&A turn the way the interviewer prompt expects."""
+    answer = turn.get("answer") or "No answer yet"
+    return f"{turn['question']}\nA: {answer}"
+
+
+summary_prompt = ChatPromptTemplate.from_messages([
+    ("system", """
+    You maintain a running summary of a technical interview for the interviewer.
+    Keep: topics and technologies already covered, concrete claims the candidate made,
+    notable strengths, gaps and vague answers worth following up.
+    Write compact bullet points, at most 120 words. Never invent details.
+    """),
+    ("human", """
+    CURRENT SUMMARY:
+    {summary}
+
+    NEW TURNS TO FOLD IN:
+    {turns}
+
+    Return the updated summary only.
+    """)
+])
+
+
+class ConversationMemory:
+    """Keeps prompt history bounded regardless of interview length."""
+
+    def __init__(
+        self,
+        recent_turns: int = MEMORY_RECENT_TURNS,
+        token_budget: int = MEMORY_TOKEN_BUDGET,
+        summary_share: float = MEMORY_SUMMARY_SHARE
+    ):
+        self.recent_turns = max(1, recent_turns)
+        self.token_budget = token_budget
+        self.summary_share = min(max(summary_share, 0.0), 1.0)
+        self.counters = {
+            "renders": 0,
+            "truncated_turns": 0,  # newest turn cut to fit the budget
+            "dropped_turns": 0,    # unsummarized turns left out of a prompt (not folded yet)
+        }
+
+    def pending_fold(self, history: List[Dict[str, Any]], summarized_upto: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Answered turns that have fallen out of the verbatim window but are not in the summary yet.
+
+        Returns:
+            (turns to fold, new summarized_upto)
+        """
+        fold_until = max(summarized_upto, len(history) - self.recent_turns)
+        turns = [turn for turn in history[summarized_upto:fold_until] if turn.get("answer")]
+        return turns, fold_until
+
+    async def summarize(
+        self,
+        llm: Any,
+        summary: str,
+        turns: List[Dict[str, Any]],
+        session_id: Optional[str] = None
+    ) -> str:
+        """Fold turns into the running summary with one small LLM call."""
+        chain = summary_prompt | llm | StrOutputParser()
+        updated = await run_llm(chain, {
+            "summary": summary or "(empty)",
+            "turns": "\n\n".join(format_turn(turn) for turn in turns),
+        }, endpoint="memory_summary", session_id=session_id)
+        return updated.strip()
+
+    def render(
+        self,
+        history: List[Dict[str, Any]],
+        summary: str,
+        summarized_upto: int,
+        session_id: Optional[str] = None
+    ) -> str:
+        """
+        Build the chat_history prompt variable within token_budget: running summary +
+        unsummarized turns. A share of the budget is reserved for the summary; turns are kept
+        newest first, the newest is truncated rather than overflowing, and older unsummarized
+        turns that don't fit are left out (counted) until they are folded into the summary.
+        """
+        self.counters["renders"] += 1
+        summary_reserve = int(self.token_budget * self.summary_share) if summary else 0
+        turn_budget = self.token_budget - summary_reserve
+
+        pending = history[summarized_upto:]
+        verbatim: List[str] = []
+        used = 0
+        for turn in reversed(pending):
+            text = format_turn(turn)
+            cost = estimate_tokens(text)
+            if used + cost > turn_budget:
+                if not verbatim and turn_budget > 0:
+                    # Newest turn alone is over budget: keep its start (the question)
+                    text = truncate_to_tokens(text, turn_budget)
+                    verbatim.append(text)
+                    used += estimate_tokens(text)
+                    self.counters["truncated_turns"] += 1
+                break
+            verbatim.append(text)
+            used += cost
+
+        dropped = len(pending) - len(verbatim)
+        if dropped:
+            self.counters["dropped_turns"] += dropped
+            print(
+                f"[MEMORY] Session {session_id or '-'}: {dropped} unsummarized turn(s) over the "
+                f"{self.token_budget}-token budget left out until the next summary fold"
+            )
+
+        parts: List[str] = []
+        if summary:
+            # The reserve plus whatever the turns left unused
+            remaining = self.token_budget - used - estimate_tokens(SUMMARY_HEADER)
+            if remaining > 0:
+                parts.append(f"{SUMMARY_HEADER}\n{truncate_to_tokens(summary, remaining)}")
+
+        if verbatim:
+            parts.append("\n\n".join(reversed(verbatim)))
+
+        return "\n\n".join(parts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recent_turns": self.recent_turns,
+            "token_budget": self.token_budget,
+            "summary_share": self.summary_share,
+            **self.counters,
+        }
+
+
+# Global memory instance
+conversation_memory = ConversationMemory()
@@ -0,0 +1,86 @@
+"""
+LLM Client Registry
+Prebuilt, named model clients created once at startup and sharing one HTTP connection pool
+"""
+
+from typing import Any, Dict, Optional
+import os
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# Model that hedged requests go to when the primary misses its latency budget (see llm_runtime)
+OPENAI_FALLBACK_MODEL = os.getenv("OPENAI_FALLBACK_MODEL", OPENAI_MODEL)
+
+# Point every client at an OpenAI-compatible server (e.g. benchmarks/openai_stub.py); unset = OpenAI
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# Shared connection pool sizing for all OpenAI traffic from this process
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "60"))
+
+
+class LLMRegistry:
+    """Holds named model clients (chat, json, assessment, tips, ...) built once and reused."""
+
+    def __init__(self):
+        self._clients: Dict[str, Any] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared async HTTP client (keep-alive pool) used by every registered model."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=LLM_HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+                ),
+            )
+        return self._http_client
+
+    def chat_model(self, model: str = OPENAI_MODEL, **kwargs) -> ChatOpenAI:
+        """
+        Build a ChatOpenAI client bound to the shared connection pool.
+        SDK retries are disabled (llm_runtime retries and counts them) and
+        streamed responses report token usage.
+        """
+        kwargs.setdefault("max_retries", 0)
+        kwargs.setdefault("stream_usage", True)
+        return ChatOpenAI(
+            model=model,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=OPENAI_BASE_URL,
+            http_async_client=self.http_client,
+            **kwargs
+        )
+
+    def register(self, name: str, client: Any) -> Any:
+        """Register (or replace) a named client and return it."""
+        self._clients[name] = client
+        return client
+
+    def get(self, name: str) -> Any:
+        """Get a registered client by name."""
+        if name not in self._clients:
+            raise KeyError(f"LLM client '{name}' is not registered")
+        return self._clients[name]
+
+    def names(self):
+        """Names of all registered clients."""
+        return sorted(self._clients)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP pool (call on shutdown)."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+
+# Global registry instance
+llm_registry = LLMRegistry()
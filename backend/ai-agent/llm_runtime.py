@@ -0,0 +1,323 @@
+"""
+LLM Runtime
+Async execution helpers that keep LLM calls off the event loop, cap in-flight requests,
+retry transient failures, hedge slow calls to a fallback model and account tokens / latency
+for every call
+"""
+
+from typing import Any, AsyncIterator, Dict, Optional
+import asyncio
+import os
+import time
+
+import openai
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from metrics import hedging_metrics, usage_metrics
+
+
+# Maximum number of LLM requests allowed in flight at once (across all sessions)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+
+# Retries for transient OpenAI failures (done here, not in the SDK, so they are counted)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.5"))
+
+RETRYABLE_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+
+def _parse_budgets(spec: str) -> Dict[str, float]:
+    budgets = {}
+    for item in spec.split(","):
+        name, _, seconds = item.partition("=")
+        if name.strip() and seconds.strip():
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+# First-token latency budgets per endpoint ("endpoint=seconds,..."). A call that has produced no
+# token within its budget is hedged: the same prompt goes to the fallback model, first good answer wins.
+# Endpoints without a budget (pregeneration, assessment, ...) are never hedged.
+LLM_LATENCY_BUDGETS = _parse_budgets(os.getenv(
+    "LLM_LATENCY_BUDGETS", "first_question=4,next_question=2.5,next_question_stream=2.5"
+))
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "true").lower() == "true"
+
+
+class LLMConcurrencyLimiter:
+    """Bounds the number of concurrent LLM calls and tracks queueing."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def __aenter__(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self._semaphore.release()
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        """Current limiter state."""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+        }
+
+
+# Global limiter shared by every endpoint and background task
+llm_limiter = LLMConcurrencyLimiter(LLM_MAX_CONCURRENCY)
+
+
+class UsageCollector(BaseCallbackHandler):
+    """Sums token usage reported by every model call made inside one runnable invocation."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cached_input_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        found = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.input_tokens += usage.get("input_tokens", 0)
+                    self.output_tokens += usage.get("output_tokens", 0)
+                    self.cached_input_tokens += (usage.get("input_token_details") or {}).get("cache_read", 0)
+                    found = True
+        if not found:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            self.input_tokens += token_usage.get("prompt_tokens", 0)
+            self.output_tokens += token_usage.get("completion_tokens", 0)
+            self.cached_input_tokens += (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+
+
+def _account(
+    collector: UsageCollector,
+    endpoint: str,
+    session_id: Optional[str],
+    started: float,
+    retries: int,
+    error: bool,
+    usage: Optional[Dict[str, int]]
+) -> None:
+    usage_metrics.record_call(
+        endpoint, session_id, collector.input_tokens, collector.output_tokens,
+        time.perf_counter() - started, retries=retries, error=error,
+        cached_input_tokens=collector.cached_input_tokens
+    )
+    if usage is not None:
+        usage["input_tokens"] = usage.get("input_tokens", 0) + collector.input_tokens
+        usage["output_tokens"] = usage.get("output_tokens", 0) + collector.output_tokens
+
+
+async def _backoff(endpoint: str, attempt: int, error: Exception) -> None:
+    delay = LLM_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+    print(f"[LLM RETRY] {endpoint} attempt {attempt}/{LLM_MAX_RETRIES} in {delay:.1f}s: {str(error)}")
+    await asyncio.sleep(delay)
+
+
+async def run_llm(
+    runnable: Any,
+    inputs: Any,
+    endpoint: str = "other",
+    session_id: Optional[str] = None,
+    usage: Optional[Dict[str, int]] = None,
+    fallback: Any = None
+) -> Any:
+    """
+    Invoke a LangChain runnable asynchronously under the concurrency limit.
+
+    Args:
+        runnable: Chat model or chain exposing ``ainvoke``
+        inputs: Prompt string, message list or template variables
+        endpoint: Accounting label for the prompt making the call (e.g. "next_question")
+        session_id: Interview session the call belongs to, if any
+        usage: Optional dict that input_tokens / output_tokens are added to
+        fallback: Runnable to hedge to when the endpoint has a latency budget
+            (text chains only - the streamed chunks are joined into the result)
+
+    Returns:
+        Whatever the runnable returns
+    """
+    if fallback is not None and latency_budget(endpoint) is not None:
+        chunks = [chunk async for chunk in hedged_stream(runnable, fallback, inputs, endpoint, session_id, usage)]
+        return "".join(chunks)
+
+    collector = UsageCollector()
+    started = time.perf_counter()
+    retries = 0
+    while True:
+        try:
+            async with llm_limiter:
+                result = await runnable.ainvoke(inputs, config={"callbacks": [collector]})
+            break
+        except RETRYABLE_ERRORS as e:
+            if retries >= LLM_MAX_RETRIES:
+                _account(collector, endpoint, session_id, started, retries, True, usage)
+                raise
+            retries += 1
+            await _backoff(endpoint, retries, e)
+        except Exception:
+            _account(collector, endpoint, session_id, started, retries, True, usage)
+            raise
+
+    _account(collector, endpoint, session_id, started, retries, False, usage)
+    return result
+
+
+async def stream_llm(
+    runnable: Any,
+    inputs: Any,
+    endpoint: str = "other",
+    session_id: Optional[str] = None,
+    usage: Optional[Dict[str, int]] = None
+) -> AsyncIterator[Any]:
+    """
+    Stream a LangChain runnable asynchronously under the concurrency limit.
+    The slot is held until the stream is exhausted or closed.
+    Transient failures are retried only before the first chunk has been sent.
+    """
+    collector = UsageCollector()
+    started = time.perf_counter()
+    retries = 0
+    error = True
+    try:
+        while True:
+            sent = False
+            try:
+                async with llm_limiter:
+                    async for chunk in runnable.astream(inputs, config={"callbacks": [collector]}):
+                        sent = True
+                        yield chunk
+                break
+            except RETRYABLE_ERRORS as e:
+                if sent or retries >= LLM_MAX_RETRIES:
+                    raise
+                retries += 1
+                await _backoff(endpoint, retries, e)
+        error = False
+    except (GeneratorExit, asyncio.CancelledError):
+        # Client went away mid-stream - not an LLM failure
+        error = False
+        raise
+    finally:
+        _account(collector, endpoint, session_id, started, retries, error, usage)
+
+
+def latency_budget(endpoint: str) -> Optional[float]:
+    """First-token budget in seconds for an endpoint, or None when it is not hedged."""
+    if not LLM_HEDGING_ENABLED:
+        return None
+    return LLM_LATENCY_BUDGETS.get(endpoint)
+
+
+async def _first_chunk(stream: AsyncIterator[Any]) -> Any:
+    return await stream.__anext__()
+
+
+async def _discard(task: asyncio.Task, stream: Any) -> None:
+    """Cancel a losing attempt and release its limiter slot."""
+    if not task.done():
+        task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+    await stream.aclose()
+
+
+async def hedged_stream(
+    runnable: Any,
+    fallback: Any,
+    inputs: Any,
+    endpoint: str,
+    session_id: Optional[str] = None,
+    usage: Optional[Dict[str, int]] = None
+) -> AsyncIterator[Any]:
+    """
+    Stream from the primary runnable; if it has not produced a first chunk within the
+    endpoint's latency budget (or failed before one), start the same request on the fallback
+    runnable and continue with whichever delivers a first chunk first. The loser is cancelled.
+    Fallback calls are accounted under "<endpoint>_hedge".
+    """
+    budget = latency_budget(endpoint)
+    if fallback is None or budget is None:
+        async for chunk in stream_llm(runnable, inputs, endpoint, session_id, usage):
+            yield chunk
+        return
+
+    primary = stream_llm(runnable, inputs, endpoint, session_id, usage)
+    attempts: Dict[asyncio.Task, Any] = {asyncio.create_task(_first_chunk(primary)): primary}
+    names = {primary: "primary"}
+    hedged = False
+    winner = None
+    first = None
+    last_error: Optional[BaseException] = None
+
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=budget)
+        primary_error = next(iter(done)).exception() if done else None
+        if not done or primary_error:
+            hedged = True
+            if primary_error:
+                print(
+                    f"[HEDGE] {endpoint}: primary failed before its first token "
+                    f"({type(primary_error).__name__}: {primary_error}), hedging to fallback model"
+                )
+            else:
+                print(f"[HEDGE] {endpoint}: no first token within {budget}s, hedging to fallback model")
+            backup = stream_llm(fallback, inputs, f"{endpoint}_hedge", session_id, usage)
+            names[backup] = "fallback"
+            attempts[asyncio.create_task(_first_chunk(backup))] = backup
+
+        pending = set(attempts)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer the primary when both land in the same tick
+            for task in sorted(done, key=lambda t: names[attempts[t]] != "primary"):
+                try:
+                    first = task.result()
+                except StopAsyncIteration as e:
+                    last_error = e
+                    continue
+                except Exception as e:
+                    last_error = e
+                    continue
+                winner = attempts[task]
+                break
+    finally:
+        for task, stream in attempts.items():
+            if stream is not winner:
+                await _discard(task, stream)
+
+    hedging_metrics.record(endpoint, hedged, names[winner] if winner is not None else None)
+    if winner is None:
+        if isinstance(last_error, StopAsyncIteration) or last_error is None:
+            return
+        raise last_error
+    if hedged:
+        print(f"[HEDGE] {endpoint}: {names[winner]} model answered first")
+
+    try:
+        yield first
+        async for chunk in winner:
+            yield chunk
+    finally:
+        await winner.aclose()
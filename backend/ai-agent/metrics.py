@@ -0,0 +1,207 @@
+"""
+Agent Metrics
+Latency histograms, LLM usage accounting (tokens, latency, retries, errors) and hedged
+request outcomes, kept globally, per endpoint and per session.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+import bisect
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+LATENCY_BUCKETS_MS: List[float] = [25, 50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, sum and approximate percentiles."""
+
+    def __init__(self, buckets_ms: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (max for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{int(b)}" for b in self.buckets_ms] + ["le_inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class LatencyMetrics:
+    """Named latency histograms, aggregated globally and per session."""
+
+    def __init__(self):
+        self._global: Dict[str, LatencyHistogram] = {}
+        self._sessions: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def observe(self, session_id: Optional[str], name: str, seconds: float) -> None:
+        self._global.setdefault(name, LatencyHistogram()).observe(seconds)
+        if session_id:
+            self._sessions.setdefault(session_id, {}).setdefault(name, LatencyHistogram()).observe(seconds)
+
+    def stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Snapshot of every histogram, globally or for one session."""
+        histograms = self._global if session_id is None else self._sessions.get(session_id, {})
+        return {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
+
+    def session_ids(self) -> Set[str]:
+        """Sessions with metrics in this worker."""
+        return set(self._sessions)
+
+    def forget(self, session_id: str) -> Dict[str, Any]:
+        """Drop a finished session's histograms, returning their final snapshot."""
+        final = self.stats(session_id)
+        self._sessions.pop(session_id, None)
+        return final
+
+
+class UsageCounters:
+    """LLM usage for one endpoint: calls, tokens, retries, errors and call latency."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.input_tokens = 0
+        self.cached_input_tokens = 0
+        self.output_tokens = 0
+        self.latency = LatencyHistogram()
+
+    def add(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        seconds: float,
+        retries: int,
+        error: bool,
+        cached_input_tokens: int = 0
+    ) -> None:
+        self.calls += 1
+        self.errors += int(error)
+        self.retries += retries
+        self.input_tokens += input_tokens
+        self.cached_input_tokens += cached_input_tokens
+        self.output_tokens += output_tokens
+        self.latency.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.input_tokens + self.output_tokens,
+            "avg_tokens_per_call": round((self.input_tokens + self.output_tokens) / self.calls, 1) if self.calls else 0.0,
+            "llm_latency": self.latency.snapshot(),
+        }
+
+
+class UsageMetrics:
+    """LLM usage per endpoint (the prompt that made the call), globally and per session."""
+
+    def __init__(self):
+        self._global: Dict[str, UsageCounters] = {}
+        self._sessions: Dict[str, Dict[str, UsageCounters]] = {}
+
+    def record_call(
+        self,
+        endpoint: str,
+        session_id: Optional[str],
+        input_tokens: int,
+        output_tokens: int,
+        seconds: float,
+        retries: int = 0,
+        error: bool = False,
+        cached_input_tokens: int = 0
+    ) -> None:
+        """Account one LLM call (including its retries); cached tokens are the provider's prompt cache hits."""
+        args = (input_tokens, output_tokens, seconds, retries, error, cached_input_tokens)
+        self._global.setdefault(endpoint, UsageCounters()).add(*args)
+        if session_id:
+            self._sessions.setdefault(session_id, {}).setdefault(endpoint, UsageCounters()).add(*args)
+
+    @staticmethod
+    def _summarize(counters: Dict[str, UsageCounters]) -> Dict[str, Any]:
+        endpoints = {name: c.snapshot() for name, c in sorted(counters.items())}
+        totals = {
+            key: sum(e[key] for e in endpoints.values())
+            for key in ("calls", "errors", "retries", "input_tokens", "cached_input_tokens", "output_tokens", "total_tokens")
+        }
+        return {"totals": totals, "endpoints": endpoints}
+
+    def stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Totals plus per-endpoint counters, globally or for one session."""
+        counters = self._global if session_id is None else self._sessions.get(session_id, {})
+        return self._summarize(counters)
+
+    def session_ids(self) -> Set[str]:
+        """Sessions with metrics in this worker."""
+        return set(self._sessions)
+
+    def forget(self, session_id: str) -> Dict[str, Any]:
+        """Drop a finished session's counters, returning their final summary."""
+        final = self.stats(session_id)
+        self._sessions.pop(session_id, None)
+        return final
+
+
+class HedgingMetrics:
+    """How often latency-budget hedging fired per endpoint and which model won."""
+
+    def __init__(self):
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, hedged: bool, winner: Optional[str]) -> None:
+        """Account one budgeted call; winner is "primary", "fallback" or None when both failed."""
+        counters = self._endpoints.setdefault(
+            endpoint, {"calls": 0, "hedged": 0, "primary_wins": 0, "fallback_wins": 0, "failed": 0}
+        )
+        counters["calls"] += 1
+        counters["hedged"] += int(hedged)
+        if winner is None:
+            counters["failed"] += 1
+        else:
+            counters[f"{winner}_wins"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                **counters,
+                "hedge_rate": round(counters["hedged"] / counters["calls"], 3) if counters["calls"] else 0.0,
+            }
+            for name, counters in sorted(self._endpoints.items())
+        }
+
+
+# Global metrics instances
+latency_metrics = LatencyMetrics()
+usage_metrics = UsageMetrics()
+hedging_metrics = HedgingMetrics()
@@ -0,0 +1,240 @@
+"""
+Persistent Cache
+Small SQLite-backed key/value cache with TTL and LRU size eviction.
+The database file is shared by every agent worker on the host and survives restarts.
+Async code uses aget/aset, which run the SQLite calls in a thread so a worker holding the
+database lock never blocks the event loop.
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+# Keys per "IN (...)" lookup, below SQLite's bound-parameter limit
+SQL_BATCH_SIZE = 500
+
+AGENT_CACHE_PATH = os.getenv(
+    "AGENT_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "agent_cache.sqlite3")
+)
+
+
+class PersistentCache:
+    """JSON values stored per namespace in SQLite, expired by TTL and trimmed by least-recent use."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        max_entries: int,
+        path: str = AGENT_CACHE_PATH
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache_entries (namespace, last_used)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value (None on miss or expiry)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                )
+                conn.commit()
+                self.misses += 1
+                self.evictions += 1
+                return None
+
+            conn.execute(
+                "UPDATE cache_entries SET last_used = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key)
+            )
+            conn.commit()
+            self.hits += 1
+            return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value and trim the namespace to its size limit."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                """
+                INSERT INTO cache_entries (namespace, key, value, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (namespace, key)
+                DO UPDATE SET value = excluded.value, created_at = excluded.created_at, last_used = excluded.last_used
+                """,
+                (self.namespace, key, json.dumps(value), now, now)
+            )
+            self._evict_locked(conn, now)
+            conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Cached values for the keys that hit (one query per SQL_BATCH_SIZE keys, one commit)."""
+        now = time.time()
+        found: Dict[str, Any] = {}
+        expired: List[str] = []
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(unique_keys), SQL_BATCH_SIZE):
+                batch = unique_keys[start:start + SQL_BATCH_SIZE]
+                rows = conn.execute(
+                    f"SELECT key, value, created_at FROM cache_entries "
+                    f"WHERE namespace = ? AND key IN ({', '.join('?' * len(batch))})",
+                    (self.namespace, *batch)
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if now - created_at > self.ttl_seconds:
+                        expired.append(key)
+                    else:
+                        found[key] = json.loads(value)
+
+            if expired:
+                conn.executemany(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    [(self.namespace, key) for key in expired]
+                )
+            if found:
+                conn.executemany(
+                    "UPDATE cache_entries SET last_used = ? WHERE namespace = ? AND key = ?",
+                    [(now, self.namespace, key) for key in found]
+                )
+            if expired or found:
+                conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(unique_keys) - len(found)
+            self.evictions += len(expired)
+        return found
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """Store several values in one transaction, then trim the namespace once."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                """
+                INSERT INTO cache_entries (namespace, key, value, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (namespace, key)
+                DO UPDATE SET value = excluded.value, created_at = excluded.created_at, last_used = excluded.last_used
+                """,
+                [(self.namespace, key, json.dumps(value), now, now) for key, value in items.items()]
+            )
+            self._evict_locked(conn, now)
+            conn.commit()
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() off the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """set() off the event loop."""
+        await asyncio.to_thread(self.set, key, value)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """get_many() off the event loop."""
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aset_many(self, items: Dict[str, Any]) -> None:
+        """set_many() off the event loop."""
+        await asyncio.to_thread(self.set_many, items)
+
+    def delete(self, key: str) -> None:
+        """Remove a key."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+            conn.commit()
+
+    def _evict_locked(self, conn: sqlite3.Connection, now: float) -> None:
+        expired = conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+            (self.namespace, now - self.ttl_seconds)
+        ).rowcount
+
+        overflow = conn.execute(
+            """
+            DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                SELECT key FROM cache_entries WHERE namespace = ?
+                ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.namespace, self.namespace, self.max_entries)
+        ).rowcount
+
+        self.evictions += expired + overflow
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            size = self._connect().execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,)
+            ).fetchone()[0]
+        return {
+            "namespace": self.namespace,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,266 @@
+"""
+Prompt Layout
+Interviewer and assessment prompts ordered for provider-side prompt caching:
+a byte-identical static block first, then per-session context, then per-turn context.
+"""
+
+from functools import lru_cache
+from typing import Dict
+import hashlib
+import textwrap
+
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+
+# ==================== Static Blocks ====================
+# No template variables here: these must render to the same bytes for every session.
+
+INTERVIEWER_STATIC_PROMPT = """
+    You are a friendly, experienced technical interviewer conducting a structured interview.
+
+    YOUR PERSONALITY:
+    - Warm and encouraging, never intimidating
+    - Professional but conversational
+    - Patient and supportive
+    - Sound like a real person having a conversation
+    - Use natural, spoken language (you're, we'll, let's, I'd)
+
+    SPEAKING STYLE (optimized for voice):
+    - Try to keep questions under 25 words for clarity
+    - Use simple, clear sentences
+    - Speak naturally - use contractions
+    - Avoid complex jargon unless necessary
+    - Sound more like a realhuman, not like a robot
+    - Use brief acknowledgments like "Great", "Interesting", "I see", "I understand", "Let's move ahead"
+
+    QUESTION DIFFICULTY (must match seniority):
+    - Fresher: Basic concepts, simple scenarios, fundamentals
+    - Junior: Practical application, common problems, hands-on tasks
+    - Mid-level: System design, trade-offs, best practices, deeper reasoning
+    - Senior: Architecture, leadership, complex decisions, end-to-end ownership
+
+    QUESTION VARIETY (balanced mix):
+    - 40% Technical skills based on resume
+    - 30% Past experience and projects
+    - 20% Problem-solving scenarios
+    - 10% Behavioral and soft skills
+
+    CONVERSATION FLOW:
+    - Acknowledge answers briefly when appropriate
+    - If answer is too vague,short,etc, ask for more details
+    - If answer is excellent, give brief positive feedback
+    - Keep the conversation flow natural, adhering to the speaking style and personality style provided to you.
+    - Be encouraging throughout the interview conversation.
+
+    CRITICAL RULES:
+    - First question (when total_questions_asked == 0) MUST be an introductory question:
+        * "Tell me about yourself and your background."
+        * "Walk me through your experience."
+        * "Give me a brief introduction about yourself."
+    - Never repeat questions
+    - Reference specific items from their resume when possible
+    - Ask open-ended questions that encourage detailed answers
+    - Keep questions conversational and natural for voice
+"""
+
+ASSESSMENT_STATIC_PROMPT = """
+    You are an expert Technical Hiring Manager with 15+ years of experience.
+    Your task is to provide an ACCURATE and DIFFERENTIATED assessment based on actual answer quality.
+
+    SCORING RUBRIC (be strict and accurate):
+
+    90-100%: EXCEPTIONAL
+    - Demonstrates deep expertise with specific examples
+    - Answers go beyond the question with valuable insights
+    - Shows leadership thinking and strategic perspective
+    - Perfect communication and structure
+
+    75-89%: STRONG
+    - Solid technical knowledge with good examples
+    - Clear, well-structured answers
+    - Shows practical experience
+    - Minor gaps in depth or breadth
+
+    60-74%: COMPETENT
+    - Adequate knowledge but lacks depth
+    - Answers are correct but somewhat generic
+    - Limited specific examples
+    - Communication is clear but not compelling
+
+    40-59%: DEVELOPING
+    - Basic understanding with notable gaps
+    - Answers are vague or lack specificity
+    - Limited practical experience evident
+    - Needs significant development
+
+    0-39%: INSUFFICIENT
+    - Major knowledge gaps
+    - Incorrect or irrelevant answers
+    - Poor communication
+    - Not ready for this level
+
+    SENIORITY EXPECTATIONS:
+    - Fresher: Basic concepts, learning attitude, potential
+    - Junior: Practical skills, can execute tasks independently
+    - Mid-Senior: Deep expertise, can design solutions, mentors others
+    - Senior: Strategic thinking, architecture decisions, leadership
+    - Lead: Vision, cross-team impact, business alignment
+
+    IMPORTANT: Score based on ACTUAL answer quality, not potential. Be specific in your analysis.
+"""
+
+_STATIC_PROMPTS: Dict[str, str] = {
+    "interviewer": INTERVIEWER_STATIC_PROMPT,
+    "assessment": ASSESSMENT_STATIC_PROMPT,
+}
+
+
+@lru_cache(maxsize=None)
+def static_prompt(name: str) -> str:
+    """Render a static block once (dedented, no indentation tokens) and reuse it for every request."""
+    return textwrap.dedent(_STATIC_PROMPTS[name]).strip()
+
+
+@lru_cache(maxsize=None)
+def static_message(name: str) -> SystemMessage:
+    """Pre-built system message for a static block (never passed through the template engine)."""
+    return SystemMessage(content=static_prompt(name))
+
+
+def prefix_fingerprint(name: str) -> str:
+    """Short hash of a static block, logged at startup to spot accidental prefix changes."""
+    return hashlib.sha256(static_prompt(name).encode("utf-8")).hexdigest()[:12]
+
+
+# ==================== Interview Prompt ====================
+
+interviewer_prompt = ChatPromptTemplate.from_messages([
+    # 1. Static personality / rubric block (shared by every session)
+    static_message("interviewer"),
+
+    # 2. Per-session context (fixed for the whole interview)
+    ("system", """INTERVIEW SETUP:
+- Interview Length: {max_questions} questions
+- Candidate Seniority Level: {seniority_level}"""),
+
+    # 3. Per-turn context
+    ("human", """RELEVANT RESUME CONTEXT:
+{resume_chunks}
+
+INTERVIEW STATUS:
+Questions Asked: {total_questions_asked} / {max_questions}
+
+CONVERSATION HISTORY:
+{chat_history}
+
+INSTRUCTION:
+Generate ONLY the next question.
+Make it conversational and natural for voice.
+Avoid repeating previous topics.
+Reference the candidate's resume when relevant.
+Keep it under 25 words.""")
+])
+
+
+# ==================== Assessment Prompts ====================
+
+# Scores one answer as soon as it is saved (compact TurnScore result)
+turn_scoring_prompt = ChatPromptTemplate.from_messages([
+    # 1. Static rubric block (shared by every assessment call)
+    static_message("assessment"),
+
+    # 2. Per-turn context
+    ("human", """EXPECTED SENIORITY LEVEL: {difficulty_level}
+
+QUESTION:
+{question}
+
+CANDIDATE ANSWER:
+{answer}
+
+INSTRUCTIONS:
+Score ONLY this answer against the rubric and the seniority expectations.
+Be ACCURATE - don't default to middle scores.
+Keep strengths and gaps to at most 2 short phrases each.
+Return a result following the TurnScore schema.""")
+])
+
+# Optional short call that turns the per-turn results into a narrative at completion
+synthesis_prompt = ChatPromptTemplate.from_messages([
+    # 1. Static rubric block (shared by every assessment call)
+    static_message("assessment"),
+
+    # 2. Per-session context: per-question results only, never the full transcript
+    ("human", """EXPECTED SENIORITY LEVEL: {difficulty_level}
+
+CANDIDATE PROFILE:
+{profile_doc}
+
+=====================
+PER-QUESTION RESULTS
+=====================
+{turn_results}
+
+OVERALL SCORE: {overall_score}/100 ({recommendation})
+
+INSTRUCTIONS:
+Do not re-score. Write a 2-3 sentence analysis of answer depth and relevance across the
+interview and concrete next steps for the hiring process.
+Return a result following the AssessmentSynthesis schema.""")
+])
+
+# Assessment prompt texts that define the rubric; hashed (with the score bands and aggregation)
+# into turn_scoring.ASSESSMENT_RUBRIC_VERSION
+ASSESSMENT_PROMPT_TEXTS = (
+    [static_prompt("assessment")]
+    + [str(m.prompt.template) for prompt in (turn_scoring_prompt, synthesis_prompt) for m in prompt.messages[1:]]
+)
+
+
+# ==================== Prefix Check ====================
+
+_PROBE_INPUTS = {
+    "interviewer": [
+        {"max_questions": 5, "seniority_level": "Fresher", "resume_chunks": "Intern at A",
+         "total_questions_asked": 0, "chat_history": ""},
+        {"max_questions": 10, "seniority_level": "Senior", "resume_chunks": "Staff engineer at B",
+         "total_questions_asked": 7, "chat_history": "Q: Hi\nA: Hello"},
+    ],
+    "turn_scoring": [
+        {"difficulty_level": "Junior", "question": "Hi", "answer": "Hello"},
+        {"difficulty_level": "Senior", "question": "Why Go?", "answer": ""},
+    ],
+    "synthesis": [
+        {"difficulty_level": "Junior", "profile_doc": "{}", "turn_results": "Q1 [intro] 60/100",
+         "overall_score": 60, "recommendation": "Consider with Reservations"},
+        {"difficulty_level": "Senior", "profile_doc": "{\"skills\": [\"Go\"]}", "turn_results": "",
+         "overall_score": 0, "recommendation": "Do Not Recommend"},
+    ],
+}
+
+
+def verify_static_prefix() -> Dict[str, str]:
+    """
+    Render each prompt for two unrelated sessions and check that the first message is
+    byte-identical and contains no session data. Called at startup.
+
+    Returns:
+        Fingerprint of each static block
+
+    Raises:
+        RuntimeError: If a prompt's prefix varies between sessions
+    """
+    # prompt name -> (prompt, static block it must start with)
+    prompts = {
+        "interviewer": (interviewer_prompt, "interviewer"),
+        "turn_scoring": (turn_scoring_prompt, "assessment"),
+        "synthesis": (synthesis_prompt, "assessment"),
+    }
+    fingerprints = {}
+    for name, (prompt, block) in prompts.items():
+        prefixes = {prompt.format_messages(**inputs)[0].content for inputs in _PROBE_INPUTS[name]}
+        if prefixes != {static_prompt(block)}:
+            raise RuntimeError(f"{name} prompt prefix is not stable across sessions")
+        fingerprints[block] = prefix_fingerprint(block)
+    return fingerprints
@@ -0,0 +1,60 @@
+"""
+Resume Parse Cache
+Content-addressed cache of parsed resume profiles, shared by /parse-resume and /init-interview
+"""
+
+from typing import Any, Dict, Optional
+import hashlib
+import os
+import re
+
+from persistent_cache import PersistentCache
+
+
+RESUME_CACHE_TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "5000"))
+
+SENIORITY_LEVELS = {"Fresher", "Junior", "Mid-Senior", "Senior", "Lead"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_resume_text(resume_text: str) -> str:
+    """Collapse whitespace so re-extracted copies of the same resume hash identically."""
+    return _WHITESPACE.sub(" ", resume_text or "").strip()
+
+
+def resume_cache_key(resume_text: str, prompt_version: str) -> str:
+    """Hash of the normalized resume text plus the extraction prompt version."""
+    digest = hashlib.sha256()
+    digest.update(prompt_version.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize_resume_text(resume_text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def profile_from_stored(stored: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild an agent resume profile from one already stored by the backend (users.resumeProfile).
+
+    Returns None when the stored profile was never parsed successfully.
+    """
+    if not stored or stored.get("seniority_level") not in SENIORITY_LEVELS:
+        return None
+
+    return {
+        "name": stored.get("name", ""),
+        "email": stored.get("email", ""),
+        "linkedin": stored.get("linkedin", ""),
+        "experience": stored.get("experience", ""),
+        "skills": stored.get("skills", []),
+        "seniority_level": stored["seniority_level"],
+    }
+
+
+# Global parse cache instance
+resume_parse_cache = PersistentCache(
+    namespace="resume_profile",
+    ttl_seconds=RESUME_CACHE_TTL_SECONDS,
+    max_entries=RESUME_CACHE_MAX_ENTRIES
+)
@@ -1,142 +1,410 @@
 """
 Session Manager for Interview State
-Manages in-memory session state without using vectorstore
+Manages interview session state without using vectorstore.
+Sessions are compact SessionRecords (session_record.py) that share resume chunks by content hash.
+State lives in a pluggable SessionStore (session_store.py); the default keeps it in memory,
+the sqlite / redis stores share it across workers and replicas.
+Requests read a session once as a SessionSnapshot; multi-step flows on one session are
+serialized by a per-session asyncio.Lock, so different sessions never wait on each other.
+The memory store is snapshotted periodically and on shutdown, and restored on startup.
 """
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Tuple
+import asyncio
+import os
+import time
+
+from session_record import SessionRecord, SessionSnapshot, Turn, chunk_pool
+from session_store import SessionStore, create_session_store
+
+
+SESSION_TIMEOUT_MINUTES = int(os.getenv("SESSION_TIMEOUT_MINUTES", "120"))
+
+# Caps enforced by the background sweeper; least recently used sessions are evicted beyond them
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "5000"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_MB", "256")) * 1024 * 1024
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "60"))
+
+# Warm restart for the memory store (sqlite / redis already outlive the process); 0 disables periodic snapshots
+SESSION_SNAPSHOT_PATH = os.getenv(
+    "SESSION_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "sessions.snapshot.jsonl")
+)
+SESSION_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("SESSION_SNAPSHOT_INTERVAL_SECONDS", "30"))
+
+
+def determine_max_questions(resume_profile: Dict[str, Any]) -> int:
+    """Determine max questions based on seniority level."""
+    seniority = resume_profile.get("seniority_level", "Junior").lower()
+
+    if seniority == "fresher":
+        return 5
+    elif seniority == "junior":
+        return 7
+    else:  # Mid-Senior, Senior, Lead
+        return 10
+
+
+class SessionLocks:
+    """
+    One asyncio.Lock per session, created on first use and dropped once no task holds or
+    waits for it. Locks are per worker process; the store keeps each update atomic across workers.
+    """
+
+    def __init__(self):
+        # session_id -> [lock, holders + waiters]
+        self._locks: Dict[str, List[Any]] = {}
+        self.acquired = 0
+        self.contended = 0
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        entry = self._locks.get(session_id)
+        if entry is None:
+            entry = self._locks[session_id] = [asyncio.Lock(), 0]
+        lock = entry[0]
+        entry[1] += 1
+        if lock.locked():
+            self.contended += 1
+        try:
+            async with lock:
+                self.acquired += 1
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._locks.get(session_id) is entry:
+                del self._locks[session_id]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": len(self._locks),
+            "acquired": self.acquired,
+            "contended": self.contended,
+        }
 
 
 class SessionManager:
-    """Manages interview session state in-memory."""
-    
-    def __init__(self, session_timeout_minutes: int = 60):
-        self._sessions: Dict[str, Dict[str, Any]] = {}
-        self._lock = threading.Lock()
-        self.session_timeout = timedelta(minutes=session_timeout_minutes)
-    
-    def create_session(
-        self, 
-        session_id: str, 
+    """Manages interview session state in a SessionStore."""
+
+    def __init__(
+        self,
+        store: SessionStore,
+        session_timeout_minutes: int = SESSION_TIMEOUT_MINUTES,
+        max_sessions: int = SESSION_MAX_COUNT,
+        max_bytes: int = SESSION_MAX_BYTES,
+        snapshot_path: str = SESSION_SNAPSHOT_PATH
+    ):
+        self.store = store
+        self.session_timeout_seconds = session_timeout_minutes * 60
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.locks = SessionLocks()
+        self.snapshot_path = snapshot_path
+        self._sweeper: Optional[asyncio.Task] = None
+        self._snapshotter: Optional[asyncio.Task] = None
+        self.sweep_counters = {
+            "sweeps": 0,
+            "expired": 0,
+            "evicted_lru": 0,
+            "sweep_errors": 0,
+        }
+        self.last_sweep: Dict[str, Any] = {}
+        self.snapshot_counters = {
+            "snapshots": 0,
+            "snapshot_errors": 0,
+            "restored": 0,
+        }
+        self.last_snapshot: Dict[str, Any] = {}
+
+    async def create_session(
+        self,
+        session_id: str,
         resume_profile: Dict[str, Any],
         chunks: List[str]
     ) -> None:
-        """Create a new interview session."""
-        with self._lock:
-            self._sessions[session_id] = {
-                "resume_profile": resume_profile,
-                "chunks": chunks,
-                "conversation_history": [],
-                "questions_asked": 0,
-                "max_questions": self._determine_max_questions(resume_profile),
-                "created_at": datetime.utcnow(),
-                "last_accessed": datetime.utcnow()
-            }
-    
-    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get session data."""
-        with self._lock:
-            session = self._sessions.get(session_id)
-            if session:
-                session["last_accessed"] = datetime.utcnow()
-            return session
-    
-    def update_conversation(
-        self, 
-        session_id: str, 
-        question: str, 
+        """Create a new interview session (chunks are shared with other sessions on the same resume)."""
+        await self.store.put(session_id, SessionRecord(
+            resume_profile=resume_profile,
+            chunk_set=chunk_pool.intern(chunks),
+            max_questions=determine_max_questions(resume_profile)
+        ))
+
+    def lock(self, session_id: str):
+        """
+        Serialize a multi-step flow on one session (async context manager):
+            async with session_manager.lock(session_id): ...
+        """
+        return self.locks.hold(session_id)
+
+    async def snapshot(self, session_id: str) -> Optional[SessionSnapshot]:
+        """Everything a request needs from the session, read once (None if it doesn't exist)."""
+        session = await self.store.get(session_id)
+        return session.snapshot(session_id) if session else None
+
+    async def update_conversation(
+        self,
+        session_id: str,
+        question: str,
         answer: Optional[str] = None
-    ) -> None:
-        """Add Q&A to conversation history."""
-        with self._lock:
-            if session_id in self._sessions:
-                self._sessions[session_id]["conversation_history"].append({
-                    "question": question,
-                    "answer": answer,
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-                if answer:  # Only increment when answer is provided
-                    self._sessions[session_id]["questions_asked"] += 1
-                self._sessions[session_id]["last_accessed"] = datetime.utcnow()
-    
-    def get_conversation_history(self, session_id: str) -> List[Dict[str, str]]:
-        """Get full conversation history for a session."""
-        session = self.get_session(session_id)
-        return session["conversation_history"] if session else []
-    
-    def get_questions_asked(self, session_id: str) -> int:
-        """Get number of questions asked in session."""
-        session = self.get_session(session_id)
-        return session["questions_asked"] if session else 0
-    
-    def get_max_questions(self, session_id: str) -> int:
-        """Get max questions for session."""
-        session = self.get_session(session_id)
-        return session["max_questions"] if session else 0
-    
-    def delete_session(self, session_id: str) -> None:
+    ) -> Optional[SessionSnapshot]:
+        """
+        Add Q&A to conversation history (answers fill the pending turn for that question).
+        The history tuple is replaced, never changed in place. Returns the updated snapshot.
+        """
+        def apply(session: SessionRecord) -> SessionSnapshot:
+            history = session.conversation_history
+            if (
+                answer is not None
+                and history
+                and history[-1].answer is None
+                and history[-1].question == question
+            ):
+                session.conversation_history = history[:-1] + (Turn.now(question, answer),)
+            else:
+                session.conversation_history = history + (Turn.now(question, answer),)
+            if answer:  # Only increment when answer is provided
+                session.questions_asked += 1
+            return session.snapshot(session_id)
+
+        return await self.store.update(session_id, apply)
+
+    async def restore_session(
+        self,
+        session_id: str,
+        resume_profile: Dict[str, Any],
+        chunks: List[str],
+        turns: List[Tuple[str, Optional[str], float]]
+    ) -> SessionSnapshot:
+        """
+        Recreate a session from its persisted transcript (question, answer, timestamp per turn).
+        Every answered turn counts as an asked question, as in update_conversation.
+        """
+        session = SessionRecord(
+            resume_profile=resume_profile,
+            chunk_set=chunk_pool.intern(chunks),
+            max_questions=determine_max_questions(resume_profile),
+            conversation_history=tuple(Turn(*turn) for turn in turns),
+            questions_asked=sum(1 for _, answer, _ in turns if answer)
+        )
+        await self.store.put(session_id, session)
+        return session.snapshot(session_id)
+
+    async def set_resume_profile(self, session_id: str, resume_profile: Dict[str, Any]) -> None:
+        """Replace the placeholder profile once the resume is parsed (max questions follow seniority)."""
+        def apply(session: SessionRecord) -> None:
+            session.resume_profile = resume_profile
+            session.max_questions = determine_max_questions(resume_profile)
+
+        await self.store.update(session_id, apply)
+
+    async def delete_session(self, session_id: str) -> None:
         """Delete a session."""
-        with self._lock:
-            if session_id in self._sessions:
-                del self._sessions[session_id]
-    
-    def cleanup_expired_sessions(self) -> int:
+        await self.store.delete(session_id)
+
+    async def cleanup_expired_sessions(self) -> int:
         """Remove sessions that haven't been accessed recently."""
-        with self._lock:
-            now = datetime.utcnow()
-            expired = [
-                sid for sid, session in self._sessions.items()
-                if now - session["last_accessed"] > self.session_timeout
-            ]
-            for sid in expired:
-                del self._sessions[sid]
-            return len(expired)
-    
-    def _determine_max_questions(self, resume_profile: Dict[str, Any]) -> int:
-        """Determine max questions based on seniority level."""
-        seniority = resume_profile.get("seniority_level", "Junior").lower()
-        
-        if seniority == "fresher":
-            return 5
-        elif seniority == "junior":
-            return 7
-        else:  # Mid-Senior, Senior, Lead
-            return 10
-    
-    def get_chunks(self, session_id: str) -> List[str]:
-        """Get resume chunks for a session."""
-        session = self.get_session(session_id)
-        return session["chunks"] if session else []
-    
-    def get_resume_profile(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get resume profile for a session."""
-        session = self.get_session(session_id)
-        return session["resume_profile"] if session else None
-    
+        return await self.store.expire(self.session_timeout_seconds)
+
+    # ===== EVICTION METHODS =====
+    async def evict_over_budget(self) -> int:
+        """Evict least recently used sessions until both the count and the bytes cap hold."""
+        entries = await self.store.entries()
+        count = len(entries)
+        total_bytes = sum(size for _, _, size in entries)
+        if count <= self.max_sessions and total_bytes <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for session_id, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if count <= self.max_sessions and total_bytes <= self.max_bytes:
+                break
+            await self.store.delete(session_id)
+            count -= 1
+            total_bytes -= size
+            evicted += 1
+        return evicted
+
+    async def sweep(self) -> Dict[str, Any]:
+        """One sweeper pass: expire idle sessions, then enforce the count / bytes caps."""
+        started = time.perf_counter()
+        expired = await self.cleanup_expired_sessions()
+        evicted = await self.evict_over_budget()
+        self.sweep_counters["sweeps"] += 1
+        self.sweep_counters["expired"] += expired
+        self.sweep_counters["evicted_lru"] += evicted
+        self.last_sweep = {
+            "at": time.time(),
+            "expired": expired,
+            "evicted_lru": evicted,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if expired or evicted:
+            print(f"[SESSIONS] Sweep removed {expired} idle and {evicted} over-budget session(s)")
+        return self.last_sweep
+
+    async def _sweep_forever(
+        self,
+        interval: float,
+        after_sweep: Optional[Callable[[], Awaitable[Any]]]
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sweep()
+                if after_sweep is not None:
+                    await after_sweep()
+            except Exception as e:
+                self.sweep_counters["sweep_errors"] += 1
+                print(f"[SESSIONS] Sweep failed: {str(e)}")
+
+    def start_sweeper(
+        self,
+        interval: float = SESSION_SWEEP_INTERVAL_SECONDS,
+        after_sweep: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> None:
+        """
+        Start the background sweeper (call once the event loop is running).
+
+        Args:
+            interval: Seconds between sweeps
+            after_sweep: Coroutine function run after each sweep (e.g. drop per-worker state
+                of sessions that are gone from the store)
+        """
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_forever(interval, after_sweep))
+
+    async def stop_sweeper(self) -> None:
+        """Stop the background sweeper."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    # ===== SNAPSHOT METHODS =====
+    async def save_snapshot(self) -> int:
+        """Snapshot the memory store to snapshot_path; returns sessions written (0 for durable stores)."""
+        if self.store.durable:
+            return 0
+        started = time.perf_counter()
+        try:
+            saved = await self.store.dump(self.snapshot_path)
+        except Exception as e:
+            self.snapshot_counters["snapshot_errors"] += 1
+            print(f"[SESSIONS] Snapshot failed: {str(e)}")
+            return 0
+        self.snapshot_counters["snapshots"] += 1
+        self.last_snapshot = {
+            "at": time.time(),
+            "sessions": saved,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        return saved
+
+    async def restore_snapshot(self) -> int:
+        """Restore sessions from the last snapshot (memory store only); returns how many were restored."""
+        if self.store.durable:
+            return 0
+        try:
+            restored = await self.store.load(self.snapshot_path, self.session_timeout_seconds)
+        except Exception as e:
+            self.snapshot_counters["snapshot_errors"] += 1
+            print(f"[SESSIONS] Snapshot restore failed: {str(e)}")
+            return 0
+        self.snapshot_counters["restored"] += restored
+        if restored:
+            print(f"[SESSIONS] Restored {restored} session(s) from {self.snapshot_path}")
+        return restored
+
+    async def _snapshot_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.save_snapshot()
+
+    def start_snapshots(self, interval: float = SESSION_SNAPSHOT_INTERVAL_SECONDS) -> None:
+        """Snapshot the memory store every interval seconds (no-op for durable stores or interval 0)."""
+        if self.store.durable or interval <= 0:
+            return
+        if self._snapshotter is None or self._snapshotter.done():
+            self._snapshotter = asyncio.create_task(self._snapshot_forever(interval))
+
+    async def stop_snapshots(self) -> None:
+        """Stop periodic snapshots and write a final one."""
+        if self._snapshotter is not None:
+            self._snapshotter.cancel()
+            try:
+                await self._snapshotter
+            except asyncio.CancelledError:
+                pass
+            self._snapshotter = None
+        saved = await self.save_snapshot()
+        if saved:
+            print(f"[SESSIONS] Snapshotted {saved} session(s) to {self.snapshot_path}")
+
+    async def gauges(self) -> Dict[str, Any]:
+        """Live sessions, approximate bytes, caps and sweep / eviction counters."""
+        entries = await self.store.entries()
+        return {
+            "store": self.store.name,
+            "live_sessions": len(entries),
+            "approx_bytes": sum(size for _, _, size in entries),
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "idle_timeout_seconds": self.session_timeout_seconds,
+            "chunk_pool": chunk_pool.stats(),
+            "locks": self.locks.stats(),
+            **self.sweep_counters,
+            "last_sweep": self.last_sweep,
+            **self.snapshot_counters,
+            "last_snapshot": self.last_snapshot,
+        }
+
+    # ===== CONVERSATION MEMORY METHODS =====
+    async def set_memory(self, session_id: str, summary: str, summarized_upto: int) -> None:
+        """Store an updated running summary (ignored if a newer one is already stored)."""
+        def apply(session: SessionRecord) -> None:
+            if summarized_upto > session.memory_summarized_upto:
+                session.memory_summary = summary
+                session.memory_summarized_upto = summarized_upto
+
+        await self.store.update(session_id, apply)
+
     # ===== PRE-GENERATION METHODS =====
-    def set_pregenerated_question(self, session_id: str, question: str) -> None:
-        """Store a pre-generated next question for faster response."""
-        with self._lock:
-            if session_id in self._sessions:
-                self._sessions[session_id]["pregenerated_question"] = question
-                print(f"[PREGEN] Stored pre-generated question for session {session_id}")
-    
-    def get_pregenerated_question(self, session_id: str) -> Optional[str]:
-        """Get and consume the pre-generated question (returns None if not available)."""
-        with self._lock:
-            if session_id in self._sessions:
-                question = self._sessions[session_id].pop("pregenerated_question", None)
-                if question:
-                    print(f"[PREGEN] Using pre-generated question for session {session_id}")
-                return question
-            return None
-    
-    def has_pregenerated_question(self, session_id: str) -> bool:
+    async def set_pregenerated_question(self, session_id: str, speculation: Dict[str, Any]) -> bool:
+        """
+        Store a pre-generated next question (speculation record with turn + fingerprint).
+        Refused once the session has moved past the speculation's turn; returns whether it was stored.
+        """
+        def apply(session: SessionRecord) -> bool:
+            if len(session.conversation_history) != speculation["turn"]:
+                return False
+            session.pregenerated_question = speculation
+            return True
+
+        stored = bool(await self.store.update(session_id, apply))
+        if stored:
+            print(f"[PREGEN] Stored pre-generated question for session {session_id} (turn {speculation['turn']})")
+        return stored
+
+    async def get_pregenerated_question(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get and consume the pre-generated speculation record (returns None if not available)."""
+        def apply(session: SessionRecord) -> Optional[Dict[str, Any]]:
+            speculation, session.pregenerated_question = session.pregenerated_question, None
+            return speculation
+
+        return await self.store.update(session_id, apply)
+
+    async def has_pregenerated_question(self, session_id: str) -> bool:
         """Check if a pre-generated question is available."""
-        session = self.get_session(session_id)
-        return session.get("pregenerated_question") is not None if session else False
+        session = await self.store.get(session_id)
+        return session.pregenerated_question is not None if session else False
 
 
-# Global session manager instance
-session_manager = SessionManager(session_timeout_minutes=120)
+# Global session manager instance (SESSION_STORE selects the backend)
+session_manager = SessionManager(
+    store=create_session_store(idle_seconds=SESSION_TIMEOUT_MINUTES * 60),
+    session_timeout_minutes=SESSION_TIMEOUT_MINUTES
+)
@@ -0,0 +1,229 @@
+"""
+Session Records
+Compact slot-based interview session state. Resume chunks are interned once per content hash
+in a process-wide pool and shared by reference between every session on the same resume.
+Histories are copy-on-write tuples of immutable turns, so snapshots share them without copying.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import hashlib
+import json
+import threading
+import time
+import weakref
+
+
+def chunks_key(chunks: Sequence[str]) -> str:
+    """Content hash identifying a resume's chunk list."""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ChunkSet:
+    """One resume's chunks, immutable and shared by every session that uses them."""
+
+    __slots__ = ("key", "chunks", "size", "__weakref__")
+
+    def __init__(self, key: str, chunks: Sequence[str]):
+        self.key = key
+        self.chunks: Tuple[str, ...] = tuple(chunks)
+        self.size = sum(len(chunk) for chunk in self.chunks)
+
+
+class ChunkPool:
+    """
+    Interns chunk sets by content hash. Entries live while any session references them
+    (weak values), plus a small LRU of recently used sets so shared stores don't re-load
+    chunks on every request. Thread-safe (the SQLite store resolves chunks in a thread).
+    """
+
+    def __init__(self, keep_recent: int = 256):
+        self._sets: "weakref.WeakValueDictionary[str, ChunkSet]" = weakref.WeakValueDictionary()
+        self._recent: "OrderedDict[str, ChunkSet]" = OrderedDict()
+        self.keep_recent = keep_recent
+        self._lock = threading.Lock()
+        self.interned = 0
+        self.shared = 0
+
+    def _touch(self, chunk_set: ChunkSet) -> ChunkSet:
+        self._recent[chunk_set.key] = chunk_set
+        self._recent.move_to_end(chunk_set.key)
+        while len(self._recent) > self.keep_recent:
+            self._recent.popitem(last=False)
+        return chunk_set
+
+    def intern(self, chunks: Sequence[str], key: Optional[str] = None) -> ChunkSet:
+        """The pooled chunk set for these chunks (created on first use)."""
+        key = key or chunks_key(chunks)
+        with self._lock:
+            chunk_set = self._sets.get(key)
+            if chunk_set is None:
+                chunk_set = ChunkSet(key, chunks)
+                self._sets[key] = chunk_set
+                self.interned += 1
+            else:
+                self.shared += 1
+            return self._touch(chunk_set)
+
+    def get(self, key: str) -> Optional[ChunkSet]:
+        """A pooled chunk set by key, if this process still holds it."""
+        with self._lock:
+            chunk_set = self._sets.get(key)
+            return self._touch(chunk_set) if chunk_set is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sets = list(self._sets.values())
+        return {
+            "chunk_sets": len(sets),
+            "chunk_bytes": sum(chunk_set.size for chunk_set in sets),
+            "interned": self.interned,
+            "shared": self.shared,
+        }
+
+
+class Turn(NamedTuple):
+    """One question and its answer (None while pending); timestamp is epoch seconds. Immutable."""
+
+    question: str
+    answer: Optional[str]
+    timestamp: float
+
+    @classmethod
+    def now(cls, question: str, answer: Optional[str] = None) -> "Turn":
+        return cls(question, answer, time.time())
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"question": self.question, "answer": self.answer, "timestamp": self.timestamp}
+
+
+class SessionSnapshot:
+    """
+    Consistent read-only view of a session taken in one store read. It shares the record's
+    history tuple and chunk set; `conversation` is this snapshot's own list of turn dicts.
+    """
+
+    __slots__ = (
+        "session_id",
+        "resume_profile",
+        "chunks",
+        "history",
+        "questions_asked",
+        "max_questions",
+        "memory_summary",
+        "memory_summarized_upto",
+    )
+
+    def __init__(self, session_id: str, record: "SessionRecord"):
+        self.session_id = session_id
+        self.resume_profile = record.resume_profile
+        self.chunks = record.chunks
+        self.history: Tuple[Turn, ...] = record.conversation_history
+        self.questions_asked = record.questions_asked
+        self.max_questions = record.max_questions
+        self.memory_summary = record.memory_summary
+        self.memory_summarized_upto = record.memory_summarized_upto
+
+    @property
+    def turn(self) -> int:
+        """Number of turns (asked questions) so far."""
+        return len(self.history)
+
+    @property
+    def conversation(self) -> List[Dict[str, Any]]:
+        """History as turn dicts (a new list on every access)."""
+        return [turn.as_dict() for turn in self.history]
+
+
+class SessionRecord:
+    """
+    Interview session state; chunks point at a pooled ChunkSet. resume_profile and the history
+    tuple are replaced, never changed in place, so snapshots stay consistent.
+    """
+
+    __slots__ = (
+        "resume_profile",
+        "chunk_set",
+        "conversation_history",
+        "questions_asked",
+        "max_questions",
+        "memory_summary",
+        "memory_summarized_upto",
+        "pregenerated_question",
+        "created_at",
+        "last_accessed",
+    )
+
+    def __init__(
+        self,
+        resume_profile: Dict[str, Any],
+        chunk_set: ChunkSet,
+        max_questions: int,
+        conversation_history: Tuple[Turn, ...] = (),
+        questions_asked: int = 0,
+        memory_summary: str = "",
+        memory_summarized_upto: int = 0,
+        pregenerated_question: Optional[Dict[str, Any]] = None,
+        created_at: Optional[float] = None,
+        last_accessed: Optional[float] = None
+    ):
+        now = time.time()
+        self.resume_profile = resume_profile
+        self.chunk_set = chunk_set
+        self.conversation_history: Tuple[Turn, ...] = conversation_history
+        self.questions_asked = questions_asked
+        self.max_questions = max_questions
+        self.memory_summary = memory_summary
+        self.memory_summarized_upto = memory_summarized_upto
+        self.pregenerated_question = pregenerated_question
+        self.created_at = created_at if created_at is not None else now
+        self.last_accessed = last_accessed if last_accessed is not None else now
+
+    @property
+    def chunks(self) -> Tuple[str, ...]:
+        return self.chunk_set.chunks
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form for shared stores; chunks are referenced by key and stored once."""
+        return {
+            "resume_profile": self.resume_profile,
+            "chunks_key": self.chunk_set.key,
+            "conversation_history": [[t.question, t.answer, t.timestamp] for t in self.conversation_history],
+            "questions_asked": self.questions_asked,
+            "max_questions": self.max_questions,
+            "memory_summary": self.memory_summary,
+            "memory_summarized_upto": self.memory_summarized_upto,
+            "pregenerated_question": self.pregenerated_question,
+            "created_at": self.created_at,
+            "last_accessed": self.last_accessed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], chunk_set: ChunkSet) -> "SessionRecord":
+        return cls(
+            resume_profile=data["resume_profile"],
+            chunk_set=chunk_set,
+            max_questions=data["max_questions"],
+            conversation_history=tuple(Turn(*turn) for turn in data["conversation_history"]),
+            questions_asked=data["questions_asked"],
+            memory_summary=data["memory_summary"],
+            memory_summarized_upto=data["memory_summarized_upto"],
+            pregenerated_question=data.get("pregenerated_question"),
+            created_at=data["created_at"],
+            last_accessed=data["last_accessed"],
+        )
+
+    def snapshot(self, session_id: str) -> SessionSnapshot:
+        return SessionSnapshot(session_id, self)
+
+    def approx_bytes(self) -> int:
+        """Approximate size of the session's own state (shared chunks not included)."""
+        return len(json.dumps(self.to_dict()))
+
+
+# Global chunk pool shared by every session in this process
+chunk_pool = ChunkPool()
@@ -0,0 +1,118 @@
+"""
+Session Rehydration
+Rebuilds an interview session this worker no longer holds (restart without a snapshot, expiry)
+from the backend's MongoDB: the stored resume profile in interview_sessions and the transcript
+in interview_answers. Disabled unless MONGO_URI and DB_NAME are set (same as the backend).
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import os
+
+
+MONGO_URI = os.getenv("MONGO_URI", "")
+DB_NAME = os.getenv("DB_NAME", "")
+SESSION_REHYDRATE_ENABLED = os.getenv("SESSION_REHYDRATE_ENABLED", "true").lower() == "true"
+
+
+def _epoch(value: Optional[datetime]) -> float:
+    """Backend timestamps are naive UTC datetimes."""
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SessionRehydrator:
+    """Reads a session's persisted state from MongoDB (motor client created on first use)."""
+
+    def __init__(self, uri: str = MONGO_URI, db_name: str = DB_NAME, enabled: bool = SESSION_REHYDRATE_ENABLED):
+        self.uri = uri
+        self.db_name = db_name
+        self.enabled = enabled and bool(uri and db_name)
+        self._client = None
+        self.counters = {
+            "lookups": 0,
+            "rehydrated": 0,
+            "not_found": 0,
+            "errors": 0,
+        }
+
+    def _db(self) -> Any:
+        if self._client is None:
+            try:
+                from motor.motor_asyncio import AsyncIOMotorClient
+            except ImportError as e:
+                raise RuntimeError("Session rehydration requires the 'motor' package (pip install motor)") from e
+            self._client = AsyncIOMotorClient(self.uri, serverSelectionTimeoutMS=5000)
+        return self._client[self.db_name]
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The persisted state of an in-progress interview, or None if there is none.
+
+        Returns:
+            {"resume_profile": stored resumeProfile, "resume_text": str, "chunks": [...],
+             "turns": [(question, answer or None, timestamp), ...]}
+        """
+        if not self.enabled:
+            return None
+        self.counters["lookups"] += 1
+        try:
+            from bson import ObjectId
+            from bson.errors import InvalidId
+
+            try:
+                session_obj_id = ObjectId(session_id)
+            except (InvalidId, TypeError):
+                self.counters["not_found"] += 1
+                return None
+
+            db = self._db()
+            session = await db.interview_sessions.find_one(
+                {"_id": session_obj_id},
+                projection={"resumeProfile": 1, "status": 1}
+            )
+            resume_profile = (session or {}).get("resumeProfile")
+            if not resume_profile or session.get("status") == "completed":
+                self.counters["not_found"] += 1
+                return None
+
+            turns: List[Tuple[str, Optional[str], float]] = []
+            cursor = db.interview_answers.find(
+                {"sessionId": session_id},
+                projection={"question": 1, "answer": 1, "createdAt": 1, "updatedAt": 1}
+            ).sort("questionNumber", 1)
+            async for doc in cursor:
+                if not doc.get("question"):
+                    continue
+                turns.append((doc["question"], doc.get("answer"), _epoch(doc.get("updatedAt") or doc.get("createdAt"))))
+            if not turns:
+                # Not initialized yet - nothing to resume
+                self.counters["not_found"] += 1
+                return None
+        except Exception as e:
+            self.counters["errors"] += 1
+            print(f"[SESSIONS] Rehydrate lookup failed for session {session_id}: {str(e)}")
+            return None
+
+        self.counters["rehydrated"] += 1
+        return {
+            "resume_profile": resume_profile,
+            "resume_text": resume_profile.get("extracted_text") or "",
+            "chunks": resume_profile.get("chunks") or [],
+            "turns": turns,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self.counters}
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+# Global rehydrator (MONGO_URI / DB_NAME from the agent's environment)
+session_rehydrator = SessionRehydrator()
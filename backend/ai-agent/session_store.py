@@ -0,0 +1,523 @@
+"""
+Session Store
+Storage backends for interview session state. "memory" keeps sessions in this process;
+"sqlite" (one host, any number of workers) and "redis" (any number of hosts) share them, so
+every worker and replica sees the same session. Each read-modify-write of a session is atomic.
+Shared stores keep each resume's chunks once, under its content hash, next to the sessions.
+The memory store can be snapshotted to a JSONL file and restored on restart.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from session_record import ChunkSet, SessionRecord, chunk_pool
+
+
+# Backend: memory (single worker), sqlite (workers on one host) or redis (multiple hosts)
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+SESSION_STORE_PATH = os.getenv(
+    "SESSION_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "sessions.sqlite3")
+)
+SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "redis://localhost:6379/0")
+SESSION_STORE_PREFIX = os.getenv("SESSION_STORE_PREFIX", "agent:session:")
+
+# Bumped when the memory store's snapshot layout changes (older snapshots are ignored)
+SNAPSHOT_VERSION = 1
+
+T = TypeVar("T")
+
+# Applied to the stored session record in place; its return value is passed back to the caller
+Mutator = Callable[[SessionRecord], T]
+
+# (session_id, last_accessed, approximate bytes) - input for LRU eviction
+SessionEntry = Tuple[str, float, int]
+
+
+def _load_chunk_set(key: str, raw: Optional[Any]) -> ChunkSet:
+    """Intern chunks loaded from a shared store (empty if the chunk entry is gone)."""
+    chunks: Sequence[str] = json.loads(raw) if raw is not None else ()
+    return chunk_pool.intern(chunks, key=key)
+
+
+class SessionStore(ABC):
+    """
+    Interface for session storage. Sessions are SessionRecords whose last_accessed
+    timestamp get() refreshes.
+    """
+
+    name = "base"
+    # Sessions survive a restart of this process without snapshots
+    durable = True
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Session record (None if missing); marks the session as accessed."""
+
+    @abstractmethod
+    async def put(self, session_id: str, session: SessionRecord) -> None:
+        """Create or replace a session."""
+
+    @abstractmethod
+    async def update(self, session_id: str, mutator: Mutator) -> Optional[T]:
+        """
+        Atomically apply mutator to the stored session and save it.
+        Returns the mutator's result, or None without calling it when the session is missing.
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Remove a session."""
+
+    @abstractmethod
+    async def expire(self, idle_seconds: float) -> int:
+        """Remove sessions not accessed for idle_seconds; returns how many were removed."""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Number of stored sessions."""
+
+    @abstractmethod
+    async def entries(self) -> List[SessionEntry]:
+        """(session_id, last_accessed, approximate bytes) for every stored session."""
+
+    @abstractmethod
+    async def existing(self, session_ids: Iterable[str]) -> Set[str]:
+        """The subset of session_ids that are stored."""
+
+    async def aclose(self) -> None:
+        """Release connections."""
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Process-local records. Mutators run without awaiting, so each update is atomic on the
+    event loop. Sizes exclude the pooled chunks, which are shared between sessions.
+    """
+
+    name = "memory"
+    durable = False
+
+    def __init__(self):
+        self._sessions: Dict[str, SessionRecord] = {}
+        self._sizes: Dict[str, int] = {}
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_accessed = time.time()
+        return session
+
+    async def put(self, session_id: str, session: SessionRecord) -> None:
+        self._sessions[session_id] = session
+        self._sizes[session_id] = session.approx_bytes()
+
+    async def update(self, session_id: str, mutator: Mutator) -> Optional[T]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        session.last_accessed = time.time()
+        result = mutator(session)
+        self._sizes[session_id] = session.approx_bytes()
+        return result
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._sizes.pop(session_id, None)
+
+    async def expire(self, idle_seconds: float) -> int:
+        cutoff = time.time() - idle_seconds
+        expired = [sid for sid, session in self._sessions.items() if session.last_accessed < cutoff]
+        for sid in expired:
+            await self.delete(sid)
+        return len(expired)
+
+    async def count(self) -> int:
+        return len(self._sessions)
+
+    async def entries(self) -> List[SessionEntry]:
+        return [
+            (sid, session.last_accessed, self._sizes.get(sid, 0))
+            for sid, session in self._sessions.items()
+        ]
+
+    async def existing(self, session_ids: Iterable[str]) -> Set[str]:
+        return {sid for sid in session_ids if sid in self._sessions}
+
+    async def dump(self, path: str) -> int:
+        """
+        Write every session to a JSONL snapshot (chunk sets once, then one line per session),
+        replacing the previous snapshot atomically. Returns how many sessions were written.
+        """
+        # Records are collected on the event loop; to_dict() output is only read by the writer thread
+        sessions = [(sid, session.to_dict()) for sid, session in self._sessions.items()]
+        chunk_sets = {session.chunk_set.key: session.chunk_set.chunks for session in self._sessions.values()}
+
+        def write() -> None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"version": SNAPSHOT_VERSION, "saved_at": time.time()}) + "\n")
+                for key, chunks in chunk_sets.items():
+                    f.write(json.dumps({"chunks_key": key, "chunks": chunks}) + "\n")
+                for sid, data in sessions:
+                    f.write(json.dumps({"session_id": sid, "session": data}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+        await asyncio.to_thread(write)
+        return len(sessions)
+
+    async def load(self, path: str, idle_seconds: float) -> int:
+        """
+        Restore sessions from a snapshot, skipping ones idle for longer than idle_seconds and
+        ones this store already holds. Returns how many sessions were restored.
+        """
+        def read() -> List[Dict[str, Any]]:
+            if not os.path.exists(path):
+                return []
+            with open(path, "r", encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            if not lines or lines[0].get("version") != SNAPSHOT_VERSION:
+                return []
+            return lines[1:]
+
+        lines = await asyncio.to_thread(read)
+        cutoff = time.time() - idle_seconds
+        chunk_sets: Dict[str, ChunkSet] = {}
+        restored = 0
+        for line in lines:
+            if "chunks_key" in line:
+                chunk_sets[line["chunks_key"]] = chunk_pool.intern(line["chunks"], key=line["chunks_key"])
+                continue
+            sid, data = line["session_id"], line["session"]
+            if sid in self._sessions or data["last_accessed"] < cutoff:
+                continue
+            chunk_set = chunk_sets.get(data["chunks_key"]) or _load_chunk_set(data["chunks_key"], None)
+            await self.put(sid, SessionRecord.from_dict(data, chunk_set))
+            restored += 1
+        return restored
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions as JSON rows in a SQLite file shared by every worker on the host; chunks are
+    stored once per content hash in chunk_sets. Updates run in a BEGIN IMMEDIATE transaction,
+    which serializes writers across processes. Queries run in a thread so the event loop never
+    waits on the file lock.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SESSION_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    chunks_key TEXT
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if "chunks_key" not in columns:
+                # Session files written before chunks were split out
+                conn.execute("DELETE FROM sessions")
+                conn.execute("ALTER TABLE sessions ADD COLUMN chunks_key TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_accessed ON sessions (last_accessed)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunk_sets (
+                    chunks_key TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                )
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    async def _call(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.to_thread(self._run, fn)
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, session_id: str) -> Optional[SessionRecord]:
+        row = conn.execute("SELECT data, chunks_key FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        data, key = row
+        chunk_set = chunk_pool.get(key)
+        if chunk_set is None:
+            chunk_row = conn.execute("SELECT data FROM chunk_sets WHERE chunks_key = ?", (key,)).fetchone()
+            chunk_set = _load_chunk_set(key, chunk_row[0] if chunk_row else None)
+        return SessionRecord.from_dict(json.loads(data), chunk_set)
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, session_id: str, session: SessionRecord) -> None:
+        conn.execute(
+            """
+            INSERT INTO sessions (session_id, data, last_accessed, chunks_key) VALUES (?, ?, ?, ?)
+            ON CONFLICT (session_id) DO UPDATE SET
+                data = excluded.data, last_accessed = excluded.last_accessed, chunks_key = excluded.chunks_key
+            """,
+            (session_id, json.dumps(session.to_dict()), session.last_accessed, session.chunk_set.key)
+        )
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        now = time.time()
+
+        def read(conn: sqlite3.Connection) -> Optional[SessionRecord]:
+            session = self._read(conn, session_id)
+            if session is not None:
+                conn.execute("UPDATE sessions SET last_accessed = ? WHERE session_id = ?", (now, session_id))
+                session.last_accessed = now
+            return session
+
+        return await self._call(read)
+
+    async def put(self, session_id: str, session: SessionRecord) -> None:
+        chunk_set = session.chunk_set
+
+        def write(conn: sqlite3.Connection) -> None:
+            exists = conn.execute("SELECT 1 FROM chunk_sets WHERE chunks_key = ?", (chunk_set.key,)).fetchone()
+            if not exists:
+                conn.execute(
+                    "INSERT INTO chunk_sets (chunks_key, data) VALUES (?, ?)",
+                    (chunk_set.key, json.dumps(chunk_set.chunks))
+                )
+            self._write(conn, session_id, session)
+
+        await self._call(write)
+
+    async def update(self, session_id: str, mutator: Mutator) -> Optional[T]:
+        now = time.time()
+
+        def modify(conn: sqlite3.Connection) -> Optional[T]:
+            session = self._read(conn, session_id)
+            if session is None:
+                return None
+            session.last_accessed = now
+            result = mutator(session)
+            self._write(conn, session_id, session)
+            return result
+
+        return await self._call(modify)
+
+    async def delete(self, session_id: str) -> None:
+        await self._call(lambda conn: conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)))
+
+    async def expire(self, idle_seconds: float) -> int:
+        cutoff = time.time() - idle_seconds
+
+        def remove(conn: sqlite3.Connection) -> int:
+            expired = conn.execute("DELETE FROM sessions WHERE last_accessed < ?", (cutoff,)).rowcount
+            # Chunk sets no session refers to any more (finished, expired or evicted sessions)
+            conn.execute(
+                "DELETE FROM chunk_sets WHERE chunks_key NOT IN "
+                "(SELECT chunks_key FROM sessions WHERE chunks_key IS NOT NULL)"
+            )
+            return expired
+
+        return await self._call(remove)
+
+    async def count(self) -> int:
+        return await self._call(lambda conn: conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0])
+
+    async def entries(self) -> List[SessionEntry]:
+        return await self._call(
+            lambda conn: conn.execute("SELECT session_id, last_accessed, LENGTH(data) FROM sessions").fetchall()
+        )
+
+    async def existing(self, session_ids: Iterable[str]) -> Set[str]:
+        ids = list(session_ids)
+
+        def find(conn: sqlite3.Connection) -> Set[str]:
+            found: Set[str] = set()
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT session_id FROM sessions WHERE session_id IN ({placeholders})", batch)
+                found.update(row[0] for row in rows)
+            return found
+
+        return await self._call(find) if ids else set()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions as JSON strings in Redis (or any Redis-protocol server), shared across hosts.
+    Idle expiry is the key TTL, refreshed on every read and write. Updates use WATCH/MULTI
+    and retry when another worker changed the session in between. A sorted set (last access)
+    and a hash (sizes) next to the sessions index them for LRU eviction and the gauges.
+    Chunks are stored once per content hash with the same TTL, refreshed with their sessions.
+    Requires the optional `redis` package.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = SESSION_STORE_URL, idle_seconds: float = 7200, prefix: str = SESSION_STORE_PREFIX):
+        try:
+            import redis.asyncio as redis_asyncio
+            from redis.exceptions import WatchError
+        except ImportError as e:
+            raise RuntimeError("SESSION_STORE=redis requires the 'redis' package (pip install redis)") from e
+
+        self._client = redis_asyncio.Redis.from_url(url)
+        self._watch_error = WatchError
+        self.prefix = prefix
+        self.ttl = max(1, int(idle_seconds))
+        # Outside the session key space (prefix + session id)
+        self._lru_key = f"{prefix.rstrip(':')}-index:lru"
+        self._sizes_key = f"{prefix.rstrip(':')}-index:bytes"
+        self._chunks_prefix = f"{prefix.rstrip(':')}-chunks:"
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def _chunks_key(self, key: str) -> str:
+        return f"{self._chunks_prefix}{key}"
+
+    def _write(self, pipe: Any, session_id: str, session: SessionRecord) -> None:
+        data = json.dumps(session.to_dict())
+        pipe.set(self._key(session_id), data, ex=self.ttl)
+        pipe.expire(self._chunks_key(session.chunk_set.key), self.ttl)
+        pipe.zadd(self._lru_key, {session_id: session.last_accessed})
+        pipe.hset(self._sizes_key, session_id, len(data))
+
+    async def _record(self, raw: Any, client: Any) -> SessionRecord:
+        data = json.loads(raw)
+        key = data["chunks_key"]
+        chunk_set = chunk_pool.get(key)
+        if chunk_set is None:
+            chunk_set = _load_chunk_set(key, await client.get(self._chunks_key(key)))
+        return SessionRecord.from_dict(data, chunk_set)
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        raw = await self._client.getex(self._key(session_id), ex=self.ttl)
+        if raw is None:
+            return None
+        session = await self._record(raw, self._client)
+        session.last_accessed = time.time()
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.zadd(self._lru_key, {session_id: session.last_accessed}, xx=True)
+            pipe.expire(self._chunks_key(session.chunk_set.key), self.ttl)
+            await pipe.execute()
+        return session
+
+    async def put(self, session_id: str, session: SessionRecord) -> None:
+        chunk_set = session.chunk_set
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.set(self._chunks_key(chunk_set.key), json.dumps(chunk_set.chunks), ex=self.ttl, nx=True)
+            self._write(pipe, session_id, session)
+            await pipe.execute()
+
+    async def update(self, session_id: str, mutator: Mutator) -> Optional[T]:
+        key = self._key(session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    if raw is None:
+                        await pipe.unwatch()
+                        return None
+                    session = await self._record(raw, pipe)
+                    session.last_accessed = time.time()
+                    result = mutator(session)
+                    pipe.multi()
+                    self._write(pipe, session_id, session)
+                    await pipe.execute()
+                    return result
+                except self._watch_error:
+                    # Another worker wrote this session first - re-read and apply again
+                    continue
+
+    async def _delete_many(self, session_ids: List[str]) -> None:
+        if not session_ids:
+            return
+        # Chunk entries are shared between sessions and expire through their own TTL
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(*[self._key(sid) for sid in session_ids])
+            pipe.zrem(self._lru_key, *session_ids)
+            pipe.hdel(self._sizes_key, *session_ids)
+            await pipe.execute()
+
+    async def delete(self, session_id: str) -> None:
+        await self._delete_many([session_id])
+
+    async def expire(self, idle_seconds: float) -> int:
+        # Redis drops the idle session keys through their TTL; clear them from the index too
+        cutoff = time.time() - idle_seconds
+        stale = [sid.decode() for sid in await self._client.zrangebyscore(self._lru_key, "-inf", cutoff)]
+        await self._delete_many(stale)
+        return len(stale)
+
+    async def count(self) -> int:
+        return await self._client.zcard(self._lru_key)
+
+    async def entries(self) -> List[SessionEntry]:
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.zrange(self._lru_key, 0, -1, withscores=True)
+            pipe.hgetall(self._sizes_key)
+            ranked, sizes = await pipe.execute()
+        return [(sid.decode(), accessed, int(sizes.get(sid, 0))) for sid, accessed in ranked]
+
+    async def existing(self, session_ids: Iterable[str]) -> Set[str]:
+        ids = list(session_ids)
+        if not ids:
+            return set()
+        async with self._client.pipeline(transaction=False) as pipe:
+            for sid in ids:
+                pipe.exists(self._key(sid))
+            found = await pipe.execute()
+        return {sid for sid, present in zip(ids, found) if present}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def create_session_store(backend: str = SESSION_STORE, idle_seconds: float = 7200) -> SessionStore:
+    """Build the configured session store (memory, sqlite or redis)."""
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore(SESSION_STORE_PATH)
+    if backend == "redis":
+        return RedisSessionStore(SESSION_STORE_URL, idle_seconds=idle_seconds)
+    raise ValueError(f"Unknown SESSION_STORE '{backend}' (expected memory, sqlite or redis)")
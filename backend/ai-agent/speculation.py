@@ -0,0 +1,188 @@
+"""
+Speculative Pregeneration
+Tags pregenerated questions with the conversation state they were built from,
+decides whether they are still valid when the answer arrives, and counts hits and waste.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+import hashlib
+import os
+import re
+import time
+
+from context_budget import estimate_tokens
+
+
+SPECULATION_MIN_ANSWER_WORDS = int(os.getenv("SPECULATION_MIN_ANSWER_WORDS", "12"))
+
+# Answers like these change the direction of the interview (follow-up needed)
+_REDIRECT_PATTERN = re.compile(
+    r"\b(i don'?t know|not sure|no idea|never (used|worked|done)|haven'?t (used|worked|done)|"
+    r"can you (repeat|rephrase|clarify)|could you (repeat|rephrase|clarify)|what do you mean)\b",
+    re.IGNORECASE
+)
+
+_ACKNOWLEDGMENT_PATTERN = re.compile(
+    r"^(great|thanks|thank you|interesting|i see|got it|nice|that'?s|awesome|okay|ok|sounds|perfect|"
+    r"excellent|i understand|understood|appreciate)\b",
+    re.IGNORECASE
+)
+
+# A leading acknowledgment clause: up to the first sentence / clause break within ~12 words
+_ACKNOWLEDGMENT_CLAUSE = re.compile(r"^(?:\S+\s+){0,11}?\S*?[.!,;:]+\s+|^(?:\S+\s+){0,11}?\S*?\s+[-\u2013\u2014]+\s+")
+
+# Neutral acknowledgments: they make no claim about an answer the speculation never saw
+_ACKNOWLEDGMENTS = ["Thanks for sharing that.", "Got it, thanks.", "Thanks."]
+
+# hit: served unchanged; adapted: blind acknowledgment replaced before serving
+OUTCOMES = ("hit", "adapted", "miss", "stale", "invalidated")
+
+
+def history_fingerprint(history: List[Dict[str, Any]]) -> str:
+    """
+    Fingerprint of the conversation a speculation depends on:
+    every completed turn plus the pending question, excluding the pending answer.
+    """
+    digest = hashlib.sha1()
+    for i, turn in enumerate(history):
+        digest.update((turn.get("question") or "").encode("utf-8"))
+        digest.update(b"\x00")
+        if i < len(history) - 1:
+            digest.update((turn.get("answer") or "").encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+class SpeculationEngine:
+    """Validates pregenerated questions and keeps per-session and global counters."""
+
+    def __init__(self, min_answer_words: int = SPECULATION_MIN_ANSWER_WORDS):
+        self.min_answer_words = min_answer_words
+        self._global = self._empty_counters()
+        self._sessions: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        counters = {outcome: 0 for outcome in OUTCOMES}
+        counters["generated"] = 0
+        counters["wasted_tokens"] = 0
+        return counters
+
+    def build(
+        self,
+        question: str,
+        history: List[Dict[str, Any]],
+        prompt_tokens: int = 0,
+        spent_tokens: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Create a speculation record for a question pregenerated from `history`.
+        `spent_tokens` is the usage reported by the LLM; without it the cost is estimated.
+        """
+        return {
+            "question": question,
+            "turn": len(history),
+            "fingerprint": history_fingerprint(history),
+            "tokens": spent_tokens or prompt_tokens + estimate_tokens(question),
+            "created_at": time.time(),
+        }
+
+    def _answer_redirects(self, answer: str) -> bool:
+        """True when the latest answer is too short or signals a change of direction."""
+        if len(answer.split()) < self.min_answer_words:
+            return True
+        return bool(_REDIRECT_PATTERN.search(answer))
+
+    def _adapt(self, question: str, turn: int) -> Optional[str]:
+        """
+        Replace an acknowledgment the speculation wrote without seeing the answer
+        ("Great point about Kafka! How ...") with a neutral one.
+        Returns the question unchanged when it has none, None when it can't be separated.
+        """
+        question = question.strip()
+        if not _ACKNOWLEDGMENT_PATTERN.match(question):
+            return question
+        clause = _ACKNOWLEDGMENT_CLAUSE.match(question)
+        rest = question[clause.end():].strip() if clause else ""
+        if not rest:
+            return None
+        return f"{_ACKNOWLEDGMENTS[turn % len(_ACKNOWLEDGMENTS)]} {rest[0].upper()}{rest[1:]}"
+
+    def evaluate(
+        self,
+        speculation: Optional[Dict[str, Any]],
+        history: List[Dict[str, Any]]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Decide whether a speculation can be served for the current history,
+        whose last turn now carries the candidate's answer.
+
+        Returns:
+            (outcome, question to serve or None)
+        """
+        if not speculation:
+            return "miss", None
+
+        if speculation["turn"] != len(history) or speculation["fingerprint"] != history_fingerprint(history):
+            return "stale", None
+
+        answer = (history[-1].get("answer") or "") if history else ""
+        if self._answer_redirects(answer):
+            return "invalidated", None
+
+        adapted = self._adapt(speculation["question"], speculation["turn"])
+        if adapted is None:
+            # Blind acknowledgment we can't cut off cleanly - not worth serving
+            return "invalidated", None
+        if adapted != speculation["question"].strip():
+            return "adapted", adapted
+        return "hit", adapted
+
+    def record_generated(self, session_id: str) -> None:
+        """Count a completed pregeneration."""
+        self._global["generated"] += 1
+        self._sessions.setdefault(session_id, self._empty_counters())["generated"] += 1
+
+    def record(self, session_id: str, outcome: str, speculation: Optional[Dict[str, Any]] = None) -> None:
+        """Count the outcome of a serve attempt; discarded speculations add to wasted tokens."""
+        wasted = speculation["tokens"] if speculation and outcome in ("stale", "invalidated") else 0
+        session = self._sessions.setdefault(session_id, self._empty_counters())
+        for counters in (self._global, session):
+            counters[outcome] += 1
+            counters["wasted_tokens"] += wasted
+
+    def discard(self, session_id: str, speculation: Optional[Dict[str, Any]]) -> None:
+        """Count a speculation that was never served (e.g. the interview ended)."""
+        if speculation:
+            self.record(session_id, "stale", speculation)
+
+    @staticmethod
+    def _with_rates(counters: Dict[str, int]) -> Dict[str, Any]:
+        served = counters["hit"] + counters["adapted"]
+        attempts = served + counters["miss"] + counters["stale"] + counters["invalidated"]
+        wasted = counters["stale"] + counters["invalidated"]
+        return {
+            **counters,
+            "hit_rate": round(served / attempts, 3) if attempts else 0.0,
+            "waste_rate": round(wasted / counters["generated"], 3) if counters["generated"] else 0.0,
+        }
+
+    def stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Global counters, or one session's counters."""
+        if session_id is None:
+            return self._with_rates(self._global)
+        return self._with_rates(self._sessions.get(session_id, self._empty_counters()))
+
+    def session_ids(self) -> Set[str]:
+        """Sessions with counters in this worker."""
+        return set(self._sessions)
+
+    def forget(self, session_id: str) -> Dict[str, Any]:
+        """Drop a finished session's counters, returning its final stats."""
+        final = self.stats(session_id)
+        self._sessions.pop(session_id, None)
+        return final
+
+
+# Global engine instance
+speculation_engine = SpeculationEngine()
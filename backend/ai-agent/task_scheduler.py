@@ -0,0 +1,187 @@
+"""
+Session Task Scheduler
+Owns the agent's background work (pregeneration, memory folding) per session:
+deduplicates by key, supersedes stale work, enforces deadlines and cancels on session end.
+"""
+
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+import asyncio
+import os
+import time
+import traceback
+
+
+BACKGROUND_TASK_DEADLINE_SECONDS = float(os.getenv("BACKGROUND_TASK_DEADLINE_SECONDS", "60"))
+
+# How many ended session ids to remember so late scheduling attempts are rejected
+_CLOSED_SESSIONS_MAX = 10000
+
+_LATENCY_SAMPLES = 1000
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "p50": round(ordered[int(last * 0.50)] * 1000, 1),
+        "p95": round(ordered[int(last * 0.95)] * 1000, 1),
+        "max": round(ordered[last] * 1000, 1),
+    }
+
+
+class SessionTaskScheduler:
+    """Tracks every background task by (session, key) so it can be deduplicated and cancelled."""
+
+    def __init__(self, default_deadline: float = BACKGROUND_TASK_DEADLINE_SECONDS):
+        self.default_deadline = default_deadline
+        self._tasks: Dict[str, Dict[str, asyncio.Task]] = {}
+        self._closed: "OrderedDict[str, float]" = OrderedDict()
+        self._queue_delay: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._run_time: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self.counters = {
+            "scheduled": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "deduplicated": 0,
+            "superseded": 0,
+            "rejected": 0,
+        }
+
+    def schedule(
+        self,
+        session_id: str,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        deadline: Optional[float] = None,
+        supersedes: Optional[str] = None
+    ) -> Optional[asyncio.Task]:
+        """
+        Run a background coroutine for a session.
+
+        Args:
+            session_id: Owning session
+            key: Identity of the work (e.g. "pregen:4"); one in-flight task per session and key
+            coro_factory: Zero-argument callable returning the coroutine (only called if scheduled)
+            deadline: Seconds before the task is cancelled (defaults to BACKGROUND_TASK_DEADLINE_SECONDS)
+            supersedes: Key prefix of older work this task makes obsolete (cancelled if still running)
+
+        Returns:
+            The task, the already running duplicate, or None if the session has ended
+        """
+        if session_id in self._closed:
+            self.counters["rejected"] += 1
+            return None
+
+        session_tasks = self._tasks.setdefault(session_id, {})
+        existing = session_tasks.get(key)
+        if existing and not existing.done():
+            self.counters["deduplicated"] += 1
+            return existing
+
+        if supersedes:
+            for other_key, task in list(session_tasks.items()):
+                if other_key != key and other_key.startswith(supersedes) and not task.done():
+                    task.cancel()
+                    self.counters["superseded"] += 1
+
+        submitted = time.monotonic()
+        timeout = deadline if deadline is not None else self.default_deadline
+        task = asyncio.create_task(self._run(session_id, key, coro_factory, submitted, timeout))
+        session_tasks[key] = task
+        task.add_done_callback(lambda t, sid=session_id, k=key: self._forget(sid, k, t))
+        self.counters["scheduled"] += 1
+        return task
+
+    async def _run(
+        self,
+        session_id: str,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        submitted: float,
+        timeout: float
+    ) -> Any:
+        started = time.monotonic()
+        self._queue_delay.append(started - submitted)
+        try:
+            result = await asyncio.wait_for(coro_factory(), timeout=timeout)
+            self.counters["completed"] += 1
+            return result
+        except asyncio.TimeoutError:
+            self.counters["timed_out"] += 1
+            print(f"[SCHEDULER] Task {key} for session {session_id} exceeded {timeout:.0f}s deadline")
+        except asyncio.CancelledError:
+            self.counters["cancelled"] += 1
+            raise
+        except Exception as e:
+            self.counters["failed"] += 1
+            print(f"[BACKGROUND ERROR] Task {key} for session {session_id} failed: {str(e)}")
+            traceback.print_exc()
+        finally:
+            self._run_time.append(time.monotonic() - started)
+
+    def _forget(self, session_id: str, key: str, task: asyncio.Task) -> None:
+        session_tasks = self._tasks.get(session_id)
+        if session_tasks and session_tasks.get(key) is task:
+            del session_tasks[key]
+            if not session_tasks:
+                del self._tasks[session_id]
+
+    def cancel_session(self, session_id: str) -> int:
+        """Cancel all work for a finished session and reject anything scheduled later."""
+        self._closed[session_id] = time.time()
+        self._closed.move_to_end(session_id)
+        while len(self._closed) > _CLOSED_SESSIONS_MAX:
+            self._closed.popitem(last=False)
+
+        cancelled = 0
+        for task in self._tasks.pop(session_id, {}).values():
+            if not task.done():
+                task.cancel()
+                cancelled += 1
+        if cancelled:
+            print(f"[SCHEDULER] Cancelled {cancelled} background task(s) for ended session {session_id}")
+        return cancelled
+
+    def session_ids(self) -> Set[str]:
+        """Sessions with tasks tracked in this worker."""
+        return set(self._tasks)
+
+    def reopen_session(self, session_id: str) -> None:
+        """Allow scheduling again for a session id that is being re-initialized."""
+        self._closed.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, outcome counters and latency percentiles (ms)."""
+        by_kind: Dict[str, int] = {}
+        for session_tasks in self._tasks.values():
+            for key, task in session_tasks.items():
+                if not task.done():
+                    kind = key.split(":", 1)[0]
+                    by_kind[kind] = by_kind.get(kind, 0) + 1
+
+        return {
+            "in_flight": sum(by_kind.values()),
+            "in_flight_by_kind": by_kind,
+            "sessions_with_tasks": len(self._tasks),
+            **self.counters,
+            "queue_delay_ms": _percentiles(self._queue_delay),
+            "run_time_ms": _percentiles(self._run_time),
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel everything (call on application shutdown)."""
+        tasks = [task for session_tasks in self._tasks.values() for task in session_tasks.values()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+# Global scheduler instance
+task_scheduler = SessionTaskScheduler()
@@ -0,0 +1,74 @@
+"""
+Prompt prefix stability: the static block must render to the same bytes for every session
+and turn, or provider-side prompt caching stops hitting.
+
+Run (from backend/ai-agent/): python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompts import (  # noqa: E402
+    interviewer_prompt,
+    static_prompt,
+    synthesis_prompt,
+    turn_scoring_prompt,
+    verify_static_prefix,
+)
+
+
+# Two unrelated sessions, each at a different turn
+SESSION_INPUTS = {
+    "interviewer": [
+        {"max_questions": 3, "seniority_level": "Junior", "resume_chunks": "Built a Django shop at Acme",
+         "total_questions_asked": 0, "chat_history": ""},
+        {"max_questions": 12, "seniority_level": "Lead", "resume_chunks": "Led payments platform at Globex",
+         "total_questions_asked": 9, "chat_history": "Q: Tell me about yourself\nA: I lead the payments team"},
+    ],
+    "turn_scoring": [
+        {"difficulty_level": "Fresher", "question": "What is a list?", "answer": "An ordered collection"},
+        {"difficulty_level": "Lead", "question": "How did you shard payments?", "answer": "By merchant id"},
+    ],
+    "synthesis": [
+        {"difficulty_level": "Fresher", "profile_doc": "{\"skills\": [\"Python\"]}",
+         "turn_results": "Q1 [intro] 70/100", "overall_score": 70, "recommendation": "Recommend"},
+        {"difficulty_level": "Lead", "profile_doc": "{\"skills\": [\"Kafka\", \"Go\"]}",
+         "turn_results": "Q1 [design] 40/100\nQ2 [leadership] 55/100", "overall_score": 48,
+         "recommendation": "Do Not Recommend"},
+    ],
+}
+
+PROMPTS = {
+    "interviewer": (interviewer_prompt, "interviewer"),
+    "turn_scoring": (turn_scoring_prompt, "assessment"),
+    "synthesis": (synthesis_prompt, "assessment"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PROMPTS))
+def test_static_prefix_is_byte_identical_across_sessions(name):
+    prompt, block = PROMPTS[name]
+    first, second = (prompt.format_messages(**inputs) for inputs in SESSION_INPUTS[name])
+
+    assert first[0].content.encode("utf-8") == second[0].content.encode("utf-8")
+    assert first[0].content == static_prompt(block)
+    # The session / turn context follows the prefix and does differ
+    assert [m.content for m in first[1:]] != [m.content for m in second[1:]]
+
+
+@pytest.mark.parametrize("name", sorted(PROMPTS))
+def test_static_prefix_contains_no_session_data(name):
+    prompt, _ = PROMPTS[name]
+    for inputs in SESSION_INPUTS[name]:
+        prefix = prompt.format_messages(**inputs)[0].content
+        for value in inputs.values():
+            if isinstance(value, str) and len(value) > 12:
+                assert value not in prefix
+
+
+def test_startup_check_passes():
+    assert set(verify_static_prefix()) == {"interviewer", "assessment"}
@@ -0,0 +1,57 @@
+"""
+Turn score aggregation: recommendation bands follow the assessment rubric, and the rubric
+version covers everything that decides a stored assessment.
+
+Run (from backend/ai-agent/): python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompts import ASSESSMENT_PROMPT_TEXTS  # noqa: E402
+from turn_scoring import (  # noqa: E402
+    ASSESSMENT_RUBRIC_VERSION,
+    RECOMMENDATION_BANDS,
+    SCORE_AGGREGATION,
+    aggregate_turn_scores,
+    recommendation_for,
+    rubric_version,
+)
+
+
+@pytest.mark.parametrize("score, recommendation", [
+    (100, "Strongly Recommend"),
+    (90, "Strongly Recommend"),
+    (89, "Recommend"),          # rubric: STRONG, not EXCEPTIONAL
+    (75, "Recommend"),
+    (74, "Consider with Reservations"),
+    (60, "Consider with Reservations"),
+    (59, "Do Not Recommend"),
+    (0, "Do Not Recommend"),
+])
+def test_recommendation_matches_rubric_band(score, recommendation):
+    assert recommendation_for(score) == recommendation
+
+
+def test_aggregate_uses_mean_score():
+    turns = [
+        {"score": 92, "topic": "design", "strengths": ["clear"], "gaps": []},
+        {"score": 84, "topic": "testing", "strengths": [], "gaps": ["no examples"]},
+    ]
+    assessment = aggregate_turn_scores(turns)
+    assert assessment["candidate_score_percent"] == 88
+    assert assessment["hiring_recommendation"] == "Recommend"
+
+
+def test_rubric_version_covers_bands_and_aggregation():
+    assert rubric_version(ASSESSMENT_PROMPT_TEXTS, RECOMMENDATION_BANDS, SCORE_AGGREGATION) == ASSESSMENT_RUBRIC_VERSION
+
+    shifted_bands = [(threshold - 5 if threshold else 0, label) for threshold, label in RECOMMENDATION_BANDS]
+    assert rubric_version(ASSESSMENT_PROMPT_TEXTS, shifted_bands, SCORE_AGGREGATION) != ASSESSMENT_RUBRIC_VERSION
+
+    reweighted = {**SCORE_AGGREGATION, "turn_weights": "recent-first"}
+    assert rubric_version(ASSESSMENT_PROMPT_TEXTS, RECOMMENDATION_BANDS, reweighted) != ASSESSMENT_RUBRIC_VERSION
@@ -0,0 +1,88 @@
+"""
+Resume Tips Cache
+Result cache for /generate-resume-tips keyed by a normalized fingerprint of the tip inputs
+(score bucketed), shared by every agent worker, with single-flight coalescing so concurrent
+identical requests share one LLM call.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+import hashlib
+import json
+import os
+
+from persistent_cache import PersistentCache
+
+
+TIPS_CACHE_TTL_SECONDS = int(os.getenv("TIPS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+TIPS_CACHE_MAX_ENTRIES = int(os.getenv("TIPS_CACHE_MAX_ENTRIES", "20000"))
+
+# ATS scores within one bucket get the same tips (e.g. 5 -> 70-74 share an entry)
+TIPS_SCORE_BUCKET = max(1, int(os.getenv("TIPS_SCORE_BUCKET", "5")))
+
+
+def bucket_score(score: int) -> int:
+    """Lower bound of the score's bucket, clamped to 0-100."""
+    score = max(0, min(100, int(score)))
+    return score - score % TIPS_SCORE_BUCKET
+
+
+def _normalize(value: str) -> str:
+    return " ".join((value or "").split()).lower()
+
+
+def tips_fingerprint(
+    score: int,
+    seniority: str,
+    skills: List[str],
+    weak_areas: List[str],
+    prompt_version: str
+) -> str:
+    """
+    Cache key for a tips request: bucketed score, normalized seniority, the top-5 skills and
+    weak areas as case-insensitive sets, plus the prompt version.
+    """
+    payload = {
+        "v": prompt_version,
+        "score": bucket_score(score),
+        "seniority": _normalize(seniority),
+        "skills": sorted({_normalize(skill) for skill in skills[:5] if skill}),
+        "weak_areas": sorted({_normalize(area) for area in weak_areas if area}),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key onto one in-flight task (per worker)."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await the in-flight call for key, or start one with factory().
+        The call is shielded, so a cancelled caller does not cancel it for the others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+
+# Global tips cache instances
+resume_tips_cache = PersistentCache(
+    namespace="resume_tips",
+    ttl_seconds=TIPS_CACHE_TTL_SECONDS,
+    max_entries=TIPS_CACHE_MAX_ENTRIES
+)
+tips_single_flight = SingleFlight()
@@ -0,0 +1,157 @@
+"""
+Turn Scoring Aggregation
+Combines compact per-answer rubric results (scored in the background while the interview runs)
+into the final interview assessment, so completion needs at most one short synthesis call.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import re
+
+from prompts import ASSESSMENT_PROMPT_TEXTS, static_prompt
+
+
+# Deadline for the optional synthesis call; past it the deterministic summary is used
+ASSESSMENT_SYNTHESIS_ENABLED = os.getenv("ASSESSMENT_SYNTHESIS_ENABLED", "true").lower() == "true"
+ASSESSMENT_SYNTHESIS_TIMEOUT_SECONDS = float(os.getenv("ASSESSMENT_SYNTHESIS_TIMEOUT_SECONDS", "8"))
+
+# Recommendation for each SCORING RUBRIC band in the assessment prompt
+RUBRIC_BAND_RECOMMENDATIONS = {
+    "EXCEPTIONAL": "Strongly Recommend",
+    "STRONG": "Recommend",
+    "COMPETENT": "Consider with Reservations",
+    "DEVELOPING": "Do Not Recommend",
+    "INSUFFICIENT": "Do Not Recommend",
+}
+
+
+def _rubric_bands() -> List[Tuple[int, str]]:
+    """(lowest score, recommendation) per rubric band, read from the "90-100%: EXCEPTIONAL" lines."""
+    bands = [
+        (int(floor), RUBRIC_BAND_RECOMMENDATIONS[name])
+        for floor, name in re.findall(r"^(\d+)-\d+%: ([A-Z]+)$", static_prompt("assessment"), re.MULTILINE)
+    ]
+    if not bands:
+        raise RuntimeError("No score bands found in the assessment rubric")
+    return sorted(bands, reverse=True)
+
+
+# Lowest average score for each recommendation, derived from the rubric so the two can't drift
+RECOMMENDATION_BANDS = _rubric_bands()
+
+# How turn scores combine into the overall score. Bump "version" whenever aggregate_turn_scores
+# changes how the score or recommendation is computed
+SCORE_AGGREGATION = {"version": 1, "score": "mean", "turn_weights": "equal"}
+
+
+def rubric_version(
+    prompt_texts: Sequence[str],
+    bands: Sequence[Tuple[int, str]],
+    aggregation: Dict[str, Any]
+) -> str:
+    """Short hash of everything that decides a stored assessment's score and recommendation."""
+    material = list(prompt_texts) + [
+        json.dumps([list(band) for band in bands]),
+        json.dumps(aggregation, sort_keys=True),
+    ]
+    return hashlib.sha256("\x00".join(material).encode("utf-8")).hexdigest()[:12]
+
+
+# Identifies the scoring rubric: changes with the assessment prompts, the bands or the aggregation.
+# Stored with every result (and every turn score) so old results can be re-scored (see /reassess).
+ASSESSMENT_RUBRIC_VERSION = rubric_version(ASSESSMENT_PROMPT_TEXTS, RECOMMENDATION_BANDS, SCORE_AGGREGATION)
+
+_DEFAULT_NEXT_STEPS = {
+    "Strongly Recommend": "Advance to the final round and prepare an offer discussion.",
+    "Recommend": "Advance to the next technical round, probing the listed improvement areas.",
+    "Consider with Reservations": "Hold a focused follow-up interview on the listed improvement areas before deciding.",
+    "Do Not Recommend": "Do not advance for this level; consider a more junior role if the fundamentals fit.",
+}
+
+
+def recommendation_for(score: int) -> str:
+    """Hiring recommendation for an overall score."""
+    for threshold, label in RECOMMENDATION_BANDS:
+        if score >= threshold:
+            return label
+    return RECOMMENDATION_BANDS[-1][1]
+
+
+def _unique(items: List[str], limit: int) -> List[str]:
+    seen = set()
+    result = []
+    for item in items:
+        key = item.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            result.append(item.strip())
+        if len(result) >= limit:
+            break
+    return result
+
+
+def aggregate_turn_scores(turns: List[Dict[str, Any]], next_steps: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the assessment dict (frontend shape) from per-turn scores.
+    Strengths come from the best answers first, weaknesses from the weakest.
+
+    Args:
+        turns: One TurnScore dict per answered question, in interview order
+        next_steps: Synthesized next steps (the band default is used when omitted)
+
+    Returns:
+        Assessment dict; summary is deterministic and may be replaced by a synthesis
+    """
+    if not turns:
+        return {
+            "candidate_score_percent": 0,
+            "hiring_recommendation": recommendation_for(0),
+            "summary": "No answers were recorded.",
+            "strengths": [],
+            "weaknesses": [],
+            "recommendations": [next_steps or _DEFAULT_NEXT_STEPS[recommendation_for(0)]],
+            "answer_quality_analysis": "No answers were recorded.",
+            "question_scores": [],
+        }
+
+    score = round(sum(turn["score"] for turn in turns) / len(turns))
+    recommendation = recommendation_for(score)
+    best_first = sorted(turns, key=lambda turn: -turn["score"])
+
+    strengths = _unique([s for turn in best_first for s in turn.get("strengths", [])], 5)
+    weaknesses = _unique([g for turn in reversed(best_first) for g in turn.get("gaps", [])], 4)
+
+    analysis = (
+        f"Average answer score {score}/100 across {len(turns)} answers. "
+        f"Strongest on {best_first[0].get('topic', 'an early question')} ({best_first[0]['score']}/100), "
+        f"weakest on {best_first[-1].get('topic', 'a later question')} ({best_first[-1]['score']}/100)."
+    )
+
+    return {
+        "candidate_score_percent": score,
+        "hiring_recommendation": recommendation,
+        "summary": f"{analysis} Overall recommendation: {recommendation}.",
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "recommendations": [next_steps or _DEFAULT_NEXT_STEPS[recommendation]],
+        "answer_quality_analysis": analysis,
+        "question_scores": [
+            {"questionNumber": i + 1, "score": turn["score"], "topic": turn.get("topic", "")}
+            for i, turn in enumerate(turns)
+        ],
+    }
+
+
+def format_turns(transcript: List[Dict[str, str]], turns: List[Dict[str, Any]]) -> List[str]:
+    """Compact per-question blocks for the synthesis prompt (no full answers)."""
+    blocks = []
+    for i, (qa, turn) in enumerate(zip(transcript, turns)):
+        blocks.append(
+            f"Q{i + 1} [{turn.get('topic', '')}] {turn['score']}/100 - {qa.get('question', '')[:160]}\n"
+            f"  + {'; '.join(turn.get('strengths', [])) or 'none'}\n"
+            f"  - {'; '.join(turn.get('gaps', [])) or 'none'}\n"
+            f"  evidence: {turn.get('evidence', '')}"
+        )
+    return blocks
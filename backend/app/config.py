@@ -12,11 +12,36 @@ class Settings(BaseSettings):
     # NEW — required for Whisper API transcription
     OPENAI_API_KEY: str
     
+    # OpenAI-compatible endpoint override (e.g. the local stub server for offline load tests)
+    OPENAI_BASE_URL: str = ""
+    
     # Real-time STT provider settings
     STT_PROVIDER: str = "deepgram"  # Options: "deepgram" or "assemblyai"
     DEEPGRAM_API_KEY: str = ""
     ASSEMBLYAI_API_KEY: str = ""
 
+    # Batch re-assessment of stored results (when the agent's rubric changes)
+    REASSESS_CONCURRENCY: int = 4          # results in flight at once
+    REASSESS_TURN_CONCURRENCY: int = 1     # turns per result scored at once (LLM calls in flight <= the product)
+    REASSESS_RATE_PER_MINUTE: int = 60     # results started per minute (each is one LLM call per unscored turn + 1)
+    REASSESS_BATCH_SIZE: int = 20          # results per bulk write / checkpoint
+    ADMIN_API_KEY: str = ""                # X-Admin-Key for internal callers of admin endpoints (empty = admins by role only)
+
+    # Incremental per-answer scoring (final assessment aggregates the stored turn scores)
+    ANSWER_SCORING_WAIT_SECONDS: float = 5.0  # max wait at completion for in-flight answer scores
+
+    # Create the indexes declared in app/db/indexes.py on startup (idempotent)
+    ENSURE_INDEXES_ON_STARTUP: bool = True
+
+    # Connection pools (warmed on startup so the first requests after a deploy skip connection setup)
+    MONGO_MIN_POOL_SIZE: int = 4           # Mongo connections opened at startup and kept open
+    AI_AGENT_MAX_CONNECTIONS: int = 20     # pooled HTTP connections to the AI agent
+    AI_AGENT_MAX_KEEPALIVE: int = 10       # idle agent connections kept open
+    AI_AGENT_WARM_CONNECTIONS: int = 4     # agent connections opened at startup
+
+    # Graceful shutdown: new interviews are refused, in-flight answers and scoring get this long to finish
+    SHUTDOWN_DRAIN_SECONDS: float = 20.0
+
     # Pydantic v2 config
     model_config = {
         "env_file": ".env",
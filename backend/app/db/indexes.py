@@ -0,0 +1,146 @@
+"""
+MongoDB Indexes
+Declares every index the routers' and services' hot queries need, creates them at startup
+(idempotent - existing indexes are left alone), and audits the hot queries with explain()
+so a query that falls back to a collection scan is caught before the data grows.
+
+Audit from the command line: python scripts/audit_indexes.py
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.db.mongo_clients import db
+
+
+# collection -> indexes; keep in sync with the queries in HOT_QUERIES
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        # login / signup lookups
+        IndexModel([("email", ASCENDING)], unique=True),
+    ],
+    "interview_answers": [
+        # answer updates, answered_turns() (sorted by question number), agent session rehydration
+        IndexModel([("sessionId", ASCENDING), ("questionNumber", ASCENDING)]),
+    ],
+    "results": [
+        # result history / latest result per user, newest first
+        IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING)]),
+        IndexModel([("sessionId", ASCENDING)]),
+    ],
+    "jobs": [
+        # list filters; skills is an array (multikey), so it can't share a compound index with another array
+        IndexModel([("skills", ASCENDING)]),
+        IndexModel([("location", ASCENDING)]),
+        IndexModel([("experience_level", ASCENDING)]),
+        # recommended jobs fallback (latest first)
+        IndexModel([("posted_date", DESCENDING)]),
+        # keyword search (same definition as scripts/import_jobs.py)
+        IndexModel([("title", TEXT), ("company", TEXT)]),
+    ],
+}
+
+
+# Hot queries as the code issues them (sample values; plans depend on the query shape)
+HOT_QUERIES: List[Dict[str, Any]] = [
+    {"name": "auth: user by email", "collection": "users",
+     "filter": {"email": "candidate@example.com"}},
+    {"name": "interview: answer a question", "collection": "interview_answers",
+     "filter": {"sessionId": "000000000000000000000000", "questionNumber": 1}},
+    {"name": "scoring: store turn score", "collection": "interview_answers",
+     "filter": {"sessionId": "000000000000000000000000", "questionNumber": 1, "answer": "sample"}},
+    {"name": "scoring: answered turns", "collection": "interview_answers",
+     "filter": {"sessionId": "000000000000000000000000"}, "sort": {"questionNumber": 1}},
+    {"name": "results: user history", "collection": "results",
+     "filter": {"userId": "000000000000000000000000"}, "sort": {"createdAt": -1}},
+    {"name": "results: latest for user", "collection": "results",
+     "filter": {"userId": "000000000000000000000000"}, "sort": {"createdAt": -1}, "limit": 1},
+    {"name": "results: by session", "collection": "results",
+     "filter": {"sessionId": "000000000000000000000000"}},
+    {"name": "reassessment: pending results", "collection": "results",
+     "filter": {"assessmentVersion": {"$ne": "sample"}, "transcript.0": {"$exists": True}},
+     "sort": {"_id": 1}},
+    {"name": "jobs: filter by skills", "collection": "jobs",
+     "filter": {"skills": {"$in": ["Python", "React"]}}, "sort": {"_id": 1}, "limit": 20},
+    {"name": "jobs: filter by location", "collection": "jobs",
+     "filter": {"location": {"$regex": "remote", "$options": "i"}}, "sort": {"_id": 1}, "limit": 20},
+    {"name": "jobs: filter by experience level", "collection": "jobs",
+     "filter": {"experience_level": {"$regex": "senior", "$options": "i"}}, "sort": {"_id": 1}, "limit": 20},
+    {"name": "jobs: keyword search", "collection": "jobs",
+     "filter": {"$text": {"$search": "python"}, "is_active": True}},
+    {"name": "jobs: latest", "collection": "jobs",
+     "filter": {}, "sort": {"posted_date": -1}, "limit": 6},
+]
+
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """
+    Create any declared index that is missing. An index that conflicts with an existing one
+    (same keys, different options) or can't be built (duplicate keys for a unique index) is
+    logged and skipped, so startup never fails on it. Returns the index names per collection.
+    """
+    created: Dict[str, List[str]] = {}
+    for collection, models in INDEXES.items():
+        created[collection] = []
+        for model in models:
+            try:
+                created[collection].extend(await db[collection].create_indexes([model]))
+            except OperationFailure as e:
+                print(f"[INDEXES] {collection} {dict(model.document['key'])} not created: {str(e)}")
+    print(f"[INDEXES] Ensured {sum(len(names) for names in created.values())} index(es) on {len(created)} collection(s)")
+    return created
+
+
+# Flag plans that examine this many times more documents than they return (and at least MIN_DOCS)
+INEFFICIENT_RATIO = 10
+INEFFICIENT_MIN_DOCS = 100
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Every stage of an explain() plan tree, root first."""
+    plan = plan.get("queryPlan", plan)  # slot-based engine wraps the classic plan tree
+    stages = [plan]
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            stages.extend(_plan_stages(child))
+    return stages
+
+
+async def explain_query(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Winning plan summary for one hot query: stages, indexes used, docs examined and findings."""
+    command: Dict[str, Any] = {"find": query["collection"], "filter": query["filter"]}
+    if query.get("sort"):
+        command["sort"] = query["sort"]
+    if query.get("limit"):
+        command["limit"] = query["limit"]
+
+    explained = await db.command("explain", command, verbosity="executionStats")
+    stages = _plan_stages(explained["queryPlanner"]["winningPlan"])
+    execution = explained.get("executionStats", {})
+    stage_names = [stage.get("stage") for stage in stages]
+
+    findings: List[str] = []
+    if "COLLSCAN" in stage_names:
+        findings.append("COLLSCAN")
+    if "SORT" in stage_names:
+        findings.append("in-memory SORT")
+    examined, returned = execution.get("totalDocsExamined", 0), execution.get("nReturned", 0)
+    if examined > INEFFICIENT_MIN_DOCS and examined > INEFFICIENT_RATIO * max(returned, 1):
+        findings.append(f"examined {examined} docs for {returned}")
+    return {
+        "name": query["name"],
+        "collection": query["collection"],
+        "stages": stage_names,
+        "indexes": [stage["indexName"] for stage in stages if stage.get("indexName")],
+        "docs_examined": examined,
+        "keys_examined": execution.get("totalKeysExamined", 0),
+        "returned": returned,
+        "findings": findings,
+    }
+
+
+async def audit_hot_queries(queries: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """explain() every hot query; a COLLSCAN finding means a query is missing its index."""
+    return [await explain_query(query) for query in (queries or HOT_QUERIES)]
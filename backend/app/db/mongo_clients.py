@@ -1,13 +1,27 @@
+import asyncio
+
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import settings
 
 # MongoDB connection with SSL configuration for Python 3.13 compatibility
 # Note: The main issue is IP whitelisting in MongoDB Atlas Network Access
 # Once your IP is whitelisted, this connection will work properly
+# The client connects lazily; app.services.lifecycle warms the pool on startup and closes it on shutdown
 client = AsyncIOMotorClient(
     settings.MONGO_URI,
     tlsAllowInvalidCertificates=True,
     serverSelectionTimeoutMS=5000,
+    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
 )
 db = client[settings.DB_NAME]
 
+
+async def warm_mongo_pool(connections: int = settings.MONGO_MIN_POOL_SIZE) -> None:
+    """Open `connections` pooled connections now (concurrent pings) instead of on the first requests."""
+    await asyncio.gather(*(db.command("ping") for _ in range(max(1, connections))))
+
+
+def close_mongo_client() -> None:
+    """Close the pooled connections (call on shutdown)."""
+    client.close()
+
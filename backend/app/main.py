@@ -1,11 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.routers import interview, resume, auth, results, voice_interview, jobs, ats
+from app.services.lifecycle import lifecycle
+from app.utils.loop_monitor import loop_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup: warm the MongoDB / AI agent pools and ensure indexes.
+    Shutdown: refuse new interviews, drain voice sessions and answer scoring, close the pools.
+    """
+    loop_monitor.start()
+    await lifecycle.startup()
+    yield
+    await lifecycle.shutdown()
+    await loop_monitor.stop()
+
 
 app = FastAPI(
     title="AI Interview",
     version="1.0.0",
-    description="Backend for AI interviewer."
+    description="Backend for AI interviewer.",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -41,3 +61,19 @@ app.include_router(ats.router, prefix="/api/ats")
 async def root():
     return {"message": "Backend running successfully"}
 
+
+@app.get("/ready")
+async def readiness():
+    """Readiness probe: 200 once MongoDB and the AI agent are reachable, 503 while down or draining."""
+    if not lifecycle.draining and not lifecycle.ready:
+        await lifecycle.check()
+    return JSONResponse(lifecycle.stats(), status_code=200 if lifecycle.ready else 503)
+
+
+@app.get("/metrics/event-loop")
+async def event_loop_lag(reset: bool = False):
+    """Event loop lag percentiles (reset=true starts a new measurement window)."""
+    stats = loop_monitor.stats()
+    if reset:
+        loop_monitor.reset()
+    return stats
@@ -5,8 +5,11 @@ import tempfile
 import os
 from openai import OpenAI
 
+from app.config import settings
 from app.db.mongo_clients import db
-from app.services.ai_agent_client import ask_first_question, ask_next_question
+from app.services.ai_agent_client import ask_first_question, ask_next_question, agent_resume_profile
+from app.services.answer_scoring import schedule_answer_scoring, answered_turns, assessment_inputs
+from app.services.lifecycle import lifecycle
 
 from app.schemas.interview_schema import (
     StartInterviewRequest,
@@ -21,6 +24,9 @@ router = APIRouter(tags=["Interview"])
 @router.post("/start", response_model=StartInterviewResponse)
 async def start_interview(payload: StartInterviewRequest):
 
+    # No new interviews while this instance shuts down
+    lifecycle.reject_if_draining()
+
     # Validate userId
     try:
         user_obj_id = ObjectId(payload.userId)
@@ -58,6 +64,8 @@ async def start_interview(payload: StartInterviewRequest):
 @router.post("/init/{sessionId}", response_model=InitInterviewResponse)
 async def init_interview(sessionId: str):
 
+    lifecycle.reject_if_draining()
+
     # Validate session ID
     try:
         session_obj_id = ObjectId(sessionId)
@@ -77,7 +85,9 @@ async def init_interview(sessionId: str):
     ai_payload = {
         "sessionId": sessionId,
         "resumeText": resume_profile.get("extracted_text"),
-        "chunks": resume_profile.get("chunks")
+        "chunks": resume_profile.get("chunks"),
+        # Already parsed at upload - lets the agent skip a second LLM parse
+        "resumeProfile": agent_resume_profile(resume_profile)
     }
 
     # Request first question from AI agent
@@ -122,18 +132,19 @@ async def submit_answer(sessionId: str, payload: AnswerRequest):
     if not resume_profile:
         raise HTTPException(status_code=400, detail="Missing resume profile.")
 
-    result = await db.interview_answers.update_one(
+    answered = await db.interview_answers.find_one_and_update(
         {"sessionId": sessionId, "questionNumber": payload.questionNumber},
         {
             "$set": {
                 "answer": payload.answer,
                 "updatedAt": datetime.utcnow()
             }
-        }
+        },
+        projection={"question": 1}
     )
 
     # In case question doc didn't exist (edge-case)
-    if result.matched_count == 0:
+    if answered is None:
         await db.interview_answers.insert_one({
             "sessionId": sessionId,
             "questionNumber": payload.questionNumber,
@@ -143,6 +154,15 @@ async def submit_answer(sessionId: str, payload: AnswerRequest):
             "updatedAt": datetime.utcnow()
         })
 
+    # Score this answer in the background so the final assessment only aggregates
+    schedule_answer_scoring(
+        sessionId,
+        payload.questionNumber,
+        answered.get("question") if answered else None,
+        payload.answer,
+        resume_profile.get("seniority_level", "Mid-Senior")
+    )
+
     # Call AI agent for next question
     # AI agent uses session cache - no need to send resume text/chunks
     ai_payload = {
@@ -163,16 +183,9 @@ async def submit_answer(sessionId: str, payload: AnswerRequest):
 
     # If no next question, interview is complete - generate assessment
     if not next_question:
-        # Get all Q&A pairs for assessment
-        all_qa_pairs = await db.interview_answers.find(
-            {"sessionId": sessionId}
-        ).sort("questionNumber", 1).to_list(length=None)
-        
-        # Build transcript for assessment
-        transcript = [
-            {"question": qa.get("question", ""), "answer": qa.get("answer", "")}
-            for qa in all_qa_pairs if qa.get("answer")
-        ]
+        # Answered Q&A pairs with their background turn scores (bounded wait for in-flight ones)
+        scored = assessment_inputs(await answered_turns(sessionId))
+        transcript = scored["transcript"]
         
         print(f"[ASSESSMENT] Generating assessment for {len(transcript)} Q&A pairs")
         
@@ -182,6 +195,7 @@ async def submit_answer(sessionId: str, payload: AnswerRequest):
             "resumeText": resume_profile.get("extracted_text"),
             "chunks": resume_profile.get("chunks"),
             "transcript": transcript,
+            "turnScores": scored["turnScores"],
             "seniorityLevel": resume_profile.get("seniority_level", "Mid-Senior")
         }
         
@@ -213,6 +227,8 @@ async def submit_answer(sessionId: str, payload: AnswerRequest):
                 "candidateName": resume_profile.get("name", ""),
                 "candidateEmail": resume_profile.get("email", ""),
                 "assessment": assessment_data,
+                "usage": assessment_response.get("usage"),  # Agent's per-session LLM tokens / latency
+                "assessmentVersion": assessment_response.get("rubricVersion"),  # Rubric that produced the assessment
                 "transcript": transcript,
                 "resumeProfile": {
                     "seniorityLevel": resume_profile.get("seniority_level", "Mid-Senior"),
@@ -262,7 +278,7 @@ async def transcribe_audio(audio: UploadFile = File(...)):
     Returns transcribed text for voice-based interviews.
     """
     # Initialize OpenAI client
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL or None)
     
     # Validate file type
     allowed_types = ['audio/webm', 'audio/mp3', 'audio/wav', 'audio/mpeg', 'audio/ogg']
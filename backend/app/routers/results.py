@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from bson import ObjectId
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
+import asyncio
 
+from app.config import settings
 from app.db.mongo_clients import db
+from app.services.reassessment import claim_job, run_reassessment, get_job
+from app.utils.auth_middleware import require_admin
 
 router = APIRouter(tags=["Results"])
 
@@ -183,3 +187,74 @@ async def get_latest_result(userId: str):
         "assessment": result.get("assessment"),
         "createdAt": result.get("createdAt").isoformat() if result.get("createdAt") else None
     }
+
+
+# ==================== Batch Re-assessment ====================
+
+class ReassessRequest(BaseModel):
+    jobId: Optional[str] = None          # Resume an existing job from its checkpoint
+    limit: Optional[int] = None          # Max results to process in this run
+    concurrency: Optional[int] = None    # Lowered to REASSESS_CONCURRENCY at most
+    ratePerMinute: Optional[int] = None  # Lowered to REASSESS_RATE_PER_MINUTE at most
+
+
+# Running jobs in this process (held so the tasks aren't garbage collected); the job
+# itself is claimed in db.reassessment_jobs, which is what guards against double runs
+_reassessment_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _within_budget(requested: Optional[int], budget: int) -> int:
+    """Caller-requested limit, never above the configured budget."""
+    return max(1, min(requested, budget)) if requested else budget
+
+
+def _job_response(job: dict) -> dict:
+    return {
+        "jobId": job["_id"],
+        "rubricVersion": job.get("rubricVersion"),
+        "status": job.get("status"),
+        "processed": job.get("processed", 0),
+        "failed": job.get("failed", 0),
+        "lastResultId": str(job["lastResultId"]) if job.get("lastResultId") else None,
+        "startedAt": job.get("startedAt").isoformat() if job.get("startedAt") else None,
+        "updatedAt": job.get("updatedAt").isoformat() if job.get("updatedAt") else None,
+    }
+
+
+@router.post("/reassess")
+async def start_reassessment(payload: ReassessRequest, admin: dict = Depends(require_admin)):
+    """
+    Re-score stored results with the AI agent's current rubric in the background (admins only).
+    Returns the job id; poll GET /reassess/{jobId} for progress.
+    """
+    import uuid
+
+    job_id = payload.jobId or uuid.uuid4().hex
+    if await claim_job(job_id) is None:
+        raise HTTPException(status_code=409, detail=f"Re-assessment job {job_id} is already running")
+
+    async def run():
+        try:
+            await run_reassessment(
+                job_id=job_id,
+                limit=payload.limit,
+                concurrency=_within_budget(payload.concurrency, settings.REASSESS_CONCURRENCY),
+                rate_per_minute=_within_budget(payload.ratePerMinute, settings.REASSESS_RATE_PER_MINUTE),
+                claimed=True
+            )
+        except Exception as e:
+            print(f"[REASSESS] Job {job_id} failed: {str(e)}")
+        finally:
+            _reassessment_tasks.pop(job_id, None)
+
+    _reassessment_tasks[job_id] = asyncio.create_task(run())
+    return {"jobId": job_id, "status": "started"}
+
+
+@router.get("/reassess/{jobId}")
+async def get_reassessment(jobId: str, admin: dict = Depends(require_admin)):
+    """Progress and checkpoint of a re-assessment job."""
+    job = await get_job(jobId)
+    if not job:
+        raise HTTPException(status_code=404, detail="Re-assessment job not found")
+    return _job_response(job)
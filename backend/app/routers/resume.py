@@ -220,13 +220,13 @@ async def upload_resume(userId: str, resume: UploadFile = File(...)):
         "extracted_text": extracted_clean,
         "chunks": chunks,
         "file_path": abs_path,
-        # Parsed from AI agent
-        "name": parsed_data.get("candidate_first_name", "") + " " + parsed_data.get("candidate_last_name", ""),
-        "email": parsed_data.get("candidate_email", "Unknown"),
+        # Parsed from AI agent (same profile the agent reuses at interview init)
+        "name": parsed_data.get("name", ""),
+        "email": parsed_data.get("email", "Unknown"),
         "skills": parsed_data.get("skills", []),
         "seniority_level": parsed_data.get("seniority_level", "Unknown"),
         "experience": parsed_data.get("experience", ""),
-        "linkedin": parsed_data.get("candidate_linkedin", "")
+        "linkedin": parsed_data.get("linkedin", "")
     }
     
     # Clean up name if both parts are empty
@@ -9,6 +9,7 @@ import json
 import base64
 
 from app.services.voice_session_manager import create_session, get_session, remove_session
+from app.services.lifecycle import lifecycle
 
 
 router = APIRouter(tags=["Voice Interview"])
@@ -29,7 +30,8 @@ async def voice_interview_websocket(websocket: WebSocket, session_id: str):
     - {"type": "end"}
     
     Server sends:
-    - {"type": "question", "text": "...", "questionNumber": 1}
+    - {"type": "question_delta", "text": "...", "questionNumber": 2}  (tokens while a question is generated)
+    - {"type": "question", "text": "...", "questionNumber": 1}        (complete question)
     - {"type": "complete", "assessment": {...}}
     - {"type": "error", "message": "..."}
     - {"type": "transcript", "text": "...", "isFinal": true/false}
@@ -37,6 +39,11 @@ async def voice_interview_websocket(websocket: WebSocket, session_id: str):
     
     print(f"[WEBSOCKET] ===== ENDPOINT HIT for session {session_id} =====")
     
+    if lifecycle.draining:
+        # Shutting down: refuse before accepting (1013 = try again later)
+        await websocket.close(code=1013)
+        return
+    
     await websocket.accept()
     active_connections[session_id] = websocket
     
@@ -57,6 +64,14 @@ async def voice_interview_websocket(websocket: WebSocket, session_id: str):
                 "questionNumber": question_number
             })
         
+        async def on_question_delta(delta: str, question_number: int):
+            """Send next question tokens to client as they are generated."""
+            await websocket.send_json({
+                "type": "question_delta",
+                "text": delta,
+                "questionNumber": question_number
+            })
+        
         async def on_interview_complete(assessment: dict):
             """Send completion message with assessment."""
             await websocket.send_json({
@@ -71,9 +86,19 @@ async def voice_interview_websocket(websocket: WebSocket, session_id: str):
                 "message": error_msg
             })
         
+        async def on_shutdown():
+            """Tell the client this server is restarting, then close (1012 = service restart)."""
+            await websocket.send_json({
+                "type": "error",
+                "message": "Server is restarting. Please reconnect to continue your interview."
+            })
+            await websocket.close(code=1012)
+        
         session.on_question_ready = on_question_ready
+        session.on_question_delta = on_question_delta
         session.on_interview_complete = on_interview_complete
         session.on_error = on_error
+        session.on_shutdown = on_shutdown
         
         # Initialize session and get first question
         try:
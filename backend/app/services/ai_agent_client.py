@@ -3,9 +3,11 @@ AI Agent HTTP Client with Connection Pooling.
 Uses a persistent httpx client for better performance.
 """
 
+import asyncio
 import httpx
+import json
 from app.config import settings
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 # ===== PERSISTENT HTTP CLIENT (Connection Pooling) =====
 # Creates connection pool once, reuses for all requests
@@ -22,13 +24,22 @@ async def get_http_client() -> httpx.AsyncClient:
             timeout=60.0,
             # http2=True requires `pip install httpx[http2]` - using HTTP/1.1 for now
             limits=httpx.Limits(
-                max_keepalive_connections=5,
-                max_connections=10
+                max_keepalive_connections=settings.AI_AGENT_MAX_KEEPALIVE,
+                max_connections=settings.AI_AGENT_MAX_CONNECTIONS
             )
         )
     return _http_client
 
 
+async def warm_http_client(connections: int = settings.AI_AGENT_WARM_CONNECTIONS) -> dict:
+    """
+    Open `connections` pooled connections to the agent now (concurrent GET /health) so the first
+    interview requests after startup reuse them. Returns the agent's health; raises if it is down.
+    """
+    results = await asyncio.gather(*(get_ai_agent("health") for _ in range(max(1, connections))))
+    return results[0]
+
+
 async def close_http_client():
     """Close the HTTP client (call on shutdown)."""
     global _http_client
@@ -75,6 +86,93 @@ async def call_ai_agent(endpoint: str, payload: dict):
         raise Exception(f"Unexpected error calling AI Agent: {str(e)}")
 
 
+async def get_ai_agent(endpoint: str):
+    """GET an AI Agent endpoint (health / stats) using the pooled client."""
+    url = f"{settings.AI_AGENT_URL}/{endpoint}"
+    client = await get_http_client()
+
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    except httpx.ConnectError:
+        raise Exception(
+            f"Cannot connect to AI Agent at {url}. "
+            f"Make sure it's running."
+        )
+
+    except httpx.HTTPStatusError as e:
+        raise Exception(
+            f"AI Agent returned error {e.response.status_code}: {e.response.text}"
+        )
+
+
+async def stream_ai_agent(
+    endpoint: str,
+    payload: dict,
+    on_chunk: Callable[[str], Awaitable[None]]
+) -> dict:
+    """
+    Call a Server-Sent Events endpoint of the AI Agent.
+    Awaits on_chunk for every {"chunk": ...} event as it arrives and
+    returns the final {"done": true, ...} event.
+    """
+    url = f"{settings.AI_AGENT_URL}/{endpoint}"
+
+    print(f"[AI STREAM] POST → {url}")
+
+    client = await get_http_client()
+
+    try:
+        async with client.stream("POST", url, json=payload) as response:
+            print(f"[AI RESPONSE STATUS] {response.status_code}")
+
+            if response.status_code >= 400:
+                await response.aread()
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[len("data:"):].strip())
+                if event.get("done"):
+                    return event
+                if event.get("chunk"):
+                    await on_chunk(event["chunk"])
+
+        raise Exception("stream ended without a completion event")
+
+    except httpx.ConnectError:
+        raise Exception(
+            f"Cannot connect to AI Agent at {url}. "
+            f"Make sure it's running."
+        )
+
+    except httpx.HTTPStatusError as e:
+        raise Exception(
+            f"AI Agent returned error {e.response.status_code}: {e.response.text}"
+        )
+
+    except Exception as e:
+        raise Exception(f"Unexpected error calling AI Agent: {str(e)}")
+
+
+def agent_resume_profile(resume_profile: dict) -> dict:
+    """
+    Parsed fields of a stored resumeProfile, in the shape the AI agent returns from /parse-resume.
+    Sent with init-interview so the agent can skip re-parsing the resume.
+    """
+    return {
+        "name": resume_profile.get("name", ""),
+        "email": resume_profile.get("email", ""),
+        "linkedin": resume_profile.get("linkedin", ""),
+        "experience": resume_profile.get("experience", ""),
+        "skills": resume_profile.get("skills", []),
+        "seniority_level": resume_profile.get("seniority_level", "Unknown")
+    }
+
+
 # Shortcut wrappers (cleaner imports in other files)
 
 async def send_resume_for_processing(payload: dict):
@@ -92,11 +190,36 @@ async def ask_next_question(payload: dict):
     return await call_ai_agent("next-question", payload)
 
 
+async def stream_next_question(payload: dict, on_chunk: Callable[[str], Awaitable[None]]) -> Optional[str]:
+    """
+    Same as ask_next_question, but forwards question tokens to on_chunk as they are generated.
+    Returns the full question, or None when the interview is over.
+    """
+    event = await stream_ai_agent("next-question-stream", payload, on_chunk)
+    return event.get("fullQuestion")
+
+
 async def generate_assessment(payload: dict):
     """Generate interview assessment after all questions answered."""
     return await call_ai_agent("generate-assessment", payload)
 
 
+async def score_answer(payload: dict):
+    """Score one saved answer with the agent's rubric (compact per-turn result)."""
+    return await call_ai_agent("score-answer", payload)
+
+
+async def reassess_transcript(payload: dict):
+    """Re-score a stored transcript with the agent's current rubric (no live session needed)."""
+    return await call_ai_agent("reassess", payload)
+
+
+async def get_rubric_version() -> str:
+    """Version of the assessment rubric the agent is currently serving."""
+    health = await get_ai_agent("health")
+    return health["rubricVersion"]
+
+
 # ===== NEW: Trigger pre-generation in background =====
 async def trigger_pregeneration(payload: dict):
     """Trigger pre-generation of next question (fire-and-forget style)."""
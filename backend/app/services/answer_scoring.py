@@ -0,0 +1,104 @@
+"""
+Incremental answer scoring.
+Scores each answer in the background as soon as it is saved and stores the compact result
+(turnScore) on its interview_answers doc, so completing an interview only aggregates scores.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from app.config import settings
+from app.db.mongo_clients import db
+from app.services.ai_agent_client import score_answer
+
+
+# In-flight scoring tasks per session (strong references until they finish)
+_pending: Dict[str, Set[asyncio.Task]] = {}
+
+
+async def _score_and_store(session_id: str, question_number: int, question: str, answer: str, seniority_level: str):
+    try:
+        response = await score_answer({
+            "sessionId": session_id,
+            "questionNumber": question_number,
+            "question": question or "",
+            "answer": answer,
+            "seniorityLevel": seniority_level,
+        })
+        # Only store it if the answer was not changed meanwhile
+        await db.interview_answers.update_one(
+            {"sessionId": session_id, "questionNumber": question_number, "answer": answer},
+            {"$set": {"turnScore": response["turnScore"], "scoredAt": datetime.utcnow()}}
+        )
+        print(f"[SCORING] Session {session_id} Q{question_number}: {response['turnScore'].get('score')}/100")
+    except Exception as e:
+        # The final assessment scores any answer left without a turnScore
+        print(f"[SCORING] Session {session_id} Q{question_number} failed: {str(e)}")
+
+
+def schedule_answer_scoring(
+    session_id: str,
+    question_number: int,
+    question: Optional[str],
+    answer: str,
+    seniority_level: str
+) -> None:
+    """Start scoring a just-saved answer without blocking the request."""
+    task = asyncio.create_task(_score_and_store(session_id, question_number, question, answer, seniority_level))
+    tasks = _pending.setdefault(session_id, set())
+    tasks.add(task)
+
+    def _done(finished: asyncio.Task):
+        tasks.discard(finished)
+        if not tasks and _pending.get(session_id) is tasks:
+            _pending.pop(session_id, None)
+
+    task.add_done_callback(_done)
+
+
+async def wait_for_answer_scores(session_id: str, timeout: Optional[float] = None) -> None:
+    """
+    Wait (bounded) for the session's in-flight scoring to land before the final assessment.
+    Tasks still running after the timeout are cancelled; the agent scores those answers itself.
+    """
+    tasks = list(_pending.get(session_id, ()))
+    if not tasks:
+        return
+    timeout = settings.ANSWER_SCORING_WAIT_SECONDS if timeout is None else timeout
+    done, still_running = await asyncio.wait(tasks, timeout=timeout)
+    for task in still_running:
+        task.cancel()
+    if still_running:
+        print(f"[SCORING] Session {session_id}: {len(still_running)} answer score(s) not ready after {timeout}s")
+
+
+async def drain_answer_scoring(timeout: float) -> int:
+    """
+    On shutdown, wait (bounded) for every session's in-flight scoring. Returns how many were
+    cancelled; the final assessment scores those answers itself.
+    """
+    tasks = [task for session_tasks in _pending.values() for task in session_tasks]
+    if not tasks:
+        return 0
+    done, still_running = await asyncio.wait(tasks, timeout=timeout)
+    for task in still_running:
+        task.cancel()
+    return len(still_running)
+
+
+async def answered_turns(session_id: str) -> List[dict]:
+    """Answered interview_answers docs in order, after in-flight scoring has settled."""
+    await wait_for_answer_scores(session_id)
+    all_qa_pairs = await db.interview_answers.find(
+        {"sessionId": session_id}
+    ).sort("questionNumber", 1).to_list(length=None)
+    return [qa for qa in all_qa_pairs if qa.get("answer")]
+
+
+def assessment_inputs(qa_pairs: List[dict]) -> dict:
+    """Transcript plus aligned stored turn scores for /generate-assessment."""
+    return {
+        "transcript": [{"question": qa.get("question", ""), "answer": qa.get("answer", "")} for qa in qa_pairs],
+        "turnScores": [qa.get("turnScore") for qa in qa_pairs],
+    }
@@ -0,0 +1,108 @@
+"""
+Application Lifecycle
+Startup warms the MongoDB and AI agent connection pools (and ensures indexes), so the first
+requests after a deploy don't pay for connection setup. Readiness is reported for load balancers.
+Shutdown stops accepting new interviews, drains voice sessions and answer scoring, then closes
+the pools.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.db.indexes import ensure_indexes
+from app.db.mongo_clients import close_mongo_client, warm_mongo_pool
+from app.services.ai_agent_client import close_http_client, warm_http_client
+from app.services.answer_scoring import drain_answer_scoring
+from app.services.voice_session_manager import active_session_count, drain_sessions
+
+
+class AppLifecycle:
+    """Readiness state plus the startup warmup and shutdown drain steps."""
+
+    def __init__(self):
+        self.draining = False
+        self.indexes_ensured = False
+        self.checks: Dict[str, Dict[str, Any]] = {}
+        self.shutdown_report: Dict[str, Any] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Serving: dependencies reachable and not shutting down."""
+        return not self.draining and bool(self.checks) and all(check["ok"] for check in self.checks.values())
+
+    async def _timed(self, name: str, step) -> None:
+        started = time.perf_counter()
+        try:
+            detail = await step()
+            self.checks[name] = {"ok": True, "detail": detail}
+        except Exception as e:
+            self.checks[name] = {"ok": False, "error": str(e)}
+        self.checks[name]["ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _warm_mongo(self) -> Dict[str, Any]:
+        await warm_mongo_pool()
+        if settings.ENSURE_INDEXES_ON_STARTUP and not self.indexes_ensured:
+            await ensure_indexes()
+            self.indexes_ensured = True
+        return {"connections": settings.MONGO_MIN_POOL_SIZE, "indexes_ensured": self.indexes_ensured}
+
+    async def _warm_agent(self) -> Dict[str, Any]:
+        health = await warm_http_client()
+        return {"connections": settings.AI_AGENT_WARM_CONNECTIONS, "status": health.get("status")}
+
+    async def check(self) -> bool:
+        """Warm / re-check every dependency that is not known to be up; returns readiness."""
+        steps = {"mongo": self._warm_mongo, "agent": self._warm_agent}
+        await asyncio.gather(*(
+            self._timed(name, step) for name, step in steps.items()
+            if not self.checks.get(name, {}).get("ok")
+        ))
+        return self.ready
+
+    async def startup(self) -> None:
+        """Warm both pools concurrently; a dependency that is down is retried by /ready."""
+        ready = await self.check()
+        for name, check in self.checks.items():
+            status = f"ok in {check['ms']:.0f}ms" if check["ok"] else f"unavailable ({check['error']})"
+            print(f"[LIFECYCLE] {name}: {status}")
+        print(f"[LIFECYCLE] {'Ready' if ready else 'Not ready - /ready retries the failed checks'}")
+
+    def reject_if_draining(self) -> None:
+        """Refuse new interviews once shutdown has started (clients retry on another instance)."""
+        if self.draining:
+            raise HTTPException(status_code=503, detail="Server is restarting. Please retry shortly.")
+
+    async def shutdown(self) -> None:
+        """Stop new interviews, let in-flight answers and scoring finish (bounded), close the pools."""
+        self.draining = True
+        started = time.perf_counter()
+        print(f"[LIFECYCLE] Draining {active_session_count()} voice session(s)")
+
+        voice = await drain_sessions(settings.SHUTDOWN_DRAIN_SECONDS)
+        remaining = max(0.0, settings.SHUTDOWN_DRAIN_SECONDS - (time.perf_counter() - started))
+        scoring_cancelled = await drain_answer_scoring(remaining)
+
+        await close_http_client()
+        close_mongo_client()
+        self.shutdown_report = {
+            "voice": voice,
+            "scoring_cancelled": scoring_cancelled,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        print(f"[LIFECYCLE] Shutdown complete: {self.shutdown_report}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "draining": self.draining,
+            "checks": self.checks,
+            "activeVoiceSessions": active_session_count(),
+        }
+
+
+# Global lifecycle instance
+lifecycle = AppLifecycle()
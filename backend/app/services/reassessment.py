@@ -0,0 +1,288 @@
+"""
+Batch re-assessment of completed interviews.
+Re-scores stored results with the AI agent's current rubric under a bounded concurrency and
+rate budget, writes versioned assessments back in bulk and checkpoints progress so a crashed
+job resumes where it stopped.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.db.mongo_clients import db
+from app.services.ai_agent_client import get_rubric_version, reassess_transcript
+
+
+# Only the fields needed to rebuild an assessment request
+RESULT_PROJECTION = {"sessionId": 1, "userId": 1, "transcript": 1, "resumeProfile": 1, "assessment": 1, "assessmentVersion": 1}
+
+# Failures kept on the job document for inspection
+MAX_RECORDED_FAILURES = 100
+
+# A "running" job whose checkpoint is older than this is treated as abandoned (crashed worker)
+JOB_LEASE_SECONDS = 600
+
+
+class JobAlreadyRunning(RuntimeError):
+    """Another worker or process holds the job."""
+
+
+class RateLimiter:
+    """Spaces out requests to at most `rate_per_minute` (simple interval limiter)."""
+
+    def __init__(self, rate_per_minute: int):
+        self.interval = 60.0 / max(1, rate_per_minute)
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _resume_context(result: dict) -> Dict[str, Any]:
+    """Resume text and chunks the interview was run with (session snapshot, else the user's profile)."""
+    profile = None
+    try:
+        session = await db.interview_sessions.find_one(
+            {"_id": ObjectId(result["sessionId"])},
+            {"resumeProfile.extracted_text": 1, "resumeProfile.chunks": 1}
+        )
+        profile = session.get("resumeProfile") if session else None
+    except Exception:
+        profile = None
+
+    if not profile and result.get("userId"):
+        try:
+            user = await db.users.find_one(
+                {"_id": ObjectId(result["userId"])},
+                {"resumeProfile.extracted_text": 1, "resumeProfile.chunks": 1}
+            )
+            profile = user.get("resumeProfile") if user else None
+        except Exception:
+            profile = None
+
+    profile = profile or {}
+    return {
+        "resumeText": profile.get("extracted_text") or "",
+        "chunks": profile.get("chunks") or [],
+    }
+
+
+async def _reassess_one(result: dict, rubric_version: str) -> UpdateOne:
+    """Re-score one result and build its versioned update."""
+    context = await _resume_context(result)
+    response = await reassess_transcript({
+        "sessionId": result.get("sessionId"),
+        "resumeText": context["resumeText"],
+        "chunks": context["chunks"],
+        "transcript": result.get("transcript", []),
+        "seniorityLevel": (result.get("resumeProfile") or {}).get("seniorityLevel", "Mid-Senior"),
+        # Keeps LLM calls in flight at concurrency x REASSESS_TURN_CONCURRENCY
+        "turnConcurrency": settings.REASSESS_TURN_CONCURRENCY,
+    })
+
+    new_version = response.get("rubricVersion", rubric_version)
+    previous_version = result.get("assessmentVersion") or "legacy"
+    now = datetime.utcnow()
+
+    update = {
+        "assessment": response["assessment"],
+        "assessmentVersion": new_version,
+        f"assessments.{new_version}": {"assessment": response["assessment"], "createdAt": now},
+        "reassessedAt": now,
+    }
+    # Keep the assessment being replaced under its own version
+    if result.get("assessment"):
+        update[f"assessments.{previous_version}.assessment"] = result["assessment"]
+
+    return UpdateOne(
+        {"_id": result["_id"], "assessmentVersion": result.get("assessmentVersion")},
+        {"$set": update}
+    )
+
+
+async def claim_job(job_id: str) -> Optional[dict]:
+    """
+    Atomically mark a job as running, creating it if it doesn't exist.
+    Returns the job as it was before the claim ({} for a new job), or None if it is already
+    running elsewhere (checkpointed within JOB_LEASE_SECONDS).
+    """
+    now = datetime.utcnow()
+    try:
+        previous = await db.reassessment_jobs.find_one_and_update(
+            {
+                "_id": job_id,
+                "$or": [
+                    {"status": {"$ne": "running"}},
+                    {"updatedAt": {"$lt": now - timedelta(seconds=JOB_LEASE_SECONDS)}},
+                ],
+            },
+            {
+                "$set": {"status": "running", "updatedAt": now},
+                "$setOnInsert": {
+                    "rubricVersion": None,
+                    "lastResultId": None,
+                    "processed": 0,
+                    "failed": 0,
+                    "failures": [],
+                    "startedAt": now,
+                },
+            },
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        # The job exists but didn't match: it is running and its lease is fresh
+        return None
+    return previous or {}
+
+
+async def run_reassessment(
+    job_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    rate_per_minute: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    claimed: bool = False
+) -> dict:
+    """
+    Re-score every result not yet assessed with the agent's current rubric.
+
+    Results are streamed in _id order; after each batch the updates are bulk-written and
+    the job's checkpoint (last processed _id) is saved in `reassessment_jobs`.
+    Re-running with the same job_id continues after the checkpoint.
+    Failed results are recorded on the job and left unversioned, so the next new job retries them.
+
+    Args:
+        job_id: Existing job to resume (a new job is created when omitted or unknown)
+        claimed: The caller already claimed job_id with claim_job()
+        limit: Stop after this many results (per run)
+        concurrency: Results in flight at once (each scores REASSESS_TURN_CONCURRENCY turns at a time)
+        rate_per_minute: Results started per minute
+        batch_size: Results per bulk write / checkpoint
+
+    Returns:
+        Final job document
+
+    Raises:
+        JobAlreadyRunning: job_id is running in another worker or process
+    """
+    concurrency = concurrency or settings.REASSESS_CONCURRENCY
+    rate_limiter = RateLimiter(rate_per_minute or settings.REASSESS_RATE_PER_MINUTE)
+    batch_size = batch_size or settings.REASSESS_BATCH_SIZE
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    job_id = job_id or uuid.uuid4().hex
+    if not claimed:
+        previous = await claim_job(job_id)
+        if previous is None:
+            raise JobAlreadyRunning(f"Re-assessment job {job_id} is already running")
+
+    try:
+        rubric_version = await get_rubric_version()
+        job = await db.reassessment_jobs.find_one({"_id": job_id})
+        if job.get("rubricVersion") not in (None, rubric_version):
+            raise ValueError(
+                f"Job {job_id} was started for rubric {job.get('rubricVersion')}, "
+                f"agent now serves {rubric_version}; start a new job"
+            )
+    except BaseException:
+        # Release the claim; the checkpoint is untouched
+        await db.reassessment_jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": "failed", "updatedAt": datetime.utcnow()}}
+        )
+        raise
+    if job.get("rubricVersion") is None:
+        await db.reassessment_jobs.update_one({"_id": job_id}, {"$set": {"rubricVersion": rubric_version}})
+
+    print(f"[REASSESS] Job {job_id} rubric {rubric_version} resuming after {job.get('lastResultId')}")
+
+    query: Dict[str, Any] = {"assessmentVersion": {"$ne": rubric_version}, "transcript.0": {"$exists": True}}
+    if job.get("lastResultId"):
+        query["_id"] = {"$gt": job["lastResultId"]}
+
+    async def reassess_guarded(result: dict):
+        async with semaphore:
+            await rate_limiter.wait()
+            try:
+                return await _reassess_one(result, rubric_version)
+            except Exception as e:
+                print(f"[REASSESS] Result {result['_id']} failed: {str(e)}")
+                return e
+
+    async def flush(batch: List[dict]) -> int:
+        outcomes = await asyncio.gather(*(reassess_guarded(result) for result in batch))
+        operations = [op for op in outcomes if isinstance(op, UpdateOne)]
+        failures = [
+            {"resultId": result["_id"], "error": str(outcome)[:500], "at": datetime.utcnow()}
+            for result, outcome in zip(batch, outcomes) if not isinstance(outcome, UpdateOne)
+        ]
+
+        if operations:
+            await db.results.bulk_write(operations, ordered=False)
+
+        # Checkpoint only after the batch is written
+        checkpoint: Dict[str, Any] = {
+            "$set": {"lastResultId": batch[-1]["_id"], "updatedAt": datetime.utcnow()},
+            "$inc": {"processed": len(operations), "failed": len(failures)},
+        }
+        if failures:
+            checkpoint["$push"] = {"failures": {"$each": failures, "$slice": -MAX_RECORDED_FAILURES}}
+        await db.reassessment_jobs.update_one({"_id": job_id}, checkpoint)
+
+        print(f"[REASSESS] Job {job_id}: wrote {len(operations)}, failed {len(failures)}, checkpoint {batch[-1]['_id']}")
+        return len(batch)
+
+    seen = 0
+    more_left = False
+    batch: List[dict] = []
+    status = "failed"  # Unless the run ends normally or is cancelled
+    try:
+        cursor = db.results.find(query, RESULT_PROJECTION).sort("_id", 1)
+        if limit:
+            # One extra document tells whether the limit stopped the run
+            cursor = cursor.limit(limit + 1)
+
+        async for result in cursor:
+            if limit and seen + len(batch) >= limit:
+                more_left = True
+                break
+            batch.append(result)
+            if len(batch) >= batch_size:
+                seen += await flush(batch)
+                batch = []
+        if batch:
+            seen += await flush(batch)
+
+        status = "paused" if more_left else "completed"
+    except asyncio.CancelledError:
+        status = "interrupted"
+        raise
+    except Exception as e:
+        print(f"[REASSESS] Job {job_id} stopped: {str(e)}")
+        raise
+    finally:
+        await db.reassessment_jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": status, "updatedAt": datetime.utcnow()}}
+        )
+
+    return await db.reassessment_jobs.find_one({"_id": job_id})
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    """Current state of a re-assessment job."""
+    return await db.reassessment_jobs.find_one({"_id": job_id})
@@ -4,13 +4,15 @@ Orchestrates the real-time voice interview pipeline: STT → LLM → Response
 """
 
 import asyncio
-from typing import Dict, Optional, Callable
+import time
+from typing import Any, Dict, Optional, Callable, Set
 from datetime import datetime
 from bson import ObjectId
 
 from app.db.mongo_clients import db
 from app.services.realtime_stt import RealtimeSTTService
-from app.services.ai_agent_client import ask_first_question, ask_next_question, generate_assessment
+from app.services.ai_agent_client import ask_first_question, stream_next_question, generate_assessment, agent_resume_profile
+from app.services.answer_scoring import schedule_answer_scoring, answered_turns, assessment_inputs
 
 
 class VoiceSessionManager:
@@ -31,8 +33,10 @@ class VoiceSessionManager:
         
         # Callbacks
         self.on_question_ready: Optional[Callable[[str, int], None]] = None
+        self.on_question_delta: Optional[Callable[[str, int], None]] = None
         self.on_interview_complete: Optional[Callable[[dict], None]] = None
         self.on_error: Optional[Callable[[str], None]] = None
+        self.on_shutdown: Optional[Callable[[], None]] = None
     
     async def initialize(self):
         """Initialize the session and get first question."""
@@ -59,13 +63,15 @@ class VoiceSessionManager:
             # Store resume data for later use
             self.resume_text = resume_profile.get("extracted_text", "")
             self.chunks = resume_profile.get("chunks", [])
+            self.seniority_level = resume_profile.get("seniority_level", "Mid-Senior")
             self.user_id = user_id
             
             # Get first question from AI agent
             payload = {
                 "sessionId": self.session_id,
                 "resumeText": self.resume_text,
-                "chunks": self.chunks
+                "chunks": self.chunks,
+                "resumeProfile": agent_resume_profile(resume_profile)
             }
             
             response = await ask_first_question(payload)
@@ -143,8 +149,10 @@ class VoiceSessionManager:
             if self.silence_timer and not self.silence_timer.done():
                 self.silence_timer.cancel()
             
-            # Start new silence timer
+            # Start new silence timer (tracked so a shutdown lets the answer finish)
             self.silence_timer = asyncio.create_task(self._silence_timeout())
+            _answer_tasks.add(self.silence_timer)
+            self.silence_timer.add_done_callback(_answer_tasks.discard)
         else:
             # Interim result - just log for debugging
             print(f"[SESSION {self.session_id}] Interim: {text}")
@@ -181,13 +189,23 @@ class VoiceSessionManager:
         
         try:
             # Save the answer to current question
-            await db.interview_answers.update_one(
+            answered = await db.interview_answers.find_one_and_update(
                 {"sessionId": self.session_id, "questionNumber": self.current_question_number},
-                {"$set": {"answer": answer}}
+                {"$set": {"answer": answer}},
+                projection={"question": 1}
             )
             
             print(f"[SESSION {self.session_id}] Saved answer for Q{self.current_question_number}")
             
+            # Score it in the background so the final assessment only aggregates
+            schedule_answer_scoring(
+                self.session_id,
+                self.current_question_number,
+                answered.get("question") if answered else None,
+                answer,
+                self.seniority_level
+            )
+            
             # Ask AI agent for next question
             # AI agent uses session cache - no need to send resume text/chunks
             print(f"[SESSION {self.session_id}] Requesting next question from AI agent...")
@@ -201,20 +219,28 @@ class VoiceSessionManager:
                 "currentAnswer": answer
             }
             
-            response = await ask_next_question(payload)
+            next_q_number = self.current_question_number + 1
+            first_token_time = None
+            
+            async def forward_delta(delta: str):
+                """Forward question tokens to the frontend as they are generated."""
+                nonlocal first_token_time
+                if first_token_time is None:
+                    first_token_time = time.time() - start_time
+                    print(f"[SESSION {self.session_id}] First question token after {first_token_time:.2f} seconds")
+                if self.on_question_delta:
+                    await self.on_question_delta(delta, next_q_number)
+            
+            next_question = await stream_next_question(payload, forward_delta)
             elapsed_time = time.time() - start_time
             print(f"[SESSION {self.session_id}] AI agent responded in {elapsed_time:.2f} seconds")
             
-            next_question = response.get("nextQuestion")
-            
             if not next_question:
                 # Interview completed
                 print(f"[SESSION {self.session_id}] Interview completed, generating assessment")
                 await self._complete_interview()
             else:
-                # Save next question
-                next_q_number = self.current_question_number + 1
-                
+                # Save next question once it is complete
                 await db.interview_answers.insert_one({
                     "sessionId": self.session_id,
                     "questionNumber": next_q_number,
@@ -242,15 +268,9 @@ class VoiceSessionManager:
     async def _complete_interview(self):
         """Complete the interview and generate assessment."""
         try:
-            # Get all Q&A pairs
-            all_qa_pairs = await db.interview_answers.find(
-                {"sessionId": self.session_id}
-            ).sort("questionNumber", 1).to_list(length=None)
-            
-            transcript = [
-                {"question": qa.get("question", ""), "answer": qa.get("answer", "")}
-                for qa in all_qa_pairs if qa.get("answer")
-            ]
+            # Answered Q&A pairs with their background turn scores (bounded wait for in-flight ones)
+            scored = assessment_inputs(await answered_turns(self.session_id))
+            transcript = scored["transcript"]
             
             # Get user for resume profile
             user = await db.users.find_one({"_id": ObjectId(self.user_id)})
@@ -262,6 +282,7 @@ class VoiceSessionManager:
                 "resumeText": self.resume_text,
                 "chunks": self.chunks,
                 "transcript": transcript,
+                "turnScores": scored["turnScores"],
                 "seniorityLevel": resume_profile.get("seniority_level", "Mid-Senior")
             }
             
@@ -286,6 +307,8 @@ class VoiceSessionManager:
                 "candidateName": user.get("name", ""),
                 "candidateEmail": user.get("email", ""),
                 "assessment": assessment_data,
+                "usage": assessment_response.get("usage"),  # Agent's per-session LLM tokens / latency
+                "assessmentVersion": assessment_response.get("rubricVersion"),  # Rubric that produced the assessment
                 "transcript": transcript,
                 "resumeProfile": {
                     "seniorityLevel": resume_profile.get("seniority_level", "Mid-Senior"),
@@ -320,15 +343,9 @@ class VoiceSessionManager:
     async def generate_assessment(self) -> dict:
         """Generate assessment for early interview end. Returns assessment data."""
         try:
-            # Get all Q&A pairs
-            all_qa_pairs = await db.interview_answers.find(
-                {"sessionId": self.session_id}
-            ).sort("questionNumber", 1).to_list(length=None)
-            
-            transcript = [
-                {"question": qa.get("question", ""), "answer": qa.get("answer", "")}
-                for qa in all_qa_pairs if qa.get("answer")
-            ]
+            # Answered Q&A pairs with their background turn scores (bounded wait for in-flight ones)
+            scored = assessment_inputs(await answered_turns(self.session_id))
+            transcript = scored["transcript"]
             
             if not transcript:
                 return {
@@ -347,6 +364,7 @@ class VoiceSessionManager:
                 "resumeText": self.resume_text,
                 "chunks": self.chunks,
                 "transcript": transcript,
+                "turnScores": scored["turnScores"],
                 "seniorityLevel": resume_profile.get("seniority_level", "Mid-Senior")
             }
             
@@ -372,6 +390,8 @@ class VoiceSessionManager:
                 "candidateName": user.get("name", "") if user else "",
                 "candidateEmail": user.get("email", "") if user else "",
                 "assessment": assessment_data,
+                "usage": assessment_response.get("usage"),  # Agent's per-session LLM tokens / latency
+                "assessmentVersion": assessment_response.get("rubricVersion"),  # Rubric that produced the assessment
                 "transcript": transcript,
                 "resumeProfile": {
                     "seniorityLevel": resume_profile.get("seniority_level", "Mid-Senior"),
@@ -407,6 +427,9 @@ class VoiceSessionManager:
 # Active sessions registry
 _active_sessions: Dict[str, VoiceSessionManager] = {}
 
+# Pending / in-flight answer processing, including sessions whose socket already closed
+_answer_tasks: Set[asyncio.Task] = set()
+
 
 def get_session(session_id: str) -> Optional[VoiceSessionManager]:
     """Get an active session."""
@@ -425,3 +448,40 @@ async def remove_session(session_id: str):
     session = _active_sessions.pop(session_id, None)
     if session:
         await session.cleanup()
+
+
+def active_session_count() -> int:
+    """Voice sessions with an open connection."""
+    return len(_active_sessions)
+
+
+async def drain_sessions(timeout: float) -> Dict[str, Any]:
+    """
+    Graceful shutdown: give in-flight answers up to `timeout` seconds to be saved and answered,
+    then tell connected clients the server is restarting and clean up every session (STT streams).
+    """
+    started = time.perf_counter()
+    pending = [task for task in _answer_tasks if not task.done()]
+    unfinished = 0
+    if pending:
+        print(f"[VOICE] Draining {len(pending)} in-flight answer(s), up to {timeout:.0f}s")
+        done, still_running = await asyncio.wait(pending, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        unfinished = len(still_running)
+
+    sessions = list(_active_sessions.values())
+    for session in sessions:
+        if session.on_shutdown:
+            try:
+                await session.on_shutdown()
+            except Exception as e:
+                print(f"[VOICE] Shutdown notice failed for session {session.session_id}: {str(e)}")
+        await remove_session(session.session_id)
+
+    return {
+        "sessions_closed": len(sessions),
+        "answers_drained": len(pending) - unfinished,
+        "answers_cancelled": unfinished,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -1,4 +1,9 @@
 from fastapi import Header, HTTPException
+from bson import ObjectId
+import hmac
+
+from app.config import settings
+from app.db.mongo_clients import db
 from app.utils.jwt_utils import verify_token
 
 async def get_current_user(Authorization: str = Header(None)):
@@ -16,3 +21,27 @@ async def get_current_user(Authorization: str = Header(None)):
     token = Authorization.split(" ")[1]
     decoded = verify_token(token)
     return decoded  # contains userId, email
+
+
+async def require_admin(Authorization: str = Header(None), X_Admin_Key: str = Header(None)):
+    """
+    Allow internal/admin callers only.
+    Expected either:
+    X-Admin-Key: <ADMIN_API_KEY>           (internal services / operators)
+    Authorization: Bearer <token>          (user whose document has role "admin")
+    """
+    if X_Admin_Key is not None:
+        if settings.ADMIN_API_KEY and hmac.compare_digest(X_Admin_Key, settings.ADMIN_API_KEY):
+            return {"service": True}
+        raise HTTPException(status_code=403, detail="Invalid admin key")
+
+    decoded = await get_current_user(Authorization)
+
+    # Role is read from the user document, so revoking it takes effect without new tokens
+    try:
+        user = await db.users.find_one({"_id": ObjectId(decoded.get("userId"))}, {"role": 1})
+    except Exception:
+        user = None
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return decoded
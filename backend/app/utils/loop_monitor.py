@@ -0,0 +1,78 @@
+"""
+Event Loop Lag Monitor
+Measures how late the event loop wakes a periodic sleeper - the delay every request
+waits behind blocking work (sync DB drivers, PDF parsing, CPU-bound scoring) on the loop.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+
+class LoopLagMonitor:
+    """Background task that samples event loop lag every `interval` seconds."""
+
+    def __init__(self, interval: float = 0.1, max_samples: int = 10000):
+        self.interval = interval
+        self.max_samples = max_samples
+        self._samples: List[float] = []
+        self._max_ms = 0.0
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.observe(max(0.0, loop.time() - scheduled))
+
+    def observe(self, lag_seconds: float) -> None:
+        lag_ms = lag_seconds * 1000
+        self._count += 1
+        self._max_ms = max(self._max_ms, lag_ms)
+        self._samples.append(lag_ms)
+        # Keep a bounded window of recent samples for percentiles
+        if len(self._samples) > self.max_samples:
+            del self._samples[: len(self._samples) - self.max_samples]
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            print(f"[LOOP] Lag monitor started (interval {self.interval * 1000:.0f}ms)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self) -> None:
+        self._samples = []
+        self._max_ms = 0.0
+        self._count = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag percentiles in milliseconds over the recent sample window."""
+        ordered = sorted(self._samples)
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+        return {
+            "samples": self._count,
+            "interval_ms": round(self.interval * 1000, 1),
+            "avg_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self._max_ms, 2),
+        }
+
+
+# Global monitor instance
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,49 @@
+"""
+Index Audit CLI
+Runs explain() on every hot query in app/db/indexes.py and flags collection scans, in-memory
+sorts and plans that examine far more documents than they return. Exits with status 1 when
+any query uses a COLLSCAN, so it can gate a deploy.
+
+Usage (from backend/):
+    python scripts/audit_indexes.py
+    python scripts/audit_indexes.py --ensure    # create missing indexes first
+    python scripts/audit_indexes.py --json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+sys.path.append('.')
+
+from app.db.indexes import audit_hot_queries, ensure_indexes
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Flag hot queries that are not served from an index")
+    parser.add_argument("--ensure", action="store_true", help="Create missing declared indexes before auditing")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    if args.ensure:
+        await ensure_indexes()
+
+    report = await audit_hot_queries()
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        for entry in report:
+            status = "FLAG" if entry["findings"] else "ok"
+            indexes = ", ".join(entry["indexes"]) or "-"
+            print(f"[{status:>4}] {entry['name']:<36} {' > '.join(entry['stages']):<32} index: {indexes}")
+            print(f"       docs examined {entry['docs_examined']}, keys examined {entry['keys_examined']}, "
+                  f"returned {entry['returned']}" + (f"  <- {'; '.join(entry['findings'])}" if entry["findings"] else ""))
+
+    scans = [entry["name"] for entry in report if "COLLSCAN" in entry["findings"]]
+    print(f"\n{len(report)} hot queries audited, {len(scans)} collection scan(s)")
+    for name in scans:
+        print(f"  COLLSCAN: {name}")
+    return 1 if scans else 0
+
+
+sys.exit(asyncio.run(main()))
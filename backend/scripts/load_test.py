@@ -0,0 +1,351 @@
+"""
+Interview Load Test
+Drives complete interviews against the backend at a fixed concurrency: signup, resume upload,
+start, init and answers until the agent ends the interview. Reports p50/p95/p99 latency and
+error rate per endpoint plus event loop lag, and compares against a saved baseline.
+
+Usage (from backend/, with the AI agent running - ideally against the OpenAI stub):
+    (cd ai-agent && python benchmarks/openai_stub.py --port 8900)                    # stub LLM
+    (cd ai-agent && OPENAI_BASE_URL=http://localhost:8900/v1 python app.py)          # agent on the stub
+    python scripts/load_test.py --base-url http://localhost:8000 --interviews 50 --concurrency 10
+    python scripts/load_test.py --in-process --mongo memory --save-baseline baseline.json
+    python scripts/load_test.py --in-process --mongo memory --baseline baseline.json
+
+--in-process serves the backend app inside this process (same event loop, so lag is measured
+directly); --mongo memory swaps Motor for mongomock-motor (pip install mongomock-motor).
+Exits with status 1 when a baseline is given and any endpoint regressed.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+sys.path.append('.')
+
+from app.utils.loop_monitor import LoopLagMonitor
+
+
+SYNTHETIC_ANSWERS = [
+    "I led the migration of our order service from a monolith to three FastAPI services, "
+    "which cut p95 latency by about forty percent and let teams deploy independently.",
+    "We compared Kafka and a Postgres outbox; the outbox won because our volume was low "
+    "and it kept the transaction boundary simple for the team.",
+    "The hardest bug was a race between cache invalidation and a replica lagging behind, "
+    "which only showed up under load. We fixed it with versioned cache keys.",
+    "I would profile first, then shard the hot collection by tenant, add read replicas and "
+    "move the heavy report generation to a queue with its own workers.",
+    "Mostly contract tests against recorded responses plus a small set of end-to-end tests "
+    "that run nightly against a sandbox account.",
+    "Yes.",
+    "I'm not sure, I haven't done that.",
+]
+
+RESUME_LINES = [
+    "Jordan Example - Backend Engineer",
+    "jordan.example@example.com | linkedin.com/in/jordan-example",
+    "Experience: 5 years building Python services with FastAPI, MongoDB and Redis.",
+    "Led migration of order processing to event-driven microservices; reduced latency by 40%.",
+    "Built CI/CD pipelines with Docker and GitHub Actions; mentored 3 junior engineers.",
+    "Skills: Python, FastAPI, MongoDB, Redis, Docker, Kubernetes, AWS, SQL, Git.",
+    "Education: B.Sc. Computer Science.",
+]
+
+
+# ==================== Synthetic Resume ====================
+
+def make_resume_pdf(lines: List[str]) -> bytes:
+    """Minimal single-page text PDF (extractable by pdfplumber, no PDF library needed)."""
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    content = "BT /F1 11 Tf 50 780 Td 14 TL " + " ".join(f"({escape(line)}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+        "/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    pdf = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_at = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n"
+    return pdf.encode("latin-1")
+
+
+# ==================== Recording ====================
+
+class EndpointStats:
+    """Latencies and failures for one endpoint."""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.errors = 0
+        self.status_codes: Dict[str, int] = {}
+
+    def record(self, seconds: float, status: Optional[int]):
+        self.latencies_ms.append(seconds * 1000)
+        key = str(status) if status is not None else "exception"
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+        count = len(ordered)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+            "status_codes": self.status_codes,
+        }
+
+
+class LoadRecorder:
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """Timed request; returns None on transport errors (counted as failures)."""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception as e:
+            self.endpoints.setdefault(name, EndpointStats()).record(time.perf_counter() - started, None)
+            print(f"[LOAD] {name} failed: {type(e).__name__}: {str(e)[:120]}")
+            return None
+        self.endpoints.setdefault(name, EndpointStats()).record(time.perf_counter() - started, response.status_code)
+        if response.status_code >= 400:
+            print(f"[LOAD] {name} -> {response.status_code}: {response.text[:120]}")
+        return response
+
+    def summary(self) -> Dict[str, Any]:
+        return {name: stats.summary() for name, stats in sorted(self.endpoints.items())}
+
+
+# ==================== Interview Flow ====================
+
+async def run_interview(client: httpx.AsyncClient, recorder: LoadRecorder, resume_pdf: bytes, args) -> bool:
+    """One candidate end to end; returns True when the interview completed."""
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    response = await recorder.request(
+        client, "signup", "POST", "/api/auth/signup",
+        json={"name": "Load Test", "email": email, "password": "load-test-password"}
+    )
+    if response is None or response.status_code != 200:
+        return False
+    user_id = response.json()["userId"]
+
+    response = await recorder.request(
+        client, "upload_resume", "POST", f"/api/resume/{user_id}/upload-resume",
+        files={"resume": ("resume.pdf", resume_pdf, "application/pdf")}
+    )
+    if response is None or response.status_code != 200:
+        return False
+
+    response = await recorder.request(client, "start", "POST", "/api/interview/start", json={"userId": user_id})
+    if response is None or response.status_code != 200:
+        return False
+    session_id = response.json()["sessionId"]
+
+    response = await recorder.request(client, "init", "POST", f"/api/interview/init/{session_id}")
+    if response is None or response.status_code != 200:
+        return False
+
+    question_number = 1
+    for _ in range(args.max_answers):
+        if args.think_time:
+            await asyncio.sleep(random.uniform(0, args.think_time))
+        response = await recorder.request(
+            client, "answer", "POST", f"/api/interview/answer/{session_id}",
+            json={"questionNumber": question_number, "answer": random.choice(SYNTHETIC_ANSWERS)}
+        )
+        if response is None or response.status_code != 200:
+            return False
+        body = response.json()
+        if body.get("nextQuestion") is None:
+            return True
+        question_number = body["nextQuestionNumber"]
+    return True
+
+
+# ==================== Baseline ====================
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Regressions: percentiles above baseline by more than tolerance (and min_delta_ms), or higher error rates."""
+    regressions = []
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = previous[key] * (1 + tolerance)
+            if current[key] > limit and current[key] - previous[key] > min_delta_ms:
+                regressions.append(f"{name} {key}: {previous[key]} -> {current[key]}")
+        if current["error_rate"] > previous["error_rate"] + 0.01:
+            regressions.append(f"{name} error_rate: {previous['error_rate']} -> {current['error_rate']}")
+
+    previous_lag = baseline.get("event_loop", {}).get("p99_ms")
+    current_lag = report.get("event_loop", {}).get("p99_ms")
+    if previous_lag is not None and current_lag is not None:
+        if current_lag > previous_lag * (1 + tolerance) and current_lag - previous_lag > min_delta_ms:
+            regressions.append(f"event_loop p99_ms: {previous_lag} -> {current_lag}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n{'endpoint':<15}{'count':>7}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for name, stats in report["endpoints"].items():
+        print(
+            f"{name:<15}{stats['count']:>7}{stats['error_rate'] * 100:>6.1f}%"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}"
+        )
+    lag = report.get("event_loop") or {}
+    if lag:
+        print(f"\nEvent loop lag ({report['event_loop_source']}): p50 {lag['p50_ms']}ms  "
+              f"p95 {lag['p95_ms']}ms  p99 {lag['p99_ms']}ms  max {lag['max_ms']}ms")
+    run = report["run"]
+    print(f"\n{run['completed']}/{run['interviews']} interviews completed in {run['elapsed_s']}s "
+          f"({run['interviews_per_minute']} per minute at concurrency {run['concurrency']})")
+
+
+# ==================== Main ====================
+
+def build_in_process_client(mongo: str) -> httpx.AsyncClient:
+    """Serve the backend app in this process, optionally on an in-memory Mongo."""
+    if mongo == "memory":
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("--mongo memory needs mongomock-motor (pip install mongomock-motor)")
+        # Must run before the routers import `db`
+        import app.db.mongo_clients as mongo_clients
+        from app.config import settings
+        mongo_clients.client = AsyncMongoMockClient()
+        mongo_clients.db = mongo_clients.client[settings.DB_NAME]
+
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://backend", timeout=120.0)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="End-to-end interview load test")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Backend URL (ignored with --in-process)")
+    parser.add_argument("--in-process", action="store_true", help="Serve the backend app inside this process")
+    parser.add_argument("--mongo", choices=["configured", "memory"], default="configured",
+                        help="In-process only: MONGO_URI from settings, or in-memory mongomock-motor")
+    parser.add_argument("--interviews", type=int, default=20, help="Total interviews to run")
+    parser.add_argument("--concurrency", type=int, default=5, help="Interviews in flight at once")
+    parser.add_argument("--max-answers", type=int, default=12, help="Safety cap on answers per interview")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Max random pause before each answer (s)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for answer selection")
+    parser.add_argument("--output", help="Write the full JSON report here")
+    parser.add_argument("--save-baseline", help="Write the report as the new baseline file")
+    parser.add_argument("--baseline", help="Compare against this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown vs baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore regressions smaller than this")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    if args.in_process:
+        client = build_in_process_client(args.mongo)
+        # Same loop as the app, so this is the server's lag (ASGITransport skips the app lifespan)
+        monitor = LoopLagMonitor(interval=0.05)
+        monitor.start()
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=120.0)
+        monitor = None
+        try:
+            await client.get("/metrics/event-loop", params={"reset": "true"})
+        except Exception as e:
+            print(f"[LOAD] Backend event loop metrics unavailable: {str(e)}")
+
+    resume_pdf = make_resume_pdf(RESUME_LINES)
+    recorder = LoadRecorder()
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def guarded():
+        async with semaphore:
+            return await run_interview(client, recorder, resume_pdf, args)
+
+    print(f"[LOAD] {args.interviews} interviews at concurrency {args.concurrency} "
+          f"against {'in-process app' if args.in_process else args.base_url}")
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(guarded() for _ in range(args.interviews)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    if monitor:
+        await monitor.stop()
+        event_loop, source = monitor.stats(), "in-process"
+    else:
+        try:
+            event_loop, source = (await client.get("/metrics/event-loop")).json(), "backend"
+        except Exception:
+            event_loop, source = {}, "unavailable"
+    await client.aclose()
+
+    if args.in_process:
+        from app.services.ai_agent_client import close_http_client
+        await close_http_client()
+
+    completed = sum(1 for outcome in outcomes if outcome is True)
+    report = {
+        "run": {
+            "interviews": args.interviews,
+            "concurrency": args.concurrency,
+            "completed": completed,
+            "elapsed_s": round(elapsed, 2),
+            "interviews_per_minute": round(completed / elapsed * 60, 1) if elapsed else 0.0,
+            "target": "in-process" if args.in_process else args.base_url,
+        },
+        "endpoints": recorder.summary(),
+        "event_loop": event_loop,
+        "event_loop_source": source,
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[LOAD] Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n[LOAD] {len(regressions)} regression(s) vs {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n[LOAD] No regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+asyncio.run(main())
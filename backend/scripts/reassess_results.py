@@ -0,0 +1,53 @@
+"""
+Batch Re-assessment CLI
+Re-scores stored interview results with the AI agent's current assessment rubric.
+Progress is checkpointed in the reassessment_jobs collection; re-run with --job-id to resume.
+
+Usage (from backend/, with the AI agent running):
+    python scripts/reassess_results.py
+    python scripts/reassess_results.py --job-id <id> --concurrency 8 --rate 120
+"""
+
+import argparse
+import asyncio
+import sys
+sys.path.append('.')
+
+from app.services.ai_agent_client import close_http_client
+from app.services.reassessment import JobAlreadyRunning, run_reassessment
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Re-score stored results with the current rubric")
+    parser.add_argument("--job-id", help="Resume this job from its checkpoint (new job if unknown)")
+    parser.add_argument("--limit", type=int, help="Stop after this many results")
+    parser.add_argument("--concurrency", type=int, help="Results in flight at once")
+    parser.add_argument("--rate", type=int, help="Results started per minute")
+    parser.add_argument("--batch-size", type=int, help="Results per bulk write / checkpoint")
+    args = parser.parse_args()
+
+    try:
+        job = await run_reassessment(
+            job_id=args.job_id,
+            limit=args.limit,
+            concurrency=args.concurrency,
+            rate_per_minute=args.rate,
+            batch_size=args.batch_size
+        )
+    except JobAlreadyRunning as e:
+        print(str(e))
+        return
+    finally:
+        await close_http_client()
+
+    print(f"\nJob {job['_id']} ({job['status']}) rubric {job['rubricVersion']}")
+    print(f"Re-assessed: {job['processed']}  Failed: {job['failed']}")
+    if job.get("failures"):
+        print("Recent failures:")
+        for failure in job["failures"][-10:]:
+            print(f"  {failure['resultId']}: {failure['error']}")
+    if job["status"] != "completed":
+        print(f"Resume with: python scripts/reassess_results.py --job-id {job['_id']}")
+
+
+asyncio.run(main())
@@ -20,6 +20,7 @@ export const useVoiceInterview = (sessionId) => {
   const audioStreamRef = useRef(null);
   const processorRef = useRef(null);
   const lastSpokenQuestionRef = useRef(''); // Track last spoken question to prevent duplicates
+  const streamingQuestionRef = useRef(0); // Question number currently being streamed
   
   /**
    * Connect to WebSocket server
@@ -55,7 +56,19 @@ export const useVoiceInterview = (sessionId) => {
           console.log('[VOICE] Parsed message:', message);
           
           switch (message.type) {
+            case 'question_delta':
+              // Show the next question as it is generated; it is spoken once complete
+              if (streamingQuestionRef.current !== message.questionNumber) {
+                streamingQuestionRef.current = message.questionNumber;
+                setQuestionNumber(message.questionNumber);
+                setCurrentQuestion(message.text);
+              } else {
+                setCurrentQuestion((prev) => prev + message.text);
+              }
+              break;
+            
             case 'question':
+              streamingQuestionRef.current = message.questionNumber;
               setCurrentQuestion(message.text);
               setQuestionNumber(message.questionNumber);
               